@@ -0,0 +1,131 @@
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlparse
+from typing import Dict, Optional, Any
+import requests
+import threading
+import random
+import time
+
+class HttpTransport:
+    """
+    A shared HTTP transport for all outbound API clients.
+
+    Wraps a pooled requests.Session with default timeouts, exponential backoff
+    with jitter on 429/5xx responses and connection errors, and per-host metrics.
+    Only idempotent methods are retried unless a request asks otherwise.
+    """
+
+    RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+    IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}
+
+    def __init__(self, pool_size: int = 16, timeout: float = 10, max_retries: int = 3,
+                 backoff_factor: float = 0.5, max_backoff: float = 30):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._metrics = {}
+        self._metrics_lock = threading.Lock()
+
+    def request(self, method: str, url: str, retry: Optional[bool] = None, **kwargs) -> requests.Response:
+        """
+        Send a request through the pooled session.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            retry: Retry on 429/5xx and connection errors (defaults to True for idempotent methods)
+            **kwargs: Passed to requests.Session.request
+
+        Returns:
+            The final response (which may still be an error response once retries run out)
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        if retry is None:
+            retry = method.upper() in self.IDEMPOTENT_METHODS
+
+        host = urlparse(url).netloc
+        max_attempts = self.max_retries + 1 if retry else 1
+
+        for attempt in range(max_attempts):
+            start_time = time.perf_counter()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                self._record(host, time.perf_counter() - start_time, status_code=None, retried=attempt > 0)
+                if attempt + 1 >= max_attempts:
+                    raise
+                time.sleep(self._get_backoff(attempt))
+                continue
+
+            self._record(host, time.perf_counter() - start_time, response.status_code, retried=attempt > 0)
+
+            if response.status_code in self.RETRY_STATUS_CODES and attempt + 1 < max_attempts:
+                time.sleep(self._get_backoff(attempt, response.headers.get('Retry-After')))
+                continue
+
+            return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def _get_backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Exponential backoff with jitter, honouring a numeric Retry-After header."""
+        if retry_after:
+            try:
+                return min(float(retry_after), self.max_backoff)
+            except ValueError:
+                pass
+
+        backoff = min(self.max_backoff, self.backoff_factor * (2 ** attempt))
+        return backoff / 2 + random.uniform(0, backoff / 2)
+
+    def _record(self, host: str, elapsed: float, status_code: Optional[int], retried: bool):
+        with self._metrics_lock:
+            metrics = self._metrics.setdefault(host, {
+                'requests': 0,
+                'errors': 0,
+                'retries': 0,
+                'total_time': 0.0,
+                'status_codes': {}
+            })
+            metrics['requests'] += 1
+            metrics['total_time'] += elapsed
+            if retried:
+                metrics['retries'] += 1
+            if status_code is None or status_code >= 400:
+                metrics['errors'] += 1
+            if status_code is not None:
+                metrics['status_codes'][status_code] = metrics['status_codes'].get(status_code, 0) + 1
+
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Get request metrics per host."""
+        with self._metrics_lock:
+            return {
+                host: {
+                    **metrics,
+                    'status_codes': dict(metrics['status_codes']),
+                    'avg_time': metrics['total_time'] / metrics['requests'] if metrics['requests'] else 0.0
+                }
+                for host, metrics in self._metrics.items()
+            }
+
+_shared_transport = None
+_shared_transport_lock = threading.Lock()
+
+def get_shared_transport() -> HttpTransport:
+    """Get the process-wide HttpTransport used by all API clients."""
+    global _shared_transport
+    with _shared_transport_lock:
+        if _shared_transport is None:
+            _shared_transport = HttpTransport()
+        return _shared_transport
@@ -1,4 +1,5 @@
 from typing import List, Dict, Optional
+from .http_session import HttpTransport, get_shared_transport
 import time
 import requests
 
@@ -6,9 +7,10 @@ class SpoonacularAPI:
     """
     A class to interact with the Spoonacular API for recipe searches."""
 
-    def __init__(self, api_key = Optional[str]):
+    def __init__(self, api_key = Optional[str], transport: Optional[HttpTransport] = None):
         self.base_url = "https://api.spoonacular.com/recipes"
         self.api_key = api_key
+        self.transport = transport or get_shared_transport()
 
         self.last_request = 0
         self.request_interval = 1
@@ -31,7 +33,7 @@ class SpoonacularAPI:
         self._rate_limit()
 
         try:
-            response = requests.get(url, params=params)
+            response = self.transport.get(url, params=params)
             if response.status_code == 200:
                 return response.json()
             elif response.status_code == 429 or response.status_code == 402:
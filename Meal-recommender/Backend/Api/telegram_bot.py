@@ -1,4 +1,5 @@
 from typing import List, Dict, Optional, Any
+from .http_session import HttpTransport, get_shared_transport
 import requests
 import json
 import time
@@ -8,10 +9,11 @@ class TelegramBotAPI:
     
     Token is required to authenticate the bot, get it from @BotFather on telegram."""
 
-    def __init__(self, token: str, timeout: Optional[int] = None):
+    def __init__(self, token: str, timeout: Optional[int] = None, transport: Optional[HttpTransport] = None):
         self.token = token
         self.base_url = f"https://api.telegram.org/bot{self.token}"
-        self.session = requests.Session()
+        self.transport = transport or get_shared_transport()
+        self.session = self.transport.session
         self.timeout = timeout if timeout is not None else 30
         self._validate_token()  # Validate token on initialization
 
@@ -46,12 +48,12 @@ class TelegramBotAPI:
         try:
             if files:
                 # For file uploads, don't set Content-Type header
-                response = self.session.post(url, data=data, files=files, timeout=self.timeout)
+                response = self.transport.post(url, data=data, files=files, timeout=self.timeout)
             else:
                 # For regular requests, use JSON
                 headers = {'Content-Type': 'application/json'}
-                response = self.session.post(url, data=json.dumps(data) if data else None, 
-                                           headers=headers, timeout=self.timeout)
+                response = self.transport.post(url, data=json.dumps(data) if data else None, 
+                                             headers=headers, timeout=self.timeout)
             
             response.raise_for_status()
             return response.json()
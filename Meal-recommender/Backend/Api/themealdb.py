@@ -1,61 +1,233 @@
-import requests
-from typing import List, Dict, Optional
+from .http_session import HttpTransport, get_shared_transport
+from Backend.Data.Utils.cache_utils import get_project_cache_dir
+import os
+import sqlite3
+import threading
+import json
+import time
+from urllib.parse import urlencode
+from typing import List, Dict, Optional, Tuple
+
+class MealDBResponseCache:
+    """
+    A persistent SQLite cache for TheMealDB responses.
+
+    Entries are kept for a per-endpoint TTL and may then be served stale for
+    `stale_ttl` seconds while they are refreshed in the background. The cache is
+    bounded to `max_entries` rows and evicts the least recently used ones."""
+
+    DEFAULT_TTLS = {
+        'lookup.php': 7 * 24 * 3600,  # Meal details almost never change
+        'filter.php': 24 * 3600,
+        'list.php': 24 * 3600,
+        'random.php': 0,  # Caching would defeat the purpose of a random meal
+    }
+
+    def __init__(self, db_path: Optional[str] = None, ttls: Optional[Dict[str, int]] = None,
+                 max_entries: int = 10000, stale_ttl: int = 7 * 24 * 3600):
+        self.db_path = db_path or os.path.join(get_project_cache_dir(), "themealdb_cache.db")
+        self.ttls = {**self.DEFAULT_TTLS, **(ttls or {})}
+        self.max_entries = max_entries
+        self.stale_ttl = stale_ttl
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.init_database()
+
+    def init_database(self):
+        """Create the cache table if it does not exist."""
+        with self._lock:
+            # WAL keeps the per-hit last_access update cheap
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS responses (
+                    url TEXT PRIMARY KEY,
+                    endpoint TEXT,
+                    payload TEXT,
+                    fetched_at REAL,
+                    last_access REAL
+                )
+            ''')
+            self._conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access)')
+            self._conn.commit()
+
+    def get_ttl(self, endpoint: str) -> int:
+        """Get the TTL in seconds for an endpoint (0 disables caching)."""
+        return self.ttls.get(endpoint, 0)
+
+    def get(self, url: str, endpoint: str) -> Optional[Tuple[Dict, bool]]:
+        """
+        Look up a cached response.
+
+        Returns (data, is_fresh), or None when there is no usable entry.
+        """
+        ttl = self.get_ttl(endpoint)
+        if ttl <= 0:
+            return None
+
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, fetched_at FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+
+            if row is None or now - row[1] > ttl + self.stale_ttl:
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE url = ?", (now, url))
+            self._conn.commit()
+
+            is_fresh = now - row[1] <= ttl
+            if is_fresh:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+
+        return json.loads(row[0]), is_fresh
+
+    def set(self, url: str, endpoint: str, data: Dict):
+        """Store a response and evict the least recently used entries if needed."""
+        if self.get_ttl(endpoint) <= 0:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (url, endpoint, payload, fetched_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (url, endpoint, json.dumps(data), now, now)
+            )
+
+            count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            overflow = count - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE url IN (SELECT url FROM responses ORDER BY last_access ASC LIMIT ?)",
+                    (overflow,)
+                )
+                self.evictions += overflow
+            self._conn.commit()
+
+    def clear(self):
+        """Remove all cached responses."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get hit/miss counters and the current number of entries."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': entries
+        }
 
 class MealDBAPI:
     """
     A simple API client for TheMealDB to search for meals by ingredient, category, or area,"""
 
-    def __init__(self):
-        self.base_url = "https://www.themealdb.com/api/json/v1/1/"
+    def __init__(self, base_url: Optional[str] = None, cache: Optional[MealDBResponseCache] = None,
+                 transport: Optional[HttpTransport] = None):
+        self.base_url = base_url or "https://www.themealdb.com/api/json/v1/1/"
+        self.cache = cache
+        self.transport = transport or get_shared_transport()
 
-    def search_by_ingredient(self, ingredient: str) -> List[Dict]:
-        url = f"{self.base_url}filter.php?i={ingredient}"
-        response = requests.get(url)
-        if response.status_code == 200:
-            data = response.json()
-            return data.get("meals", [])
-        else:
-            print(f"Error: {response.status_code}")
-            return []
-        
-    def get_meal_details(self, meal_id: str) -> Optional[Dict]:
-        url = f"{self.base_url}lookup.php?i={meal_id}"
-        response = requests.get(url)
+        self._revalidating = set()
+        self._revalidating_lock = threading.Lock()
+
+    def without_cache(self) -> 'MealDBAPI':
+        """Get a client for the same API and transport that always fetches fresh responses."""
+        return MealDBAPI(base_url=self.base_url, transport=self.transport)
+
+    def _get(self, endpoint: str, params: Optional[Dict[str, str]] = None) -> Optional[Dict]:
+        """GET an endpoint, serving from the cache when possible."""
+        url = f"{self.base_url}{endpoint}"
+        if params:
+            url = f"{url}?{urlencode(params)}"
+
+        if self.cache:
+            cached = self.cache.get(url, endpoint)
+            if cached is not None:
+                data, is_fresh = cached
+                if not is_fresh:
+                    self._revalidate(url, endpoint)
+                return data
+
+        data = self._fetch(url)
+        if data is not None and self.cache:
+            self.cache.set(url, endpoint, data)
+        return data
+
+    def _fetch(self, url: str) -> Optional[Dict]:
+        response = self.transport.get(url)
         if response.status_code == 200:
-            data = response.json()
-            return data.get("meals", [])[0] if data.get("meals") else None
+            return response.json()
         else:
             print(f"Error: {response.status_code}")
             return None
-        
+
+    def _revalidate(self, url: str, endpoint: str):
+        """Refresh a stale cache entry in the background (stale-while-revalidate)."""
+        with self._revalidating_lock:
+            if url in self._revalidating:
+                return
+            self._revalidating.add(url)
+
+        def refresh():
+            try:
+                data = self._fetch(url)
+                if data is not None:
+                    self.cache.set(url, endpoint, data)
+            except Exception as e:
+                print(f"Error revalidating {url}: {e}")
+            finally:
+                with self._revalidating_lock:
+                    self._revalidating.discard(url)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def search_by_ingredient(self, ingredient: str) -> List[Dict]:
+        data = self._get("filter.php", {"i": ingredient})
+        return (data.get("meals") or []) if data else []
+
+    def get_meal_details(self, meal_id: str) -> Optional[Dict]:
+        data = self._get("lookup.php", {"i": meal_id})
+        return data["meals"][0] if data and data.get("meals") else None
+
     def search_by_category(self, category: str) -> List[Dict]:
-        url = f"{self.base_url}filter.php?c={category}"
-        response = requests.get(url)
-        if response.status_code == 200:
-            data = response.json()
-            return data.get("meals", [])
-        else:
-            print(f"Error: {response.status_code}")
-            return []
-        
+        data = self._get("filter.php", {"c": category})
+        return (data.get("meals") or []) if data else []
+
     def search_by_area(self, area: str) -> List[Dict]:
-        url = f"{self.base_url}filter.php?a={area}"
-        response = requests.get(url)
-        if response.status_code == 200:
-            data = response.json()
-            return data.get("meals", [])
-        else:
-            print(f"Error: {response.status_code}")
-            return []
-        
+        data = self._get("filter.php", {"a": area})
+        return (data.get("meals") or []) if data else []
+
     def get_random_meal(self) -> Optional[Dict]:
-        url = f"{self.base_url}random.php"
-        response = requests.get(url)
-        if response.status_code == 200:
-            data = response.json()
-            return data.get("meals", [])[0] if data.get("meals") else None
-        else:
-            print(f"Error: {response.status_code}")
-            return None
-        
-    
\ No newline at end of file
+        data = self._get("random.php")
+        return data["meals"][0] if data and data.get("meals") else None
+
+    def list_categories(self) -> List[str]:
+        data = self._get("list.php", {"c": "list"})
+        return [item["strCategory"] for item in (data.get("meals") or [])] if data else []
+
+    def list_areas(self) -> List[str]:
+        data = self._get("list.php", {"a": "list"})
+        return [item["strArea"] for item in (data.get("meals") or [])] if data else []
+
+    def list_ingredients(self) -> List[str]:
+        data = self._get("list.php", {"i": "list"})
+        return [item["strIngredient"] for item in (data.get("meals") or [])] if data else []
+
+    def get_cache_stats(self) -> Optional[Dict[str, int]]:
+        """Get response cache statistics, or None when caching is disabled."""
+        return self.cache.get_stats() if self.cache else None
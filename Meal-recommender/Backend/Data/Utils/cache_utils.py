@@ -0,0 +1,69 @@
+import hashlib
+import json
+import os
+
+def hash_file(file_path: str, chunk_size: int = 1 << 20) -> str:
+    """
+    Get the SHA-256 hex digest of a file's contents.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def hash_file_cached(file_path: str, cache_dir: str) -> str:
+    """
+    Get hash_file() of a file, reusing the hash recorded in `cache_dir` while the
+    file's modification time and size are unchanged.
+    """
+    stat = os.stat(file_path)
+    signature = [stat.st_mtime_ns, stat.st_size]
+    record_path = os.path.join(cache_dir, f"{os.path.basename(file_path)}.sha256.json")
+
+    try:
+        with open(record_path, 'r', encoding='utf-8') as f:
+            record = json.load(f)
+        if record['signature'] == signature:
+            return record['sha256']
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    digest = hash_file(file_path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        temp_path = f"{record_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'signature': signature, 'sha256': digest}, f)
+        os.replace(temp_path, record_path)
+    except OSError as e:
+        print(f"Error recording the hash of {file_path}: {e}")
+    return digest
+
+def build_cache_key(*parts) -> str:
+    """
+    Combine content hashes and version numbers into one short cache key.
+    Parts are JSON-encoded (lists as lists, other values as strings), so no two
+    different sequences of parts encode to the same text.
+    """
+    encoded = json.dumps([part if isinstance(part, (list, tuple)) else str(part) for part in parts],
+                         default=str, ensure_ascii=False)
+    digest = hashlib.sha256(encoded.encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+def get_project_cache_dir() -> str:
+    """
+    Get the project's data/cache directory (created if needed).
+    """
+    utils_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(os.path.dirname(os.path.dirname(utils_dir)))
+    cache_dir = os.path.join(project_root, "data", "cache")
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+def get_default_cache_dir(data_file_path: str) -> str:
+    """
+    Get the cache directory for a file under data/raw (data/cache next to it).
+    """
+    raw_dir = os.path.dirname(os.path.abspath(data_file_path))
+    return os.path.join(os.path.dirname(raw_dir), "cache")
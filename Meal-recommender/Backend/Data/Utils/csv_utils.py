@@ -1,6 +1,19 @@
 import re
+import numpy as np
 import pandas as pd
 
+# One token per match: a double-quoted string, a single-quoted string (both may be
+# unterminated and use doubled quotes as escapes), a separating comma, or unquoted text
+_R_VECTOR_TOKEN = re.compile(r""""((?:[^"]|"")*)"?|'((?:[^']|'')*)'?|(,)|([^"',]+)""")
+
+# A well-formed vector of double-quoted strings with no quotes inside them, e.g. c("a", "b"),
+# which is most of the Food.com data and can be split with a single findall
+_SIMPLE_R_VECTOR = re.compile(r"""c\( *"[^"']*"(?: *, *"[^"']*")* *\)""")
+_SIMPLE_R_VECTOR_ITEM = re.compile(r'"([^"]*)"')
+
+# Days, hours and minutes of an ISO 8601 duration such as 'PT1H30M' or 'P1DT2H'; seconds are ignored
+_ISO_8601_DURATION = re.compile(r'^P(?:(?P<days>\d+)D)?(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?)?')
+
 def parse_r_vector(r_string):
     """
     Convert R c() syntax to Python list
@@ -13,6 +26,9 @@ def parse_r_vector(r_string):
     
     r_string = str(r_string).strip()
     
+    if _SIMPLE_R_VECTOR.fullmatch(r_string):
+        return [item for item in (match.strip() for match in _SIMPLE_R_VECTOR_ITEM.findall(r_string)) if item]
+    
     # Check if it's R vector syntax
     if not (r_string.startswith('c(') and r_string.endswith(')')):
         return []
@@ -24,57 +40,35 @@ def parse_r_vector(r_string):
     if not content.strip():
         return []
     
-    # Split by comma, but be careful with commas inside quotes
+    # Split by comma, but be careful with commas inside quotes.
+    # Quoted and unquoted parts between two commas are joined into one item
     ingredients = []
-    current_item = ""
-    in_quotes = False
-    quote_char = None
-    
-    i = 0
-    while i < len(content):
-        char = content[i]
-        
-        if not in_quotes:
-            if char in ['"', "'"]:
-                in_quotes = True
-                quote_char = char
-            elif char == ',' and not in_quotes:
-                # End of current item
-                item = current_item.strip()
-                if item:
-                    ingredients.append(item)
-                current_item = ""
-            else:
-                current_item += char
-        else:
-            if char == quote_char:
-                # Check if it's escaped quote
-                if i + 1 < len(content) and content[i + 1] == quote_char:
-                    # Escaped quote, add one quote and skip next
-                    current_item += char
-                    i += 1
-                else:
-                    # End of quoted string
-                    in_quotes = False
-                    quote_char = None
-            else:
-                current_item += char
-        
-        i += 1
+    current_item = []
+    for double_quoted, single_quoted, comma, text in _R_VECTOR_TOKEN.findall(content):
+        if comma:
+            item = "".join(current_item).strip()
+            if item:
+                ingredients.append(item)
+            current_item = []
+        elif text:
+            current_item.append(text)
+        elif double_quoted:
+            current_item.append(double_quoted.replace('""', '"'))
+        elif single_quoted:
+            current_item.append(single_quoted.replace("''", "'"))
     
     # Add the last item
-    item = current_item.strip()
+    item = "".join(current_item).strip()
     if item:
         ingredients.append(item)
     
     # Clean up each ingredient (remove quotes and extra spaces)
     cleaned_ingredients = []
     for ing in ingredients:
-        ing = ing.strip()
         # Remove surrounding quotes
         if (ing.startswith('"') and ing.endswith('"')) or (ing.startswith("'") and ing.endswith("'")):
-            ing = ing[1:-1]
-        cleaned_ingredients.append(ing.strip())
+            ing = ing[1:-1].strip()
+        cleaned_ingredients.append(ing)
     
     return cleaned_ingredients
 
@@ -88,6 +82,24 @@ def parse_r_vector_to_string(r_string):
     ingredients = parse_r_vector(r_string)
     return ' '.join(ingredients) if ingredients else ''
 
+def parse_r_vector_column(r_strings: pd.Series) -> pd.Series:
+    """
+    Parse a whole column of R c() vectors into lists.
+    Repeated values (e.g. common keyword vectors) are only parsed once.
+    """
+    parsed = {}
+    return pd.Series(
+        [list(parsed[value]) if value in parsed else list(parsed.setdefault(value, parse_r_vector(value)))
+         for value in r_strings],
+        index=r_strings.index, dtype=object
+    )
+
+def parse_r_vector_to_string_column(r_strings: pd.Series) -> pd.Series:
+    """
+    Parse a whole column of R c() vectors into joined strings.
+    """
+    return pd.Series([parse_r_vector_to_string(value) for value in r_strings], index=r_strings.index, dtype=object)
+
 def parse_r_vector_simple(r_string):
     """
     Simpler version using regex - works for most cases
@@ -125,19 +137,26 @@ def parse_ISO_8601_duration(duration: str) -> int:
     if not duration or pd.isna(duration):
         return 0
     
-    # Remove 'PT' prefix
-    content = duration[2:]
-    
-    total_minutes = 0
-    
-    # Extract hours
-    hour_match = re.search(r'(\d+)H', content)
-    if hour_match:
-        total_minutes += int(hour_match.group(1)) * 60
+    match = _ISO_8601_DURATION.match(str(duration))
+    if not match:
+        return 0
     
-    # Extract minutes
-    minute_match = re.search(r'(\d+)M', content)
-    if minute_match:
-        total_minutes += int(minute_match.group(1))
+    days, hours, minutes = (int(value) if value else 0 for value in match.groups())
+    return days * 1440 + hours * 60 + minutes
+
+def parse_ISO_8601_duration_column(durations: pd.Series) -> pd.Series:
+    """
+    Parse a whole column of ISO 8601 durations (e.g. PrepTime, CookTime, TotalTime) into total minutes.
+    Missing or unparseable values become 0, as in parse_ISO_8601_duration.
+    Durations repeat a lot (PT15M, PT1H...), so each distinct value is parsed once.
     
-    return total_minutes
\ No newline at end of file
+    :param durations: Series of ISO 8601 duration strings
+    :return: Series of total durations in minutes
+    """
+    codes, uniques = pd.factorize(durations.astype(object))  # Missing values get code -1
+    parts = pd.Series(uniques, dtype=object).astype(str).str.extract(_ISO_8601_DURATION)
+    parts = parts.astype('float64').fillna(0).astype('int64')
+    minutes = (parts['days'] * 1440 + parts['hours'] * 60 + parts['minutes']).to_numpy()
+
+    # Append a 0 for code -1, so missing values index it
+    return pd.Series(np.append(minutes, 0)[codes], index=durations.index, dtype='int64')
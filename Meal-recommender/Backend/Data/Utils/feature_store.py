@@ -0,0 +1,127 @@
+from typing import Dict, Iterable, Optional
+from .cache_utils import build_cache_key, get_project_cache_dir
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+class FeatureStore:
+    """
+    A persistent SQLite store of extracted meal features.
+
+    Entries are content-addressed: the key covers the meal id, its instructions,
+    ingredient names and keywords, and the extractor's version, so an edited meal
+    or a changed extractor simply misses instead of returning stale features.
+    Features are stored per namespace (one per extractor) as JSON objects. The store
+    is bounded to `max_entries` rows and evicts the least recently used ones.
+    """
+
+    # Food.com has about 522k recipes, stored once per extractor (about 250 bytes a row)
+    DEFAULT_MAX_ENTRIES = 1200000
+
+    def __init__(self, db_path: Optional[str] = None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.db_path = db_path or os.path.join(get_project_cache_dir(), "meal_features.db")
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.init_database()
+
+    def init_database(self):
+        """Create the features table if it does not exist."""
+        with self._lock:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS features (
+                    namespace TEXT,
+                    key TEXT,
+                    features TEXT,
+                    created_at REAL,
+                    last_access REAL,
+                    PRIMARY KEY (namespace, key)
+                )
+            ''')
+            columns = [row[1] for row in self._conn.execute("PRAGMA table_info(features)")]
+            if 'last_access' not in columns:  # Stores created before the size bound
+                self._conn.execute("ALTER TABLE features ADD COLUMN last_access REAL")
+                self._conn.execute("UPDATE features SET last_access = created_at")
+            self._conn.execute('CREATE INDEX IF NOT EXISTS idx_features_last_access ON features (last_access)')
+            self._conn.commit()
+
+    @staticmethod
+    def build_key(meal, version) -> str:
+        """Get the content-addressed key of a meal's features for an extractor version."""
+        # Hashing the instructions first keeps them out of the slower JSON encoding of the parts
+        instructions_hash = hashlib.sha256((meal.instructions or "").encode('utf-8', 'surrogatepass')).hexdigest()
+        ingredient_names = [ingredient.name for ingredient in meal.ingredients]
+        return build_cache_key(meal.id, instructions_hash, ingredient_names, list(meal.keywords or []), version)
+
+    def get_many(self, keys: Iterable[str], namespace: str) -> Dict[str, Dict]:
+        """Get the stored features for the given keys (keys not in the store are left out)."""
+        keys = list(dict.fromkeys(keys))
+        features = {}
+        now = time.time()
+        with self._lock:
+            # Stay well below SQLite's bound parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, features FROM features WHERE namespace = ? AND key IN ({placeholders})",
+                    (namespace, *chunk)
+                ).fetchall()
+                if rows:
+                    self._conn.execute(
+                        f"UPDATE features SET last_access = ? WHERE namespace = ? AND key IN ({placeholders})",
+                        (now, namespace, *chunk)
+                    )
+                features.update((key, json.loads(payload)) for key, payload in rows)
+            self._conn.commit()
+
+            self.hits += len(features)
+            self.misses += len(keys) - len(features)
+        return features
+
+    def set_many(self, features: Dict[str, Dict], namespace: str):
+        """Store the features of each key and evict the least recently used entries if needed."""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO features (namespace, key, features, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(namespace, key, json.dumps(values), now, now) for key, values in features.items()]
+            )
+
+            count = self._conn.execute("SELECT COUNT(*) FROM features").fetchone()[0]
+            overflow = count - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM features WHERE rowid IN "
+                    "(SELECT rowid FROM features ORDER BY last_access ASC LIMIT ?)",
+                    (overflow,)
+                )
+                self.evictions += overflow
+            self._conn.commit()
+
+    def count(self, namespace: Optional[str] = None) -> int:
+        """Get the number of stored feature rows, optionally for one namespace."""
+        with self._lock:
+            if namespace is None:
+                return self._conn.execute("SELECT COUNT(*) FROM features").fetchone()[0]
+            return self._conn.execute("SELECT COUNT(*) FROM features WHERE namespace = ?", (namespace,)).fetchone()[0]
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get hit-rate statistics of the store."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
@@ -1,7 +1,11 @@
 import re
+import pandas as pd
 from typing import Tuple, Optional
 
 class ProductNameParser:
+    # Bump when parsing rules change so cached price indexes are rebuilt
+    VERSION = 1
+
     def __init__(self):
         self.volume_patterns = [
             r"(\d+(\.\d+)?)\s*(ml|l|milliliters|liters)",
@@ -17,6 +21,10 @@ class ProductNameParser:
 
         self.brands = ["hacendado", "mercadona", "carrefour", "dia", "alcampo", "lidl", "aldi", "spar", "el corte ingles"]
 
+        # Combined volume pattern for batch parsing. Each branch lazily scans for one pattern,
+        # so the first pattern in list order wins, just like _extract_volume
+        self._combined_volume_pattern = self._combine_patterns(self.volume_patterns)
+
     def parse_product_name(self, product_name: str) -> Tuple[str, Optional[str], Optional[str]]:
         """
         Parse product name into: (clean_name, volume, brand)
@@ -37,6 +45,53 @@ class ProductNameParser:
         
         return clean_name, volume, brand
 
+    def parse_product_names(self, product_names: pd.Series) -> pd.DataFrame:
+        """
+        Parse a whole column of product names at once.
+
+        Returns a DataFrame with 'clean_name', 'volume' and 'brand' columns that match
+        parse_product_name row by row (missing volume/brand are None).
+        """
+        original = product_names.astype(str).str.lower()
+
+        # Every volume pattern needs a digit, so only those rows go through the regex
+        has_digit = original.str.contains(r'\d', regex=True)
+        volume = pd.Series([None] * len(original), index=original.index, dtype=object)
+        volume.loc[has_digit] = self._extract_first(original[has_digit], self._combined_volume_pattern)
+
+        # Assign brands from lowest to highest priority so the first listed brand wins
+        brand = pd.Series([None] * len(original), index=original.index, dtype=object)
+        for brand_name in reversed(self.brands):
+            brand.loc[original.str.contains(brand_name, regex=False)] = brand_name
+
+        # Volume and brand differ per row, so their removal can't be a single column op
+        stripped = [
+            self._remove_parts(name, row_volume, row_brand)
+            for name, row_volume, row_brand in zip(original, volume, brand)
+        ]
+        clean_name = (
+            pd.Series(stripped, index=original.index, dtype=object)
+            .str.replace(r'[^a-zA-Z0-9\s]', '', regex=True)
+            .str.replace(r'\s+', ' ', regex=True)
+            .str.strip()
+        )
+
+        return pd.DataFrame({'clean_name': clean_name, 'volume': volume, 'brand': brand})
+
+    def _combine_patterns(self, patterns) -> re.Pattern:
+        """Combine patterns into one regex with a named group per pattern, in priority order."""
+        branches = [f".*?(?P<p{i}>{pattern})" for i, pattern in enumerate(patterns)]
+        return re.compile("^(?:" + "|".join(branches) + ")", re.IGNORECASE | re.DOTALL)
+
+    def _extract_first(self, names: pd.Series, combined_pattern: re.Pattern) -> pd.Series:
+        """Get the whole match of the highest-priority pattern for each name (None if none match)."""
+        # The named group of the matching branch is always the last one to close
+        matches = [combined_pattern.match(name) for name in names]
+        return pd.Series(
+            [match.group(match.lastgroup) if match else None for match in matches],
+            index=names.index, dtype=object
+        )
+
     def _extract_volume(self, name: str) -> Optional[str]:
         """Extract volume/weight from product name"""
         for pattern in self.volume_patterns:
@@ -54,16 +109,20 @@ class ProductNameParser:
 
     def _clean_name(self, name: str, volume: str = None, brand: str = None) -> str:
         """Remove volume and brand info to get clean product name"""
-        clean = name.lower()
-
-        if volume:
-            clean = clean.replace(volume, '').strip()
-
-        if brand:
-            clean = clean.replace(brand, '').strip()
+        clean = self._remove_parts(name.lower(), volume, brand)
 
         # Remove any remaining special characters
         clean = re.sub(r'[^a-zA-Z0-9\s]', '', clean)
         # Remove extra spaces  
         clean = re.sub(r'\s+', ' ', clean).strip()
-        return clean
\ No newline at end of file
+        return clean
+
+    def _remove_parts(self, name: str, volume: str = None, brand: str = None) -> str:
+        """Remove the volume and brand substrings from a lower-cased name"""
+        if volume:
+            name = name.replace(volume, '').strip()
+
+        if brand:
+            name = name.replace(brand, '').strip()
+
+        return name
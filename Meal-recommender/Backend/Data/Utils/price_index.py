@@ -0,0 +1,112 @@
+from typing import Dict, List, Optional
+
+class PriceIndex:
+    """
+    Sub-linear substring lookups over the Mercadona price cache.
+
+    Returns exactly what a linear scan over the cache would: an exact match first,
+    otherwise the price of the earliest cached name that either contains the query
+    or is contained in it.
+    """
+
+    NGRAM_SIZE = 3
+
+    def __init__(self, prices: Dict[str, float]):
+        self.names = list(prices.keys())
+        self.prices = list(prices.values())
+        self._exact = prices
+        self._no_match = len(self.names)  # Rank sentinel that loses every min()
+
+        # Names containing the query: n-gram (1..NGRAM_SIZE) posting lists of name ranks
+        self._ngram_index: Dict[str, List[int]] = {}
+        for rank, name in enumerate(self.names):
+            grams = {name[start:start + size]
+                     for size in range(1, self.NGRAM_SIZE + 1)
+                     for start in range(len(name) - size + 1)}
+            for gram in grams:
+                self._ngram_index.setdefault(gram, []).append(rank)  # Ranks are appended in ascending order
+
+        # Names contained in the query: Aho-Corasick automaton over all names
+        self._transitions: List[Dict[str, int]] = [{}]
+        self._output: List[int] = [self._no_match]  # Lowest rank of any name ending in this state
+        self._build_automaton()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _build_automaton(self):
+        goto = self._transitions
+        for rank, name in enumerate(self.names):
+            state = 0
+            for char in name:
+                if char not in goto[state]:
+                    goto.append({})
+                    self._output.append(self._no_match)
+                    goto[state][char] = len(goto) - 1
+                state = goto[state][char]
+            self._output[state] = min(self._output[state], rank)
+
+        # Breadth-first pass over the trie: resolve failure links into full transitions
+        # so a lookup never has to backtrack, and merge outputs along the failure links
+        trie_children = [dict(children) for children in goto]
+        fail = [0] * len(goto)
+        queue = list(trie_children[0].values())
+        while queue:
+            next_queue = []
+            for state in queue:
+                fallback = fail[state]
+                goto[state] = {**goto[fallback], **trie_children[state]}
+                self._output[state] = min(self._output[state], self._output[fallback])
+                for char, child in trie_children[state].items():
+                    fail[child] = goto[fallback].get(char, 0)
+                    next_queue.append(child)
+            queue = next_queue
+
+    def lookup(self, query: str) -> Optional[float]:
+        """Get the price for a normalized ingredient name, or None if nothing matches."""
+        if query in self._exact:
+            return self._exact[query]
+
+        if not self.names:
+            return None
+
+        rank = self._find_contained(query)
+        rank = self._find_containing(query, rank)
+        return self.prices[rank] if rank != self._no_match else None
+
+    def _find_contained(self, query: str) -> int:
+        """Lowest rank of a name contained in the query, in a single pass over it."""
+        transitions = self._transitions
+        output = self._output
+        best = output[0]  # An empty cached name is contained in anything
+        state = 0
+        for char in query:
+            state = transitions[state].get(char, 0)
+            if output[state] < best:
+                best = output[state]
+        return best
+
+    def _find_containing(self, query: str, best: int) -> int:
+        """Lowest rank of a name that contains the query, if it is lower than `best`."""
+        if not query:
+            return 0  # The empty string is contained in every name
+
+        if len(query) <= self.NGRAM_SIZE:
+            ranks = self._ngram_index.get(query)
+            return min(ranks[0], best) if ranks else best
+
+        # Verify candidates from the rarest n-gram of the query, in rank order
+        rarest = None
+        for start in range(len(query) - self.NGRAM_SIZE + 1):
+            ranks = self._ngram_index.get(query[start:start + self.NGRAM_SIZE])
+            if ranks is None:
+                return best
+            if rarest is None or len(ranks) < len(rarest):
+                rarest = ranks
+
+        for rank in rarest:
+            if rank >= best:
+                break
+            if query in self.names[rank]:
+                return rank
+        return best
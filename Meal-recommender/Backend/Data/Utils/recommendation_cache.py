@@ -0,0 +1,106 @@
+from collections import OrderedDict
+from copy import copy
+from typing import Dict, Hashable, List, Optional, Tuple
+from .cache_utils import build_cache_key
+import threading
+import time
+
+class RecommendationCache:
+    """
+    An in-memory cache of personalized recommendation results.
+
+    Entries are keyed by (user id, preference hash, request, version), where the
+    version covers the models and the data meals were enriched from, so a user whose
+    preferences changed, a retrained model or reloaded prices simply miss. Entries
+    expire after `ttl` seconds and the least recently used ones are evicted beyond
+    `max_entries`. Results computed for a top k also answer requests for fewer meals.
+    Meals are copied in and out, so callers may modify the meals they get.
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl: float = 15 * 60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (meals, top_k, created_at)
+
+    @staticmethod
+    def build_preferences_hash(user) -> str:
+        """Get a hash of the preferences that personalize a user's scores."""
+        return build_cache_key(
+            sorted(user.prefered_flavors or []),
+            sorted(user.prefered_types or []),
+            sorted(user.dietary_restrictions or [])
+        )
+
+    def build_key(self, user, request: Hashable, version: Hashable) -> Tuple:
+        """Get the key of a user's result for a request (e.g. a normalized search term)."""
+        return (user.id, self.build_preferences_hash(user), request, version)
+
+    def get(self, key: Tuple, top_k: Optional[int] = None) -> Optional[List]:
+        """Get the cached meals for a key (the first `top_k` of them), or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                meals, cached_top_k, created_at = entry
+                if time.monotonic() - created_at > self.ttl:
+                    del self._entries[key]
+                    entry = None
+                elif cached_top_k is not None and (top_k is None or top_k > cached_top_k):
+                    entry = None  # Only fewer meals than requested were computed
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            meals = meals[:top_k] if top_k is not None else meals
+        return self._copy_meals(meals)
+
+    def set(self, key: Tuple, meals: List, top_k: Optional[int] = None):
+        """Cache the meals computed for a key and top k."""
+        meals = self._copy_meals(meals)
+        with self._lock:
+            self._entries[key] = (meals, top_k, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    @staticmethod
+    def _copy_meals(meals: List) -> List:
+        # Meals hold scalars and lists (of strings or Ingredients), so copying two levels
+        # deep is enough and much cheaper than deepcopy
+        copies = []
+        for meal in meals:
+            meal_copy = copy(meal)
+            for name, value in vars(meal).items():
+                if isinstance(value, list):
+                    setattr(meal_copy, name, [copy(item) for item in value])
+            copies.append(meal_copy)
+        return copies
+
+    def invalidate_user(self, user_id) -> int:
+        """Drop every cached result of a user. Returns the number of dropped entries."""
+        with self._lock:
+            keys = [key for key in self._entries if key[0] == user_id]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def clear(self):
+        """Drop every cached result."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get hit-rate statistics of the cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
@@ -0,0 +1,67 @@
+from typing import Dict, Iterable, Optional
+from .cache_utils import get_project_cache_dir
+import os
+import sqlite3
+import threading
+import time
+
+class TranslationStore:
+    """
+    A persistent SQLite store of ingredient translations.
+
+    Every term a translation backend has processed is recorded once, including
+    terms it had no translation for (stored as NULL), so later runs never send
+    the same term to the backend again.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or os.path.join(get_project_cache_dir(), "translations.db")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.init_database()
+
+    def init_database(self):
+        """Create the translations table if it does not exist."""
+        with self._lock:
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS translations (
+                    src_lang TEXT,
+                    term TEXT,
+                    english TEXT,
+                    source TEXT,
+                    created_at REAL,
+                    PRIMARY KEY (src_lang, term)
+                )
+            ''')
+            self._conn.commit()
+
+    def get_many(self, terms: Iterable[str], src_lang: str) -> Dict[str, Optional[str]]:
+        """Get the stored translations for the given terms (terms not in the store are left out)."""
+        terms = list(dict.fromkeys(terms))
+        translations = {}
+        with self._lock:
+            # Stay well below SQLite's bound parameter limit
+            for start in range(0, len(terms), 500):
+                chunk = terms[start:start + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT term, english FROM translations WHERE src_lang = ? AND term IN ({placeholders})",
+                    (src_lang, *chunk)
+                ).fetchall()
+                translations.update(rows)
+        return translations
+
+    def set_many(self, translations: Dict[str, Optional[str]], src_lang: str, source: str):
+        """Record translations (None for terms without one)."""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO translations (src_lang, term, english, source, created_at) VALUES (?, ?, ?, ?, ?)",
+                [(src_lang, term, english, source, now) for term, english in translations.items()]
+            )
+            self._conn.commit()
+
+    def count(self) -> int:
+        """Get the number of stored translations."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
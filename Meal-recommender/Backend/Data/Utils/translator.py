@@ -1,12 +1,110 @@
+from abc import ABC, abstractmethod
 from deep_translator import GoogleTranslator
+from typing import Dict, Iterable, List, Optional
+from .translation_store import TranslationStore
 import re
 
+class TranslationBackend(ABC):
+    """
+    Base class for machine translation backends used when the manual mapping misses.
+    """
+
+    name = "backend"
+
+    @abstractmethod
+    def translate_batch(self, terms: List[str], src_lang: str) -> Dict[str, Optional[str]]:
+        """
+        Translate a batch of terms to English in one call.
+
+        Returns a translation for every term the backend could process (None when it
+        has no translation). Terms left out failed and will be retried later.
+        """
+
+class GoogleTranslateBackend(TranslationBackend):
+    """
+    Translates through Google Translate, packing many terms into each request.
+    """
+
+    name = "google"
+    MAX_REQUEST_CHARS = 4500  # Google Translate rejects texts over 5000 characters
+
+    def translate_batch(self, terms: List[str], src_lang: str) -> Dict[str, Optional[str]]:
+        translator = GoogleTranslator(source=src_lang, target='en')
+        translations = {}
+        for chunk in self._chunk_terms(terms):
+            chunk_translations = self._translate_chunk(translator, chunk)
+            if chunk_translations is None:
+                break  # Google is unreachable; the remaining terms are retried next time
+            translations.update(chunk_translations)
+        return translations
+
+    def _chunk_terms(self, terms: List[str]) -> List[List[str]]:
+        chunks, chunk, length = [], [], 0
+        for term in terms:
+            if chunk and length + len(term) + 1 > self.MAX_REQUEST_CHARS:
+                chunks.append(chunk)
+                chunk, length = [], 0
+            chunk.append(term)
+            length += len(term) + 1
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+
+    def _translate_chunk(self, translator: GoogleTranslator, chunk: List[str]) -> Optional[Dict[str, Optional[str]]]:
+        # One line per term, so the whole chunk is a single request
+        try:
+            lines = translator.translate("\n".join(chunk)).split("\n")
+            if len(lines) == len(chunk):
+                return {term: line.strip().lower() or None for term, line in zip(chunk, lines)}
+        except Exception as e:
+            print(f"Error translating batch of {len(chunk)} ingredients: {type(e).__name__}")
+            return None
+
+        # Lines got merged or split, so fall back to one request per term
+        translations = {}
+        for term in chunk:
+            try:
+                translations[term] = (translator.translate(term) or '').strip().lower() or None
+            except Exception as e:
+                print(f"Error translating ingredient '{term}': {e}")
+        return translations
+
+class StubTranslationBackend(TranslationBackend):
+    """
+    An offline backend that answers from a fixed mapping, for tests and local runs.
+    """
+
+    name = "stub"
+
+    def __init__(self, translations: Optional[Dict[str, str]] = None):
+        self.translations = translations or {}
+        self.calls = []  # Batches received, so callers can check what was sent
+
+    def translate_batch(self, terms: List[str], src_lang: str) -> Dict[str, Optional[str]]:
+        self.calls.append(list(terms))
+        return {term: self.translations.get(term) for term in terms}
+
 class IngredientTranslator:
     """
     A class to translate ingredient names between different languages.
+
+    Partial matches use a matcher compiled from all Spanish terms, which finds the
+    longest term contained in an ingredient in one pass over it. Terms the manual
+    mapping misses go to an optional translation backend in batches, and the results
+    are kept in an optional TranslationStore so each term is only translated once.
+    Terms the backend failed on are kept in `failed_terms` until a later call translates them.
     """
 
-    def __init__(self):
+    # Bump when the mapping or matching rules change so cached price indexes are rebuilt
+    VERSION = 3
+
+    SPANISH_ALIASES = ['spanish', 'es', 'spa']
+
+    def __init__(self, store: Optional[TranslationStore] = None, backend: Optional[TranslationBackend] = None):
+        self.store = store
+        self.backend = backend
+        self.failed_terms = set()
+
         # Manual mapping for common Spanish ingredients
         self.spanish_to_english = {
             # Vegetables
@@ -194,45 +292,146 @@ class IngredientTranslator:
             'filetes de pechuga de pavo': 'turkey breast fillets',
         }
 
+        self._compile_matcher()
+
     def translate_ingredient(self, ingredient: str, src_lang: str = 'spanish') -> str:
         """
         Translate an ingredient from source language to English.
-        Uses manual mapping first, then falls back to Google Translate.
+        Uses manual mapping first, then falls back to the stored translations and the backend.
+        """
+        english_term = self._translate_manually(ingredient, src_lang)
+        if english_term is None and ingredient.strip():
+            english_term = self._translate_fallback([ingredient], src_lang).get(ingredient)
+        return english_term
+
+    def translate_many(self, ingredients: Iterable[str], src_lang: str = 'spanish') -> List[Optional[str]]:
+        """
+        Translate a batch of ingredients, translating each distinct ingredient once.
+        All manual misses go to the backend together in a single call.
         """
-        if src_lang.lower() in ['spanish', 'es', 'spa']:
+        ingredients = list(ingredients)
+        translations = {ingredient: self._translate_manually(ingredient, src_lang) for ingredient in set(ingredients)}
+
+        unknown = [ingredient for ingredient, english_term in translations.items()
+                   if english_term is None and ingredient.strip()]
+        if unknown:
+            translations.update(self._translate_fallback(sorted(unknown), src_lang))
+
+        return [translations[ingredient] for ingredient in ingredients]
+
+    def _translate_manually(self, ingredient: str, src_lang: str) -> Optional[str]:
+        if src_lang.lower() in self.SPANISH_ALIASES:
             return self._translate_from_spanish(ingredient)
         else:
-            # For other languages, use Google Translate directly
+            # Other languages only go through the backend
             return None
 
+    def _translate_fallback(self, ingredients: List[str], src_lang: str) -> Dict[str, str]:
+        """
+        Translate manual misses from the store, sending only never-seen ones to the backend.
+        Returns the ingredients the store or backend know about (None if they have no translation).
+        """
+        lang = 'es' if src_lang.lower() in self.SPANISH_ALIASES else src_lang.lower()
+        terms = {ingredient: ingredient.lower().strip() for ingredient in ingredients}
+
+        known = self.store.get_many(terms.values(), lang) if self.store else {}
+        missing = sorted({term for term in terms.values() if term not in known})
+
+        if missing and self.backend:
+            try:
+                translated = self.backend.translate_batch(missing, lang)
+            except Exception as e:
+                print(f"Error translating {len(missing)} ingredients with {self.backend.name}: {e}")
+                translated = {}
+
+            # Misses are recorded too, so they are not sent to the backend again
+            if translated and self.store:
+                self.store.set_many(translated, lang, source=self.backend.name)
+            known.update(translated)
+
+            # Terms left out failed (e.g. the backend was unreachable) and are retried next time
+            self.failed_terms.difference_update(translated)
+            self.failed_terms.update(term for term in missing if term not in translated)
+
+        return {ingredient: known[term] for ingredient, term in terms.items() if term in known}
+
+    def get_cache_token(self) -> str:
+        """
+        Get a token that changes whenever translations may change, for keying cached results.
+        """
+        return f"{self.VERSION}:{self.store.count() if self.store else 0}"
+
     def _translate_from_spanish(self, ingredient: str) -> str:
         """
         Translate Spanish ingredient to English using manual mapping first.
         """
         clean_ingredient = ingredient.lower().strip()
         
-        # First, try exact match
-        if clean_ingredient in self.spanish_to_english:
-            return self.spanish_to_english[clean_ingredient]
-        
-        # Try partial matches for compound ingredients like "patata de bravas"
-        for spanish_term, english_term in self.spanish_to_english.items():
-            if spanish_term in clean_ingredient:
-                return english_term
+        # First, try exact match, then the longest term contained in compound
+        # ingredients like "patata de bravas"
+        english_term = self._match_term(clean_ingredient)
+        if english_term:
+            return english_term
         
         # Remove common descriptors and try again
         clean_ingredient = self._remove_descriptors(clean_ingredient)
-        if clean_ingredient in self.spanish_to_english:
-            return self.spanish_to_english[clean_ingredient]
-        
-        # Try partial match again after cleaning
-        for spanish_term, english_term in self.spanish_to_english.items():
-            if spanish_term in clean_ingredient:
-                return english_term
+        english_term = self._match_term(clean_ingredient)
+        if english_term:
+            return english_term
         
         # Fall back to Spanish
         return None
 
+    def _compile_matcher(self):
+        """
+        Compile all Spanish terms into a single regex shaped like a trie.
+        At every position it matches the longest term starting there.
+        """
+        self._terms: Dict[str, str] = {}
+        for spanish_term, english_term in self.spanish_to_english.items():
+            self._terms.setdefault(spanish_term.lower(), english_term)
+
+        # Zero-width lookahead so overlapping matches at every position are reported
+        pattern = self._build_trie_pattern(term for term in self._terms if term)
+        self._matcher = re.compile(f"(?=({pattern}))") if pattern else None
+
+    def _build_trie_pattern(self, terms: Iterable[str]) -> str:
+        trie = {}
+        for term in terms:
+            node = trie
+            for char in term:
+                node = node.setdefault(char, {})
+            node[''] = True  # Marks the end of a term
+
+        def to_pattern(node) -> str:
+            is_end = '' in node
+            branches = [re.escape(char) + to_pattern(child) for char, child in node.items() if char != '']
+            if not branches:
+                return ''
+            # Branches start with distinct characters, so at most one of them can match
+            group = branches[0] if len(branches) == 1 and not is_end else f"(?:{'|'.join(branches)})"
+            # A greedy optional group keeps extending past a shorter term before settling for it
+            return f"{group}?" if is_end else group
+
+        return to_pattern(trie)
+
+    def _match_term(self, ingredient: str) -> Optional[str]:
+        """
+        Get the translation of the exact term, or of the longest term contained in the
+        ingredient (the earliest one on ties).
+        """
+        if ingredient in self._terms:
+            return self._terms[ingredient]
+
+        if self._matcher is None:
+            return None
+
+        longest = ''
+        for match in self._matcher.finditer(ingredient):
+            if len(match.group(1)) > len(longest):
+                longest = match.group(1)
+        return self._terms[longest] if longest else None
+
     def _remove_descriptors(self, ingredient: str) -> str:
         """
         Remove common descriptors to get the base ingredient.
@@ -254,22 +453,12 @@ class IngredientTranslator:
         else:
             return ingredient
 
-    def _translate_with_google(self, ingredient: str, src_lang: str) -> str:
-        """
-        Translate using Google Translate as fallback.
-        """
-        try:
-            translated_text = GoogleTranslator(source=src_lang, target='en').translate(ingredient.lower())
-            return translated_text.lower()
-        except Exception as e:
-            print(f"Error translating ingredient '{ingredient}': {e}")
-            return ingredient.lower()
-
     def add_custom_mapping(self, spanish_term: str, english_term: str):
         """
         Add a custom mapping to the dictionary.
         """
         self.spanish_to_english[spanish_term.lower()] = english_term.lower()
+        self._compile_matcher()
 
     def get_mapping_stats(self):
         """
@@ -1,40 +1,278 @@
 import pandas as pd
-from typing import Optional, Dict
+import numpy as np
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Optional, Dict, Tuple, Any, List
 from .Utils.parser import ProductNameParser
-from .Utils.translator import IngredientTranslator
-from .Utils.csv_utils import parse_r_vector, parse_r_vector_to_string, parse_ISO_8601_duration
+from .Utils.translator import IngredientTranslator, TranslationBackend
+from .Utils.translation_store import TranslationStore
+from .Utils.price_index import PriceIndex
+from .Utils.cache_utils import hash_file, hash_file_cached, build_cache_key, get_default_cache_dir
+from .Utils.csv_utils import (parse_r_vector, parse_r_vector_to_string, parse_r_vector_column,
+                              parse_r_vector_to_string_column, parse_ISO_8601_duration_column)
 import re
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet caching of training records is optional
+    pa = None
+    pq = None
+
 class MercadonaCSVProcessor:
     """
     A class to process CSV files from Mercadona and extract ingredient information.
+
+    The built price cache is saved to `cache_dir` as a .npy artifact keyed by the CSV's
+    content hash, the parser version and the translator's cache token, so later runs
+    map it instead of parsing and translating the CSV. It is not saved while
+    ingredients failed to translate.
+    With start_watching(), a changed CSV is picked up in the background and the new
+    index is swapped in atomically; lookups keep using the old one until then.
+
+    Resolved prices, including misses, are memoized in a bounded LRU per index.
     """
 
-    def __init__(self, csv_file: str):
+    ARTIFACT_PREFIX = "price_index_"
+    ARTIFACT_VERSION = 2  # Bump when the artifact layout changes
+
+    def __init__(self, csv_file: str, cache_dir: Optional[str] = None, lookup_cache_size: int = 4096,
+                 translator: Optional[IngredientTranslator] = None,
+                 translation_backend: Optional[TranslationBackend] = None):
         self.csv_file = csv_file
+        self.cache_dir = cache_dir or get_default_cache_dir(csv_file)
+        self.lookup_cache_size = lookup_cache_size
         self.parser = ProductNameParser()
-        self.translator = IngredientTranslator()
+        self.translation_backend = translation_backend  # Opt-in, e.g. GoogleTranslateBackend()
+        self.translator = translator or self._create_translator()
         self._price_cache = None
+        self._price_index = None
+        self._cached_lookup = None  # Memoized lookup bound to the current index
+
+        # Hot reload state
+        self._reload_lock = threading.Lock()  # Only one (re)build at a time; lookups never take it
+        self._file_signature = None  # (mtime_ns, size) of the CSV the current index was built from
+        self._watch_thread = None
+        self._stop_watching = threading.Event()
+        self._reload_metrics = {
+            'loads': 0,
+            'failed_reloads': 0,
+            'last_reload_duration': None,
+            'last_reload_at': None,
+            'index_size': 0,
+            'last_error': None
+        }
+
+    def _create_translator(self) -> IngredientTranslator:
+        """
+        Translator that remembers backend fallbacks in the cache directory.
+        Without a translation_backend, only the manual mapping and stored translations are used,
+        so building the price index never calls out to the network.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        store = TranslationStore(os.path.join(self.cache_dir, "translations.db"))
+        return IngredientTranslator(store=store, backend=self.translation_backend)
 
     def get_ingredient_price(self, ingredient_name: str) -> Optional[float]:
         """
         Get the price per unit for a given ingredient name.
+        Falls back to the first cached name that contains, or is contained in, the ingredient name.
         """
-        if self._price_cache is None:
-            self._build_price_cache()
+        lookup = self._cached_lookup
+        if lookup is None:
+            lookup = self._ensure_price_index()
 
         # Normalize the ingredient name
         normalized_name = ingredient_name.lower()
 
-        if normalized_name in self._price_cache:
-            return self._price_cache[ingredient_name.lower()]
-        
-        for cached_name, price in self._price_cache.items():
-            if normalized_name in cached_name or cached_name in normalized_name:
-                return price
-        
-        # Check if the ingredient is in the cache
-        return None
+        return lookup(normalized_name)
+
+    def get_ingredient_prices(self, ingredient_names: List[str]) -> List[Optional[float]]:
+        """
+        Get the prices for a whole list of ingredient names (e.g. one meal's ingredients).
+        All names are resolved against the same index, even if a reload happens meanwhile.
+        """
+        lookup = self._cached_lookup
+        if lookup is None:
+            lookup = self._ensure_price_index()
+
+        return [lookup(ingredient_name.lower()) for ingredient_name in ingredient_names]
+
+    def get_lookup_stats(self) -> Dict[str, Any]:
+        """Get hit/miss statistics of the price lookup memo since the last (re)load."""
+        lookup = self._cached_lookup
+        if lookup is None:
+            return {'hits': 0, 'misses': 0, 'size': 0, 'max_size': self.lookup_cache_size, 'hit_rate': 0.0}
+
+        info = lookup.cache_info()
+        total = info.hits + info.misses
+        return {
+            'hits': info.hits,
+            'misses': info.misses,
+            'size': info.currsize,
+            'max_size': info.maxsize,
+            'hit_rate': info.hits / total if total else 0.0
+        }
+
+    def _ensure_price_index(self):
+        with self._reload_lock:
+            if self._cached_lookup is None:
+                self._swap_price_index(*self._load_or_build_price_index())
+            return self._cached_lookup
+
+    # Hot reload
+    def start_watching(self, poll_interval: float = 30):
+        """
+        Poll the CSV for changes in a background thread and reload prices when it changes.
+        """
+        if self._watch_thread and self._watch_thread.is_alive():
+            return
+
+        self._stop_watching.clear()
+        self._watch_thread = threading.Thread(target=self._watch_loop, args=(poll_interval,), daemon=True)
+        self._watch_thread.start()
+
+    def stop_watching(self):
+        """Stop the background watcher thread."""
+        self._stop_watching.set()
+        if self._watch_thread:
+            self._watch_thread.join()
+            self._watch_thread = None
+
+    def _watch_loop(self, poll_interval: float):
+        previous_signature = self._get_file_signature()
+        while not self._stop_watching.wait(poll_interval):
+            signature = self._get_file_signature()
+
+            # Only reload once the file has stopped changing between two polls,
+            # so a scrape that is still writing the CSV is never picked up half-way
+            if signature is not None and signature == previous_signature and signature != self._file_signature:
+                self.reload_prices()
+            previous_signature = signature
+
+    def _get_file_signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.csv_file)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def reload_prices(self) -> bool:
+        """
+        Rebuild the price index from the current CSV and swap it in.
+        On failure the previous index keeps serving lookups.
+        """
+        try:
+            with self._reload_lock:
+                self._swap_price_index(*self._load_or_build_price_index())
+            return True
+        except Exception as e:
+            self._reload_metrics['failed_reloads'] += 1
+            self._reload_metrics['last_error'] = str(e)
+            print(f"Error reloading Mercadona prices: {e}")
+            return False
+
+    def _swap_price_index(self, price_cache: Dict[str, float], price_index: PriceIndex,
+                          file_signature: Optional[Tuple[int, int]], duration: float):
+        # Lookups read self._cached_lookup once, so a single assignment is an atomic swap.
+        # The memo belongs to its index, so memoized prices (and misses) never go stale
+        self._price_cache = price_cache
+        self._price_index = price_index
+        self._cached_lookup = lru_cache(maxsize=self.lookup_cache_size)(price_index.lookup)
+        self._file_signature = file_signature
+
+        self._reload_metrics.update({
+            'loads': self._reload_metrics['loads'] + 1,
+            'last_reload_duration': duration,
+            'last_reload_at': time.time(),
+            'index_size': len(price_index),
+            'last_error': None
+        })
+
+    def get_index_version(self) -> int:
+        """
+        Get a version of the served price index, which changes on every reload.
+        The initial load keeps version 0: nothing was priced with another index before it.
+        """
+        return max(self._reload_metrics['loads'] - 1, 0)
+
+    def get_reload_metrics(self) -> Dict[str, Any]:
+        """Get load/reload counters, the last reload duration (seconds) and the index size."""
+        return dict(self._reload_metrics)
+
+    # Price index artifact
+    def _load_or_build_price_index(self) -> Tuple[Dict[str, float], PriceIndex, Optional[Tuple[int, int]], float]:
+        """
+        Load the price index artifact for the current CSV, or build and save it.
+        Returns the price cache, its index, the CSV signature it was read from and the time taken.
+        """
+        start_time = time.perf_counter()
+        file_signature = self._get_file_signature()
+        artifact_path = self._get_artifact_path()
+
+        price_cache = self._load_price_cache(artifact_path)
+        if price_cache is None:
+            price_cache = self._build_price_cache()
+            if self.translator.failed_terms:
+                # Saving would pin the untranslated names under a key that stays valid,
+                # so skip it and let the next load retry them
+                print(f"Not saving price index: {len(self.translator.failed_terms)} ingredients failed to translate")
+            else:
+                # The build may have stored new translations, which changes the key
+                self._save_price_cache(self._get_artifact_path(), price_cache)
+
+        price_index = PriceIndex(price_cache)
+        return price_cache, price_index, file_signature, time.perf_counter() - start_time
+
+    def _get_artifact_path(self) -> str:
+        # The CSV is only re-hashed when its modification time or size changed
+        key = build_cache_key(hash_file_cached(self.csv_file, self.cache_dir), self.ARTIFACT_VERSION,
+                              ProductNameParser.VERSION, self.translator.get_cache_token())
+        return os.path.join(self.cache_dir, f"{self.ARTIFACT_PREFIX}{key}.npy")
+
+    def _load_price_cache(self, artifact_path: str) -> Optional[Dict[str, float]]:
+        """
+        Map a saved price index artifact. Returns None if there is no usable artifact.
+        """
+        if not os.path.exists(artifact_path):
+            return None
+
+        try:
+            artifact = np.load(artifact_path, mmap_mode='r')
+            # Names are stored in cache order, which the first-match lookups rely on
+            return dict(zip(artifact['name'].tolist(), artifact['price'].tolist()))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error loading price index {artifact_path}: {e}")
+            return None
+
+    def _save_price_cache(self, artifact_path: str, price_cache: Dict[str, float]):
+        """
+        Save the price cache as a structured array of names and prices, in cache order.
+        Replaces the artifact atomically and removes artifacts for older CSVs or versions.
+        """
+        names = list(price_cache.keys())
+        width = max((len(name) for name in names), default=1)
+        artifact = np.empty(len(names), dtype=[('name', f'<U{width}'), ('price', 'f8')])
+        artifact['name'] = names
+        artifact['price'] = list(price_cache.values())
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_path = f"{artifact_path}.tmp"
+            with open(temp_path, 'wb') as f:
+                np.save(f, artifact)
+            os.replace(temp_path, artifact_path)
+
+            for filename in os.listdir(self.cache_dir):
+                path = os.path.join(self.cache_dir, filename)
+                if filename.startswith(self.ARTIFACT_PREFIX) and filename.endswith('.npy') and path != artifact_path:
+                    os.remove(path)
+        except OSError as e:
+            print(f"Error saving price index {artifact_path}: {e}")
 
     def _build_price_cache(self) -> Dict[str, float]:
         """
@@ -42,44 +280,131 @@ class MercadonaCSVProcessor:
         """
         df = pd.read_csv(self.csv_file)
 
-        price_cache = {}
+        parsed = self.parser.parse_product_names(df['name'])
 
-        for _, row in df.iterrows():
-            clean_name, volume, brand = self.parser.parse_product_name(row['name'])
-            english_name = self.translator.translate_ingredient(clean_name)
+        # Many products share a cleaned name; translate_many translates each one once
+        english_names = pd.Series(self.translator.translate_many(parsed['clean_name']), index=parsed.index, dtype=object)
 
-            if not english_name:
-                continue
+        # Rows like "Price not available" have no usable price
+        prices = pd.to_numeric(df['price'], errors='coerce')
+        prices_per_unit = self._calculate_prices_per_unit(prices, parsed['volume'])
 
-            price_per_unit = self._calculate_price_per_unit(row['price'], volume)
-            if price_per_unit is not None:
-                price_cache[english_name] = price_per_unit
-        self._price_cache = price_cache
-        return price_cache
+        keep = english_names.notna() & (english_names != '') & prices.notna()
 
-    
-    def _calculate_price_per_unit(self, price: float, volume: str) -> Optional[float]:
+        # Later rows overwrite earlier ones while keeping the first insertion position
+        return dict(zip(english_names[keep], prices_per_unit[keep]))
+
+    def _calculate_prices_per_unit(self, prices: pd.Series, volumes: pd.Series) -> pd.Series:
         """
-        Calculate the price per unit for a given row in the DataFrame.
+        Calculate the price per unit for whole columns of prices and volumes.
+        Rows whose volume does not start with a number keep their plain price.
         """
-        if not volume:
-            return price
-        
-        # if volume cant be converted to float, return price
-        try:
-            float(volume.split()[0])
-        except ValueError:
-            return price
+        quantities = pd.to_numeric(volumes.str.split().str[0], errors='coerce')
+        has_quantity = quantities.notna() & (quantities != 0)
+        return prices.where(~has_quantity, prices / quantities)
+
+def _parse_recipe_frame(df: pd.DataFrame, has_reviews: bool) -> List[Dict[str, Any]]:
+    """
+    Parse and filter the training records of one frame of recipes.
+    Module level so that FoodCSVProcessor can run it in worker processes.
+    """
+    records = []
+    columns = [
+        parse_r_vector_column(df['RecipeIngredientParts']),
+        parse_r_vector_to_string_column(df['RecipeInstructions']),
+        df['RecipeCategory'],
+        parse_r_vector_column(df['Keywords']),
+        parse_ISO_8601_duration_column(df['PrepTime']),
+        parse_ISO_8601_duration_column(df['CookTime']),
+        parse_ISO_8601_duration_column(df['TotalTime'])
+    ]
+    if has_reviews:
+        columns += [df['avg_rating'], df['review_count'], df['rating_std']]
+
+    for values in zip(*columns):
+        ingredients, instructions, category, keywords, prep_time, cook_time, total_time = values[:7]
+
+        recipe_data = ({
+            'ingredients': ingredients,
+            'instructions': instructions,
+            'category': category,
+            'keywords': keywords,
+            'prep_time': int(prep_time),
+            'cook_time': int(cook_time),
+            'total_time': int(total_time)
+        })
         
-        return float(price) / float(volume.split()[0])  # Assuming volume is in the format "X units"
-    
+        if recipe_data['prep_time'] <= 0 or recipe_data['prep_time'] > 1440:
+            continue # Skip recipes with invalid prep times
+
+        if has_reviews:
+            recipe_data.update({
+                'rating': values[7],
+                'review_count': values[8],
+                'rating_std': values[9]
+            })
+        else:
+            recipe_data.update({
+                'rating': None,
+                'review_count': 0,
+                'rating_std': None
+            })
+        records.append(recipe_data)
+    return records
+
 class FoodCSVProcessor:
     """
     A class to process CSV files from food databases and extract ingredient information.
+
+    With `chunksize` set, nothing is loaded up front: reviews are aggregated chunk by
+    chunk, recipes are streamed with only the columns get_all_data needs, and
+    iter_all_data yields records lazily, so memory stays bounded for any dataset size.
+
+    The parsed and filtered records are written to a Parquet file in `cache_dir` the
+    first time they are read (when pyarrow is installed), keyed by the hashes of both
+    CSVs and TRAINING_CACHE_VERSION. Later reads come straight from that file.
+
+    With `workers` above 1, the recipes are split into shards of PARSE_SHARD_SIZE rows
+    that are parsed in a process pool; the records still come out in CSV order.
     """
 
-    def __init__(self, csv_file: str, review_csv_file: Optional[str] = None):
+    # Bump when parsing or filtering of training records changes so the Parquet cache is rebuilt
+    TRAINING_CACHE_VERSION = 2
+    TRAINING_CACHE_PREFIX = "training_records_"
+    TRAINING_CACHE_BATCH_SIZE = 50000
+    PARSE_SHARD_SIZE = 10000  # Rows per shard when parsing in worker processes
+
+    # Columns read by get_all_data/iter_all_data
+    RECIPE_COLUMNS = ['RecipeId', 'RecipeIngredientParts', 'RecipeInstructions', 'RecipeCategory', 'Keywords',
+                      'PrepTime', 'CookTime', 'TotalTime']
+    RECIPE_DTYPES = {
+        'RecipeIngredientParts': str,
+        'RecipeInstructions': str,
+        'RecipeCategory': str,
+        'Keywords': str,
+        'PrepTime': str,
+        'CookTime': str,
+        'TotalTime': str
+    }
+    REVIEW_COLUMNS = ['RecipeId', 'Rating']
+    REVIEW_DTYPES = {'Rating': 'float64'}
+
+    def __init__(self, csv_file: str, review_csv_file: Optional[str] = None, chunksize: Optional[int] = None,
+                 cache_dir: Optional[str] = None, use_cache: bool = True, workers: Optional[int] = None):
         self.csv_file = csv_file
+        self.review_csv_file = review_csv_file
+        self.chunksize = chunksize
+        self.workers = workers  # Parser processes; None or 1 parses in this process
+        self.cache_dir = cache_dir or get_default_cache_dir(csv_file)
+        self.use_cache = use_cache and pa is not None
+        self._review_aggregates = None
+
+        if chunksize:
+            # Streaming mode: data is read lazily by iter_all_data
+            self.df = None
+            self.review_df = None
+            return
+
         self.df = pd.read_csv(csv_file)
 
         if review_csv_file:
@@ -111,6 +436,58 @@ class FoodCSVProcessor:
         
         return merged_df
 
+    def _has_reviews(self) -> bool:
+        if self.chunksize:
+            return self.review_csv_file is not None and not self._get_review_aggregates().empty
+        return self.review_df is not None and not self.review_df.empty
+
+    def _get_review_aggregates(self) -> pd.DataFrame:
+        """
+        Aggregate ratings per recipe from the reviews CSV, one chunk at a time.
+        Produces the same mean/count/std (rounded to 2 decimals) as _merge_with_reviews.
+        """
+        if self._review_aggregates is not None:
+            return self._review_aggregates
+
+        totals = None
+        for chunk in pd.read_csv(self.review_csv_file, usecols=self.REVIEW_COLUMNS,
+                                 dtype=self.REVIEW_DTYPES, chunksize=self.chunksize):
+            ratings = chunk['Rating']
+            chunk = chunk.assign(rating_sum=ratings, rating_sumsq=ratings ** 2, review_count=ratings.notna())
+            chunk_totals = chunk.groupby('RecipeId')[['rating_sum', 'rating_sumsq', 'review_count']].sum()
+            totals = chunk_totals if totals is None else totals.add(chunk_totals, fill_value=0)
+
+        if totals is None:
+            self._review_aggregates = pd.DataFrame(columns=['avg_rating', 'review_count', 'rating_std'])
+            return self._review_aggregates
+
+        count = totals['review_count']
+        mean = totals['rating_sum'] / count.where(count > 0)
+        # Sample variance (ddof=1) from the running sums, undefined below two ratings
+        variance = (totals['rating_sumsq'] - totals['rating_sum'] * mean) / (count - 1).where(count > 1)
+        std = np.sqrt(variance.clip(lower=0))
+
+        self._review_aggregates = pd.DataFrame({
+            'avg_rating': mean,
+            'review_count': count.astype('int64'),
+            'rating_std': std
+        }).round(2)
+        return self._review_aggregates
+
+    def _iter_recipe_frames(self):
+        """Yield the recipes (merged with review aggregates) as one frame, or chunk by chunk."""
+        if not self.chunksize:
+            yield self.df
+            return
+
+        review_aggregates = self._get_review_aggregates() if self.review_csv_file else None
+        for chunk in pd.read_csv(self.csv_file, usecols=self.RECIPE_COLUMNS,
+                                 dtype=self.RECIPE_DTYPES, chunksize=self.chunksize):
+            if review_aggregates is not None:
+                # Left join, so recipes without reviews are kept
+                chunk = chunk.join(review_aggregates, on='RecipeId')
+            yield chunk
+
     def get_ingredients(self) -> list:
         """
         Get a list of ingredients from the CSV file.
@@ -156,56 +533,156 @@ class FoodCSVProcessor:
         """
         Get a list of preparation times from the CSV file.
         """
-        prep_times = self.df['PrepTime'].tolist()
+        return parse_ISO_8601_duration_column(self.df['PrepTime']).tolist()
+    
+    def get_all_data(self, workers: Optional[int] = None) -> list:
+        """
+        Get all data from the CSV file.
+        """
+        return list(self.iter_all_data(workers))
+
+    def iter_all_data(self, workers: Optional[int] = None):
+        """
+        Yield the data of each recipe with a valid prep time, one record at a time.
+        Reads the Parquet cache when there is one, and writes it otherwise.
+        `workers` overrides the number of parser processes set on the instance.
+        """
+        cache_path = self._get_training_cache_path() if self.use_cache else None
+        if cache_path and os.path.exists(cache_path):
+            yield from self._iter_cached_data(cache_path)
+            return
 
-        parsed_prep_times = []
+        workers = workers or self.workers
+        if workers and workers > 1:
+            records = self._iter_parsed_data_parallel(workers)
+        else:
+            records = self._iter_parsed_data()
+        if cache_path:
+            records = self._write_training_cache(records, cache_path)
+        yield from records
 
-        for prep_time in prep_times:
+    def build_training_cache(self) -> Optional[str]:
+        """
+        Convert the CSVs into the Parquet cache of training records, if it does not exist yet.
+        Returns the cache path, or None when caching is unavailable.
+        """
+        for _ in self.iter_all_data():
+            pass
 
-            if not prep_time or pd.isna(prep_time):
-                return 0
-            
-            clean_prep_time = parse_ISO_8601_duration(prep_time)
-            if clean_prep_time is None:
-                clean_prep_time = 0
-            
-            parsed_prep_times.append(clean_prep_time)
+        cache_path = self._get_training_cache_path() if self.use_cache else None
+        return cache_path if cache_path and os.path.exists(cache_path) else None
 
-        return parsed_prep_times
-    
-    def get_all_data(self) -> list:
+    def _iter_parsed_data(self):
         """
-        Get all data from the CSV file.
+        Parse and filter the records from the CSV files.
         """
-        data = []
-        for _, row in self.df.iterrows():
+        has_reviews = self._has_reviews()
 
-            recipe_data = ({
-                'ingredients': parse_r_vector(row['RecipeIngredientParts']),
-                'instructions': parse_r_vector_to_string(row['RecipeInstructions']),
-                'category': row['RecipeCategory'],
-                'keywords': parse_r_vector(row['Keywords']),
-                'prep_time': parse_ISO_8601_duration(row['PrepTime'])
-            })
+        for df in self._iter_recipe_frames():
+            yield from _parse_recipe_frame(df, has_reviews)
 
-            if recipe_data['prep_time'] is None:
-                recipe_data['prep_time'] = 0
-            
-            if recipe_data['prep_time'] <= 0 or recipe_data['prep_time'] > 1440:
-                continue # Skip recipes with invalid prep times
-
-            if not self.review_df.empty:
-                recipe_data.update({
-                    'rating': row['avg_rating'],
-                    'review_count': row['review_count'],
-                    'rating_std': row['rating_std']
-                })
-            else:
-                recipe_data.update({
-                    'rating': None,
-                    'review_count': 0,
-                    'rating_std': None
-                })
-            data.append(recipe_data)
-        return data
-        
\ No newline at end of file
+    def _iter_parsed_data_parallel(self, workers: int):
+        """
+        Parse shards of the recipes in a process pool and yield the records in shard order.
+        At most two shards per worker are in flight, so memory stays bounded while streaming.
+        """
+        has_reviews = self._has_reviews()
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            try:
+                for shard in self._iter_recipe_shards():
+                    pending.append(executor.submit(_parse_recipe_frame, shard, has_reviews))
+                    if len(pending) >= workers * 2:
+                        yield from pending.popleft().result()
+
+                while pending:
+                    yield from pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()  # Iteration stopped early, skip shards that have not started
+
+    def _iter_recipe_shards(self):
+        """Split the recipe frames into shards of PARSE_SHARD_SIZE rows."""
+        for df in self._iter_recipe_frames():
+            for start in range(0, len(df), self.PARSE_SHARD_SIZE):
+                yield df.iloc[start:start + self.PARSE_SHARD_SIZE]
+
+    # Parquet cache of training records
+    def _get_training_cache_path(self) -> str:
+        review_hash = hash_file(self.review_csv_file) if self.review_csv_file else "no-reviews"
+        key = build_cache_key(hash_file(self.csv_file), review_hash, self.TRAINING_CACHE_VERSION)
+        return os.path.join(self.cache_dir, f"{self.TRAINING_CACHE_PREFIX}{key}.parquet")
+
+    def _get_training_cache_schema(self):
+        return pa.schema([
+            ('ingredients', pa.list_(pa.string())),
+            ('instructions', pa.string()),
+            ('category', pa.string()),
+            ('keywords', pa.list_(pa.string())),
+            ('prep_time', pa.int64()),
+            ('cook_time', pa.int64()),
+            ('total_time', pa.int64()),
+            # Missing ratings stay NaN (merged recipes without reviews) or null (no reviews CSV)
+            ('rating', pa.float64()),
+            ('review_count', pa.float64()),
+            ('rating_std', pa.float64())
+        ])
+
+    def _iter_cached_data(self, cache_path: str):
+        """
+        Yield the records stored in the Parquet cache, one batch at a time.
+        """
+        parquet_file = pq.ParquetFile(cache_path)
+        for batch in parquet_file.iter_batches(batch_size=self.chunksize or self.TRAINING_CACHE_BATCH_SIZE):
+            for record in batch.to_pylist():
+                if record['category'] is None:
+                    record['category'] = np.nan  # pandas reads missing categories as NaN
+                yield record
+
+    def _write_training_cache(self, records, cache_path: str):
+        """
+        Pass records through while writing them to the Parquet cache.
+        The cache only replaces the temp file once every record has been written.
+        """
+        schema = self._get_training_cache_schema()
+        temp_path = f"{cache_path}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            writer = pq.ParquetWriter(temp_path, schema)
+        except OSError as e:
+            print(f"Error creating training cache {cache_path}: {e}")
+            yield from records
+            return
+
+        batch = []
+        completed = False
+        try:
+            for record in records:
+                yield record
+                batch.append(record)
+                if len(batch) >= self.TRAINING_CACHE_BATCH_SIZE:
+                    writer.write_table(self._records_to_table(batch, schema))
+                    batch = []
+
+            if batch:
+                writer.write_table(self._records_to_table(batch, schema))
+            completed = True
+        finally:
+            writer.close()
+            if completed:
+                os.replace(temp_path, cache_path)
+                self._remove_stale_training_caches(cache_path)
+            elif os.path.exists(temp_path):
+                os.remove(temp_path)  # Iteration stopped early, the file is incomplete
+
+    def _records_to_table(self, records: list, schema):
+        columns = {name: [record[name] for record in records] for name in schema.names}
+        columns['category'] = [category if isinstance(category, str) else None for category in columns['category']]
+        return pa.Table.from_pydict(columns, schema=schema)
+
+    def _remove_stale_training_caches(self, cache_path: str):
+        for filename in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, filename)
+            if filename.startswith(self.TRAINING_CACHE_PREFIX) and filename.endswith('.parquet') and path != cache_path:
+                os.remove(path)
@@ -1,21 +1,27 @@
-from Backend.Api.themealdb import MealDBAPI
+from Backend.Api.themealdb import MealDBAPI, MealDBResponseCache
 from Backend.Data.csv_processor import MercadonaCSVProcessor, FoodCSVProcessor
+from Backend.Data.Utils.translator import TranslationBackend
 from Backend.models.meal import Meal
 from Backend.models.ingredient import Ingredient
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Iterator
 
 class DataMerger:
-    def __init__(self, mercadona_csv_file_path: str = None, food_csv_file_path: str = None, review_csv_file_path: str = None):
+    def __init__(self, mercadona_csv_file_path: str = None, food_csv_file_path: str = None, review_csv_file_path: str = None,
+                 max_workers: int = 8, meal_api: Optional[MealDBAPI] = None, training_chunksize: Optional[int] = None,
+                 translation_backend: Optional[TranslationBackend] = None):
         self.mercadona_csv_file_path = mercadona_csv_file_path
         self.food_csv_file_path = food_csv_file_path
         self.review_csv_file_path = review_csv_file_path
 
-        self.meal_api = MealDBAPI()
-        self.price_processor = MercadonaCSVProcessor(mercadona_csv_file_path)
+        self.meal_api = meal_api or MealDBAPI(cache=MealDBResponseCache())
+        self.max_workers = max(1, max_workers)  # Concurrency limit for API calls
+        self.price_processor = MercadonaCSVProcessor(mercadona_csv_file_path, translation_backend=translation_backend)
 
         self.is_training = False
         if food_csv_file_path:
-            self.training_processor = FoodCSVProcessor(food_csv_file_path, review_csv_file_path)
+            # With a chunksize the training CSVs are streamed instead of loaded whole
+            self.training_processor = FoodCSVProcessor(food_csv_file_path, review_csv_file_path, chunksize=training_chunksize)
             self.is_training = True
     
     def get_enriched_meals(self, search_term: str) -> List[Meal]:
@@ -26,22 +32,22 @@ class DataMerger:
             ('search_by_area', self.meal_api.search_by_area)
         ]
 
-        api_meals = []
-        for method_name, method in search_methods:
-            try:
-                meals = method(search_term)
-                if meals:
-                    api_meals.extend(meals)
-            except Exception as e:
-                print(f"Error in {method_name} for search term '{search_term}': {e}")
-        
-        enriched_meals = []
-        for meal_data in api_meals:
-            full_meal = self.meal_api.get_meal_details(meal_data['idMeal'])
-            meal = self._convert_to_meal_model(full_meal)
-            enriched_meals.append(meal)
-        
-        return enriched_meals
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(search_methods))) as executor:
+            futures = [
+                (method_name, executor.submit(method, search_term))
+                for method_name, method in search_methods
+            ]
+
+            api_meals = []
+            for method_name, future in futures:
+                try:
+                    meals = future.result()
+                    if meals:
+                        api_meals.extend(meals)
+                except Exception as e:
+                    print(f"Error in {method_name} for search term '{search_term}': {e}")
+
+        return self._enrich_meals(api_meals)
     
     def get_random_enriched_meal(self) -> Meal:
         """Get a random meal from API and enrich with pricing data"""
@@ -53,47 +59,66 @@ class DataMerger:
         return self._convert_to_meal_model(full_meal)
     
     def get_all_enriched_meals(self) -> List[Meal]:
-        categories = ['Beef', 'Chicken', 'Dessert', 'Pasta', 'Seafood', 'Vegetarian']
         """Get all meals from API and enrich with pricing data"""
-        enriched_meals = []
+        categories = ['Beef', 'Chicken', 'Dessert', 'Pasta', 'Seafood', 'Vegetarian']
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(categories))) as executor:
+            results = executor.map(self.meal_api.search_by_category, categories)
 
-        api_meals = []
-        for category in categories:
-            api_meals.extend(self.meal_api.search_by_category(category))
+            api_meals = []
+            for meals in results:
+                api_meals.extend(meals)
 
-        for meal_data in api_meals:
-            full_meal = self.meal_api.get_meal_details(meal_data['idMeal'])
-            meal = self._convert_to_meal_model(full_meal)
-            enriched_meals.append(meal)
+        return self._enrich_meals(api_meals)
 
-        return enriched_meals
+    def _enrich_meals(self, api_meals: List[Dict]) -> List[Meal]:
+        """
+        Fetch full details for search hits concurrently and convert them to Meal models.
+        Duplicate ids are fetched once, results keep the order of the first hit.
+        """
+        meal_ids = list(dict.fromkeys(meal_data['idMeal'] for meal_data in api_meals))
+        if not meal_ids:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(meal_ids))) as executor:
+            # map() yields in submission order, so the output is deterministic
+            enriched_meals = executor.map(self._fetch_enriched_meal, meal_ids)
+            return [meal for meal in enriched_meals if meal is not None]
+
+    def _fetch_enriched_meal(self, meal_id: str) -> Optional[Meal]:
+        """Fetch and convert a single meal, keeping failures local to that meal."""
+        try:
+            full_meal = self.meal_api.get_meal_details(meal_id)
+            if not full_meal:
+                return None
+            return self._convert_to_meal_model(full_meal)
+        except Exception as e:
+            print(f"Error enriching meal {meal_id}: {e}")
+            return None
     
-    def get_all_training_meals(self) -> List[Meal]:
+    def get_all_training_meals(self, workers: Optional[int] = None) -> List[Meal]:
         """Get all training meals from CSV and convert to Meal model with pricing"""
+        return list(self.iter_training_meals(workers))
+
+    def iter_training_meals(self, workers: Optional[int] = None) -> Iterator[Meal]:
+        """Yield training meals from CSV one at a time, converted to Meal model with pricing"""
         if not self.is_training:
             raise RuntimeError("DataMerger is not initialized for training data. Provide a food CSV file path.")
         
         if not self.training_processor:
             raise RuntimeError("Training processor is not initialized. Provide a food CSV file path.")
 
-        training_data = self.training_processor.get_all_data()
-        if not training_data:
-            return []
-
-        training_meals = []
-        for data in training_data:
-            meal = self._convert_training_data_to_meal_model(data)
-            training_meals.append(meal)
-        
-        return training_meals
+        for data in self.training_processor.iter_all_data(workers):
+            yield self._convert_training_data_to_meal_model(data)
     
     def _convert_training_data_to_meal_model(self, training_data: dict) -> Meal:
         """Convert training data to Meal model with pricing"""
 
+        ingredient_names = training_data.get('ingredients', [])
+        prices = self.price_processor.get_ingredient_prices(ingredient_names)
+
         ingredients = []
-        for ingredient in training_data.get('ingredients', []):
-            # Get price from CSV processor
-            price = self.price_processor.get_ingredient_price(ingredient)
+        for ingredient, price in zip(ingredient_names, prices):
             ingredients.append(Ingredient(
                 name=ingredient,
                 amount=1, # Assuming amount is always 1 for training data
@@ -108,6 +133,8 @@ class DataMerger:
             ingredients=ingredients,
             image_url=training_data.get('image_url'),
             prep_time=training_data.get('prep_time', 0),
+            cook_time=training_data.get('cook_time'),
+            total_time=training_data.get('total_time'),
             keywords=training_data.get('keywords', []),
             estimated_cost=training_data.get('estimated_cost', 0.0),
             rating=training_data.get('rating', None),
@@ -116,30 +143,31 @@ class DataMerger:
     
     def _convert_to_meal_model(self, api_data: dict) -> Meal:
         """Convert TheMealDB data to Meal model with pricing"""
-        ingredients = []
-        total_cost = 0
-        
+        ingredient_entries = []
         for i in range(1, 21):
             ingredient_key = f'strIngredient{i}'
             measure_key = f'strMeasure{i}'
             
             if api_data.get(ingredient_key):
-                ingredient_name = api_data[ingredient_key]
-                measure = api_data.get(measure_key, '')
-                
-                # Get price from CSV processor
-                price = self.price_processor.get_ingredient_price(ingredient_name)
-                
-                # Create Ingredient with pricing
-                ingredient = Ingredient(
-                    name=ingredient_name,
-                    amount=measure,
-                    price_per_unit=price
-                )
-                ingredients.append(ingredient)
-                
-                if price:
-                    total_cost += float(price)
+                ingredient_entries.append((api_data[ingredient_key], api_data.get(measure_key, '')))
+
+        # Price the whole ingredient list in one call
+        prices = self.price_processor.get_ingredient_prices([name for name, _ in ingredient_entries])
+
+        ingredients = []
+        total_cost = 0
+        
+        for (ingredient_name, measure), price in zip(ingredient_entries, prices):
+            # Create Ingredient with pricing
+            ingredient = Ingredient(
+                name=ingredient_name,
+                amount=measure,
+                price_per_unit=price
+            )
+            ingredients.append(ingredient)
+            
+            if price:
+                total_cost += float(price)
         
         return Meal(
             id=api_data['idMeal'],
@@ -0,0 +1,270 @@
+from Backend.Api.themealdb import MealDBAPI
+from Backend.Data.Utils.cache_utils import get_project_cache_dir
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
+import os
+import sqlite3
+import threading
+import json
+import time
+
+class MealCatalogMirror:
+    """
+    A local SQLite mirror of the TheMealDB catalog.
+
+    Exposes the same search methods as MealDBAPI, so it can be used as a drop-in
+    replacement that answers searches without any network calls. Syncs bypass the
+    client's response cache, and is_synced() only reports True once a sync listed and
+    fetched every meal without errors.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, meal_api: Optional[MealDBAPI] = None,
+                 max_workers: int = 8):
+        self.db_path = db_path or os.path.join(get_project_cache_dir(), "themealdb_catalog.db")
+        self.meal_api = meal_api
+        self.max_workers = max(1, max_workers)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self.init_database()
+
+    @classmethod
+    def from_fixture(cls, fixture_path: str) -> 'MealCatalogMirror':
+        """
+        Create an in-memory mirror from a JSON fixture file.
+
+        The fixture holds TheMealDB lookup payloads, either as a list of meals
+        or in the API's own {"meals": [...]} shape.
+        """
+        with open(fixture_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        meals = data.get('meals', []) if isinstance(data, dict) else data
+        mirror = cls(db_path=':memory:')
+        mirror.load_meals(meals)
+        mirror._mark_synced()
+        return mirror
+
+    def init_database(self):
+        """Create the mirror tables and their search indexes."""
+        with self._lock:
+            self._conn.executescript('''
+                CREATE TABLE IF NOT EXISTS meals (
+                    id TEXT PRIMARY KEY,
+                    name TEXT,
+                    category TEXT COLLATE NOCASE,
+                    area TEXT COLLATE NOCASE,
+                    thumbnail TEXT,
+                    payload TEXT,
+                    synced_at REAL
+                );
+                CREATE TABLE IF NOT EXISTS meal_ingredients (
+                    meal_id TEXT,
+                    ingredient TEXT COLLATE NOCASE,
+                    PRIMARY KEY (meal_id, ingredient)
+                );
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_meals_name ON meals (name COLLATE NOCASE);
+                CREATE INDEX IF NOT EXISTS idx_meals_category ON meals (category);
+                CREATE INDEX IF NOT EXISTS idx_meals_area ON meals (area);
+                CREATE INDEX IF NOT EXISTS idx_meal_ingredients_ingredient ON meal_ingredients (ingredient);
+            ''')
+            self._conn.commit()
+
+    # Sync Methods
+    def sync(self, full: bool = False, walk_ingredients: bool = True) -> Dict[str, int]:
+        """
+        Sync the mirror from TheMealDB by walking categories, areas and ingredients.
+
+        A full sync re-fetches every meal and drops meals that are no longer listed.
+        An incremental sync (full=False) only fetches meals missing from the mirror.
+        The returned stats report whether the sync `completed` without errors.
+        """
+        if self.meal_api is None:
+            raise RuntimeError("MealCatalogMirror needs a MealDBAPI client to sync.")
+
+        # Cached listings and lookups could be days old, so sync from fresh responses
+        meal_api = self.meal_api.without_cache()
+        meal_ids, listing_errors = self._collect_meal_ids(meal_api, walk_ingredients)
+        known_ids = self._get_known_ids()
+
+        ids_to_fetch = meal_ids if full else [meal_id for meal_id in meal_ids if meal_id not in known_ids]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            details = list(executor.map(lambda meal_id: self._fetch_meal_details(meal_api, meal_id), ids_to_fetch))
+
+        fetched_meals = [meal for meal in details if meal]
+        self.load_meals(fetched_meals)
+
+        # Only drop meals when the listing is known to be complete
+        removed = 0
+        if full and meal_ids and not listing_errors:
+            stale_ids = known_ids - set(meal_ids)
+            removed = self._delete_meals(stale_ids)
+
+        stats = {
+            'listed': len(meal_ids),
+            'listing_errors': listing_errors,
+            'fetched': len(fetched_meals),
+            'failed': len(ids_to_fetch) - len(fetched_meals),
+            'removed': removed,
+            'total': self.meal_count(),
+            'completed': bool(meal_ids) and not listing_errors and len(fetched_meals) == len(ids_to_fetch)
+        }
+        if stats['completed']:
+            self._mark_synced()
+            print(f"Catalog sync complete: {stats}")
+        else:
+            print(f"Catalog sync incomplete, the mirror will not be used until a sync completes: {stats}")
+        return stats
+
+    def resync(self) -> Dict[str, int]:
+        """Incrementally sync meals that are not yet in the mirror."""
+        return self.sync(full=False)
+
+    def _collect_meal_ids(self, meal_api: MealDBAPI, walk_ingredients: bool) -> Tuple[List[str], int]:
+        """
+        Collect every meal id listed under any category, area or ingredient.
+        Returns the ids and the number of lists and searches that failed.
+        """
+        listings = [(meal_api.list_categories, meal_api.search_by_category),
+                    (meal_api.list_areas, meal_api.search_by_area)]
+        if walk_ingredients:
+            listings.append((meal_api.list_ingredients, meal_api.search_by_ingredient))
+
+        errors = 0
+        searches = []
+        for list_names, search in listings:
+            try:
+                names = list_names()
+            except Exception as e:
+                print(f"Error listing the catalog: {e}")
+                names = []
+            if not names:
+                errors += 1
+            searches += [(search, name) for name in names]
+
+        def run_search(search):
+            method, name = search
+            try:
+                return method(name), False
+            except Exception as e:
+                print(f"Error listing meals for '{name}': {e}")
+                return [], True
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            meal_ids = []
+            for meals, failed in executor.map(run_search, searches):
+                errors += failed
+                meal_ids.extend(meal['idMeal'] for meal in meals)
+
+        return list(dict.fromkeys(meal_ids)), errors
+
+    def _fetch_meal_details(self, meal_api: MealDBAPI, meal_id: str) -> Optional[Dict]:
+        try:
+            return meal_api.get_meal_details(meal_id)
+        except Exception as e:
+            print(f"Error fetching meal {meal_id}: {e}")
+            return None
+
+    def load_meals(self, meals: List[Dict]):
+        """Insert or replace TheMealDB lookup payloads in the mirror."""
+        now = time.time()
+        with self._lock:
+            for meal in meals:
+                self._conn.execute("DELETE FROM meal_ingredients WHERE meal_id = ?", (meal['idMeal'],))
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meals (id, name, category, area, thumbnail, payload, synced_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (meal['idMeal'], meal.get('strMeal'), meal.get('strCategory'), meal.get('strArea'),
+                     meal.get('strMealThumb'), json.dumps(meal), now)
+                )
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO meal_ingredients (meal_id, ingredient) VALUES (?, ?)",
+                    [(meal['idMeal'], ingredient) for ingredient in self._get_ingredient_names(meal)]
+                )
+            self._conn.commit()
+
+    def _delete_meals(self, meal_ids) -> int:
+        meal_ids = list(meal_ids)
+        with self._lock:
+            for meal_id in meal_ids:
+                self._conn.execute("DELETE FROM meal_ingredients WHERE meal_id = ?", (meal_id,))
+                self._conn.execute("DELETE FROM meals WHERE id = ?", (meal_id,))
+            self._conn.commit()
+        return len(meal_ids)
+
+    def _get_known_ids(self) -> set:
+        with self._lock:
+            return {row['id'] for row in self._conn.execute("SELECT id FROM meals")}
+
+    def _get_ingredient_names(self, meal: Dict) -> List[str]:
+        ingredients = []
+        for i in range(1, 21):
+            ingredient = meal.get(f'strIngredient{i}')
+            if ingredient and ingredient.strip():
+                ingredients.append(ingredient.strip())
+        return ingredients
+
+    def meal_count(self) -> int:
+        """Get the number of meals in the mirror."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM meals").fetchone()[0]
+
+    def is_empty(self) -> bool:
+        """Check if the mirror holds no meals."""
+        return self.meal_count() == 0
+
+    def is_synced(self) -> bool:
+        """Check if a sync has completed, so the mirror holds the whole catalog."""
+        return self.get_synced_at() is not None
+
+    def get_synced_at(self) -> Optional[float]:
+        """Get the time the last complete sync finished, or None if none has."""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM sync_state WHERE key = 'synced_at'").fetchone()
+        return float(row['value']) if row else None
+
+    def _mark_synced(self):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO sync_state (key, value) VALUES ('synced_at', ?)",
+                               (str(time.time()),))
+            self._conn.commit()
+
+    # Search Methods (same interface as MealDBAPI)
+    def search_by_ingredient(self, ingredient: str) -> List[Dict]:
+        # TheMealDB accepts underscores in place of spaces in ingredient filters
+        return self._search(
+            "SELECT m.id, m.name, m.thumbnail FROM meals m JOIN meal_ingredients mi ON mi.meal_id = m.id "
+            "WHERE mi.ingredient = ? ORDER BY m.id",
+            ingredient.replace('_', ' ').strip()
+        )
+
+    def search_by_category(self, category: str) -> List[Dict]:
+        return self._search("SELECT id, name, thumbnail FROM meals WHERE category = ? ORDER BY id", category.strip())
+
+    def search_by_area(self, area: str) -> List[Dict]:
+        return self._search("SELECT id, name, thumbnail FROM meals WHERE area = ? ORDER BY id", area.strip())
+
+    def search_by_name(self, name: str) -> List[Dict]:
+        return self._search(
+            "SELECT id, name, thumbnail FROM meals WHERE name LIKE ? ORDER BY id", f"%{name.strip()}%"
+        )
+
+    def get_meal_details(self, meal_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT payload FROM meals WHERE id = ?", (str(meal_id),)).fetchone()
+        return json.loads(row['payload']) if row else None
+
+    def get_random_meal(self) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT payload FROM meals ORDER BY RANDOM() LIMIT 1").fetchone()
+        return json.loads(row['payload']) if row else None
+
+    def _search(self, query: str, value: str) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute(query, (value,)).fetchall()
+        return [{'strMeal': row['name'], 'strMealThumb': row['thumbnail'], 'idMeal': row['id']} for row in rows]
@@ -1,7 +1,11 @@
 from Backend.Data.data_merger import DataMerger
-from Backend.Api.themealdb import MealDBAPI
+from Backend.Data.meal_catalog_mirror import MealCatalogMirror
+from Backend.Api.themealdb import MealDBAPI, MealDBResponseCache
+from Backend.Data.Utils.cache_utils import get_project_cache_dir
+from Backend.Data.Utils.translator import GoogleTranslateBackend
 import os
 import pandas as pd
+from typing import Optional
 
 class MealDataManager:
     """Central manager for meal data operations, including fetching and merging data."""
@@ -16,9 +20,17 @@ class MealDataManager:
         self.food_csv_file_path = os.path.join(project_root, "data", "raw", "recipes.csv")
         self.review_csv_file_path = os.path.join(project_root, "data", "raw", "reviews.csv")
         self.has_training_data = os.path.exists(self.food_csv_file_path)
+        self.training_chunksize = 50000  # Rows per chunk when streaming the training CSVs
 
         # API Service
-        self.meal_api = MealDBAPI()
+        self.meal_api = MealDBAPI(cache=MealDBResponseCache())
+
+        # Translates product names the manual mapping misses; results are stored, so each name is sent once
+        self.translation_backend = GoogleTranslateBackend()
+
+        # Local catalog mirror (used instead of the API once a sync has completed)
+        self.catalog_mirror_path = os.path.join(get_project_cache_dir(), "themealdb_catalog.db")
+        self.catalog_mirror = MealCatalogMirror(self.catalog_mirror_path, meal_api=self.meal_api)
 
         # Data Merger (Lazy initialization)
         self._data_merger = self._create_data_merger()
@@ -35,7 +47,10 @@ class MealDataManager:
         return DataMerger(
             mercadona_csv_file_path=self.mercadona_csv_file_path,
             food_csv_file_path=food_path,
-            review_csv_file_path=self.review_csv_file_path if self.has_training_data else None
+            review_csv_file_path=self.review_csv_file_path if self.has_training_data else None,
+            meal_api=self.catalog_mirror if self.catalog_mirror.is_synced() else self.meal_api,
+            training_chunksize=self.training_chunksize,
+            translation_backend=self.translation_backend
         )
     
     # API Methods
@@ -51,12 +66,52 @@ class MealDataManager:
         """Get all enriched meals from the API."""
         return self._data_merger.get_all_enriched_meals()
         
+    def sync_catalog_mirror(self, full: bool = False) -> dict:
+        """Sync the local catalog mirror and serve searches from it afterwards."""
+        stats = self.catalog_mirror.sync(full=full)
+        if self.catalog_mirror.is_synced():
+            self._data_merger.meal_api = self.catalog_mirror
+        return stats
+        
+    # Price Methods
+    def watch_price_updates(self, poll_interval: float = 30):
+        """Reload Mercadona prices in the background whenever the CSV is re-scraped."""
+        self._data_merger.price_processor.start_watching(poll_interval)
+
+    def stop_watching_price_updates(self):
+        """Stop watching the Mercadona CSV for changes."""
+        self._data_merger.price_processor.stop_watching()
+
+    def get_price_reload_metrics(self) -> dict:
+        """Get reload duration and index size metrics for the Mercadona prices."""
+        return self._data_merger.price_processor.get_reload_metrics()
+
+    def get_data_version(self) -> tuple:
+        """
+        Get a version of the data meals are enriched from (the served price index and,
+        when searches use it, the catalog mirror's last sync), for keying cached results.
+        """
+        catalog_version = None
+        if self._data_merger.meal_api is self.catalog_mirror:
+            catalog_version = self.catalog_mirror.get_synced_at()
+        return self._data_merger.price_processor.get_index_version(), catalog_version
+
+    def get_price_lookup_stats(self) -> dict:
+        """Get hit-rate statistics of the memoized ingredient price lookups."""
+        return self._data_merger.price_processor.get_lookup_stats()
+
     # Training Data Methods
-    def get_all_training_meals(self) -> list:
-        """Get all training meals from the CSV file."""
+    def get_all_training_meals(self, workers: Optional[int] = None) -> list:
+        """Get all training meals from the CSV file, parsed by `workers` processes."""
+        if not self.has_training_data:
+            raise RuntimeError("Training data is not available. Provide a food CSV file path.")
+        return self._data_merger.get_all_training_meals(workers)
+
+    def iter_training_meals(self, workers: Optional[int] = None):
+        """Stream training meals from the CSV file one at a time."""
         if not self.has_training_data:
             raise RuntimeError("Training data is not available. Provide a food CSV file path.")
-        return self._data_merger.get_all_training_meals()
+        return self._data_merger.iter_training_meals(workers)
     
     def can_train(self) -> bool:
         """Check if training data is available."""
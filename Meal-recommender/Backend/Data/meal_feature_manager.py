@@ -1,25 +1,92 @@
 from Backend.Data.prep_time_extraction import PrepTimeFeatureExtractor
 from Backend.Data.recommendation_extraction import RecommendationFeatureExtraction
-from typing import List
+from Backend.Data.meal_preprocessing import LazyPreprocessedMeals, PreprocessedMeal
+from Backend.Data.Utils.feature_store import FeatureStore
+from typing import Dict, List, Optional, Sequence
 import pandas as pd
 from Backend.models.meal import Meal
 
 class MealFeatureManager:
-    """Manages the extraction of all meal features from CSV files."""
+    """
+    Manages the extraction of all meal features from CSV files.
 
-    def __init__(self):
+    The text-derived features of each meal are kept in a FeatureStore, so meals that
+    were featurized before (in earlier searches or retrains) are read back instead of
+    recomputed. Only prep_time and the training targets are always taken from the meal.
+    """
+
+    PREP_TIME_NAMESPACE = "prep_time"
+    RECOMMENDATION_NAMESPACE = "recommendation"
+
+    def __init__(self, feature_store: Optional[FeatureStore] = None, use_feature_store: bool = True):
         self.prep_time_extractor = PrepTimeFeatureExtractor()
         self.recommendation_extractor = RecommendationFeatureExtraction()
-        
-    def get_prep_time_features(self, meals: List[Meal], include_target = False) -> pd.DataFrame:
+        self.feature_store = feature_store or (self._create_feature_store() if use_feature_store else None)
+
+    def _create_feature_store(self) -> FeatureStore:
+        return FeatureStore()  # In the project cache directory
+
+    def preprocess_meals(self, meals: List[Meal]) -> LazyPreprocessedMeals:
+        """
+        Normalize and tokenize the text of the meals once, for both feature extractors.
+        Each meal is only preprocessed when an extractor needs it, so meals whose
+        features are all in the store are never preprocessed.
+        """
+        return LazyPreprocessedMeals(meals)
+
+    def get_prep_time_features(self, meals: List[Meal], include_target = False,
+                               preprocessed: Optional[Sequence[PreprocessedMeal]] = None) -> pd.DataFrame:
         """
         Extract preparation time features from a list of Meal objects.
         """
+        content_features = self._get_content_features(self.prep_time_extractor, self.PREP_TIME_NAMESPACE,
+                                                      meals, preprocessed)
+        return self.prep_time_extractor.prepare_features_dataframe(meals, include_target=include_target,
+                                                                   preprocessed=preprocessed,
+                                                                   content_features=content_features)
 
-        return self.prep_time_extractor.prepare_features_dataframe(meals, include_target=include_target)
-    
-    def get_recommendation_features(self, meals: List[Meal], include_target = False) -> pd.DataFrame:
+    def get_recommendation_features(self, meals: List[Meal], include_target = False,
+                                    preprocessed: Optional[Sequence[PreprocessedMeal]] = None) -> pd.DataFrame:
         """
         Extract recommendation features from a list of Meal objects.
         """
-        return self.recommendation_extractor.prepare_features_dataframe(meals, include_target=include_target)
\ No newline at end of file
+        content_features = self._get_content_features(self.recommendation_extractor, self.RECOMMENDATION_NAMESPACE,
+                                                      meals, preprocessed)
+        return self.recommendation_extractor.prepare_features_dataframe(meals, include_target=include_target,
+                                                                        preprocessed=preprocessed,
+                                                                        content_features=content_features)
+
+    def get_feature_store_stats(self) -> Dict[str, float]:
+        """Get hit-rate statistics of the feature store."""
+        return self.feature_store.get_stats() if self.feature_store else {}
+
+    def _get_content_features(self, extractor, namespace: str, meals: List[Meal],
+                              preprocessed: Optional[Sequence[PreprocessedMeal]]) -> Optional[List[Dict]]:
+        """
+        Read the stored text features of the meals and extract only the missing ones.
+        Returns None (so the extractor does all the work) without a store or when a meal fails.
+        """
+        if not self.feature_store or not meals:
+            return None
+
+        try:
+            keys = [FeatureStore.build_key(meal, extractor.FEATURE_VERSION) for meal in meals]
+            stored = self.feature_store.get_many(keys, namespace)
+
+            missing = [index for index, key in enumerate(keys) if key not in stored]
+            if missing:
+                computed = extractor.extract_content_features(
+                    [meals[index] for index in missing],
+                    [preprocessed[index] for index in missing] if preprocessed is not None else None
+                )
+                if len(computed) < len(missing):
+                    return None  # A meal could not be processed, let the extractor handle it
+
+                new_features = {keys[index]: features for index, features in zip(missing, computed)}
+                self.feature_store.set_many(new_features, namespace)
+                stored.update(new_features)
+
+            return [stored[key] for key in keys]
+        except Exception as e:
+            print(f"Error using the feature store: {e}")
+            return None
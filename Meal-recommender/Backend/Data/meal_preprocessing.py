@@ -0,0 +1,65 @@
+from collections import Counter
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Sequence, Set
+from ..models.meal import Meal
+
+@dataclass
+class PreprocessedMeal:
+    """Normalized text of a meal, shared by the prep-time and recommendation feature extractors."""
+    instruction_text: str  # Lower-cased instructions
+    tokens: List[str]  # Whitespace-split instruction_text
+    token_counts: Counter
+    ingredient_names: List[str]  # Lower-cased, in the meal's order
+    ingredient_set: Set[str]
+
+def preprocess_meal(meal: Meal) -> PreprocessedMeal:
+    """Lower-case and tokenize the instructions and ingredient names of a meal once."""
+    instruction_text = meal.instructions.lower() if meal.instructions else ""
+    tokens = instruction_text.split()
+    ingredient_names = [ingredient.name.lower() for ingredient in meal.ingredients]
+
+    return PreprocessedMeal(
+        instruction_text=instruction_text,
+        tokens=tokens,
+        token_counts=Counter(tokens),
+        ingredient_names=ingredient_names,
+        ingredient_set=set(ingredient_names)
+    )
+
+def preprocess_meals(meals: List[Meal]) -> List[PreprocessedMeal]:
+    """Preprocess a batch of meals, in order."""
+    return [preprocess_meal(meal) for meal in meals]
+
+class LazyPreprocessedMeals(Sequence):
+    """
+    The preprocessed meals of a batch, each preprocessed on first access, so meals whose
+    features come from the feature store are never preprocessed.
+    """
+
+    def __init__(self, meals: List[Meal]):
+        self.meals = meals
+        self._preprocessed: List[Optional[PreprocessedMeal]] = [None] * len(meals)
+
+    def __len__(self) -> int:
+        return len(self.meals)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        text = self._preprocessed[index]
+        if text is None:
+            text = self._preprocessed[index] = preprocess_meal(self.meals[index])
+        return text
+
+    def __iter__(self) -> Iterator[PreprocessedMeal]:
+        return (self[i] for i in range(len(self)))
+
+    def select(self, indices: List[int]) -> 'LazyPreprocessedMeals':
+        """Get the meals at `indices`, keeping the ones already preprocessed."""
+        selected = LazyPreprocessedMeals([self.meals[i] for i in indices])
+        selected._preprocessed = [self._preprocessed[i] for i in indices]
+        return selected
+
+    def count_preprocessed(self) -> int:
+        """Get the number of meals preprocessed so far."""
+        return sum(text is not None for text in self._preprocessed)
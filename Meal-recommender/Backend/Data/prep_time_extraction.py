@@ -1,9 +1,17 @@
+from collections import Counter
+from itertools import chain
+import ahocorasick
 import pandas as pd
 import numpy as np
 from typing import Dict, Optional, List
 from ..models.meal import Meal
+from .meal_preprocessing import PreprocessedMeal, preprocess_meals
 
 class PrepTimeFeatureExtractor:
+    FEATURE_COLUMNS = ["ingredient_count", "instruction_length", "prep_keyworks_count", "fresh_ratio"]
+    TARGET_COLUMN = "prep_time_target"
+    FEATURE_VERSION = 1  # Bump when FEATURE_COLUMNS or their extraction change, so stored features are recomputed
+
     def __init__(self):
         self.prep_keywords = [
             "chop", "slice", "dice", "mince", "grate", "peel", "wash",
@@ -19,64 +27,149 @@ class PrepTimeFeatureExtractor:
             'zucchini', 'eggplant', 'mushroom', 'green bean', 'peas', 'corn',
             'potato', 'sweet potato', 'pumpkin', 'squash', 'radish', 'beet'
         ]
+        self._compile_keyword_matcher()
+
+    def _compile_keyword_matcher(self):
+        """
+        Compile the prep keywords into an Aho-Corasick automaton that finds every occurrence
+        of every keyword in one pass. Each keyword's value is the number of times it is listed.
+        """
+        multiplicity = Counter(self.prep_keywords)
+
+        # The automaton reports overlapping occurrences of a keyword, str.count does not;
+        # keywords that can overlap themselves (none of the current ones) are counted with str.count
+        self._counted_keywords = tuple(
+            keyword for keyword in self.prep_keywords
+            if not keyword or any(keyword[:size] == keyword[-size:] for size in range(1, len(keyword)))
+        )
+
+        self._keyword_automaton = ahocorasick.Automaton()
+        for keyword, count in multiplicity.items():
+            if keyword not in self._counted_keywords:
+                self._keyword_automaton.add_word(keyword, count)
+        self._keyword_automaton.make_automaton()
+
+    def count_prep_keywords(self, texts: List[str]) -> np.ndarray:
+        """
+        Count the prep keywords in each text, like summing text.count(keyword) over prep_keywords,
+        in a single automaton pass over the whole batch.
+        """
+        # No keyword contains NUL, so no match spans two texts
+        batch_text = "\0".join(texts)
+        text_ends = np.cumsum([len(text) + 1 for text in texts])
+
+        counts = np.zeros(len(texts), dtype=np.int64)
+        if self._keyword_automaton.kind == ahocorasick.AHOCORASICK:
+            # (end position, times listed) of every match
+            matches = np.fromiter(chain.from_iterable(self._keyword_automaton.iter(batch_text)),
+                                  dtype=np.int64).reshape(-1, 2)
+            text_indices = np.searchsorted(text_ends, matches[:, 0], side='right')
+            counts += np.bincount(text_indices, weights=matches[:, 1], minlength=len(texts)).astype(np.int64)
+
+        for keyword in self._counted_keywords:
+            counts += [text.count(keyword) for text in texts]
+        return counts
 
-    def extract_features_from_meals(self, meals: List[Meal]) -> List[Dict]:
+    def extract_features_from_meals(self, meals: List[Meal],
+                                    preprocessed: Optional[List[PreprocessedMeal]] = None) -> List[Dict]:
         """Extract features from any list of Meal objects."""
         if not meals:
             return []
 
+        matrix, has_target = self.extract_feature_matrix(meals, preprocessed)
         features = []
-        
-        for meal in meals:
-            instruction_text = meal.instructions.lower() if meal.instructions else ""
-            fresh_count = sum(
-                ingredient.name.lower() in self.fresh_ingredients 
-                for ingredient in meal.ingredients
-            )
-            fresh_ratio = fresh_count / len(meal.ingredients) if meal.ingredients else 0
-
-            # Check if meal has keywords attribute (training data might have this)
-            keyword_count = sum(
-                instruction_text.count(keyword) for keyword in self.prep_keywords
-            )
-            
-            if hasattr(meal, 'keywords') and meal.keywords:
-                keyword_count += sum(
-                    meal.keywords.count(keyword) for keyword in self.prep_keywords
-                )
-
-            feature = {
-                "ingredient_count": len(meal.ingredients),
-                "instruction_length": len(instruction_text.split()),
-                "prep_keyworks_count": keyword_count,
-                "fresh_ratio": fresh_ratio
-            }
+        for meal, row, meal_has_target in zip(meals, matrix, has_target):
+            feature = self._row_to_features(row)
 
             # Add target variable if this is training data
-            if hasattr(meal, 'prep_time') and meal.prep_time is not None:
-                feature["prep_time_target"] = meal.prep_time
+            if meal_has_target:
+                feature[self.TARGET_COLUMN] = meal.prep_time
 
             features.append(feature)
         
         return features
 
-    def prepare_features_dataframe(self, meals: List[Meal], include_target: bool = False) -> pd.DataFrame:
+    def extract_content_features(self, meals: List[Meal],
+                                 preprocessed: Optional[List[PreprocessedMeal]] = None) -> List[Dict]:
+        """Extract the FEATURE_COLUMNS of each meal, which only depend on its text (no target)."""
+        if not meals:
+            return []
+
+        matrix, _ = self.extract_feature_matrix(meals, preprocessed)
+        return [self._row_to_features(row) for row in matrix]
+
+    def _row_to_features(self, row) -> Dict:
+        return {
+            "ingredient_count": int(row[0]),
+            "instruction_length": int(row[1]),
+            "prep_keyworks_count": int(row[2]),
+            "fresh_ratio": float(row[3])
+        }
+
+    def extract_feature_matrix(self, meals: List[Meal], preprocessed: Optional[List[PreprocessedMeal]] = None,
+                               content_features: Optional[List[Dict]] = None):
+        """
+        Extract the features of a whole batch of meals as a matrix with FEATURE_COLUMNS plus
+        the target column (NaN where a meal has no prep time), and a mask of meals with a target.
+        Pass `preprocessed` to reuse the text preprocessing of preprocess_meals, or
+        `content_features` (from extract_content_features) to skip the text entirely.
+        """
+        if content_features is not None:
+            rows = []
+            for meal, feature in zip(meals, content_features):
+                prep_time = getattr(meal, 'prep_time', None)
+                rows.append(tuple(feature[column] for column in self.FEATURE_COLUMNS) +
+                            (prep_time if prep_time is not None else np.nan,))
+            return self._rows_to_matrix(rows)
+
+        if preprocessed is None:
+            preprocessed = preprocess_meals(meals)
+
+        keyword_multiplicity = Counter(self.prep_keywords)  # Times each keyword is listed
+        fresh_ingredients = set(self.fresh_ingredients)
+        instruction_keyword_counts = self.count_prep_keywords([text.instruction_text for text in preprocessed])
+
+        rows = []
+        for meal, text, keyword_count in zip(meals, preprocessed, instruction_keyword_counts.tolist()):
+            ingredient_count = len(meal.ingredients)
+            fresh_count = sum(name in fresh_ingredients for name in text.ingredient_names)
+
+            # Check if meal has keywords attribute (training data might have this)
+            if getattr(meal, 'keywords', None):
+                keyword_count += sum(keyword_multiplicity.get(keyword, 0) for keyword in meal.keywords)
+
+            prep_time = getattr(meal, 'prep_time', None)
+            rows.append((
+                ingredient_count,
+                len(text.tokens),
+                keyword_count,
+                fresh_count / ingredient_count if ingredient_count else 0,
+                prep_time if prep_time is not None else np.nan
+            ))
+
+        return self._rows_to_matrix(rows)
+
+    def _rows_to_matrix(self, rows: List[tuple]):
+        matrix = np.array(rows, dtype=np.float64).reshape(len(rows), len(self.FEATURE_COLUMNS) + 1)
+        return matrix, ~np.isnan(matrix[:, -1])
+
+    def prepare_features_dataframe(self, meals: List[Meal], include_target: bool = False,
+                                   preprocessed: Optional[List[PreprocessedMeal]] = None,
+                                   content_features: Optional[List[Dict]] = None) -> pd.DataFrame:
         """Convert meals to feature DataFrame."""
-        features = self.extract_features_from_meals(meals)
-        if not features:
+        if not meals:
             return pd.DataFrame()
 
-        df = pd.DataFrame(features)
-        
-        # Separate features and target
-        feature_columns = ["ingredient_count", "instruction_length", "prep_keyworks_count", "fresh_ratio"]
+        matrix, has_target = self.extract_feature_matrix(meals, preprocessed, content_features)
+        df = pd.DataFrame(matrix, columns=self.FEATURE_COLUMNS + [self.TARGET_COLUMN])
+        df = df.astype({"ingredient_count": "int64", "instruction_length": "int64", "prep_keyworks_count": "int64"})
         
-        if include_target and "prep_time_target" in df.columns:
+        if include_target and has_target.any():
             # For training - include target
-            return df[feature_columns + ["prep_time_target"]].fillna(0)
+            return df[self.FEATURE_COLUMNS + [self.TARGET_COLUMN]].fillna(0)
         else:
             # For prediction - only features
-            return df[feature_columns].fillna(0)
+            return df[self.FEATURE_COLUMNS].fillna(0)
 
     def estimate_prep_time_heuristic(self, features: Dict) -> Optional[int]:
         """Heuristic-based prep time estimation (fallback method)."""
@@ -1,8 +1,29 @@
+import numpy as np
 import pandas as pd
-from typing import Dict, List
+from scipy import sparse
+from typing import Dict, List, Optional, Tuple
 from ..models.meal import Meal
+from .meal_preprocessing import PreprocessedMeal, preprocess_meal
 
 class RecommendationFeatureExtraction:
+    # Lexicons whose counts pick type_of_meal and flavor_profile; ties go to the first listed
+    CUISINE_LEXICONS = {
+        'italian': 'italian_ingredients',
+        'mexican': 'mexican_ingredients',
+        'indian': 'indian_ingredients',
+        'asian': 'asian_ingredients',
+        'american': 'american_ingredients'
+    }
+    FLAVOR_LEXICONS = {
+        'sweet': 'sweet_ingredients',
+        'savory': 'savory_ingredients',
+        'sour': 'sour_ingredients',
+        'spicy': 'spicy_ingredients',
+        'comfort': 'comfort_ingredients'
+    }
+    DIETARY_LEXICONS = ['protein_sources', 'diary_sources', 'gluten_sources']
+    FEATURE_VERSION = 1  # Bump when the content features or their extraction change, so stored features are recomputed
+
     def __init__(self):
         # Cuisine-specific ingredients
         self.italian_ingredients = [
@@ -71,95 +92,158 @@ class RecommendationFeatureExtraction:
             "curing", "confiting", "dehydrating", "pressure cooking"
         ]
 
-    def extract_features_from_meals(self, meals: List[Meal]) -> List[Dict]:
-        """Extract features from any list of Meal objects."""
+        self._lexicon_incidence = None  # (lexicons, vocabulary, incidence) compiled from the lists above
+
+    def extract_features_from_meals(self, meals: List[Meal],
+                                    preprocessed: Optional[List[PreprocessedMeal]] = None,
+                                    content_features: Optional[List[Dict]] = None) -> List[Dict]:
+        """
+        Extract features from any list of Meal objects.
+        Pass `preprocessed` to reuse the text preprocessing of preprocess_meals, or
+        `content_features` (from extract_content_features) to skip the text entirely.
+        """
 
         if not meals:
             return []
+
+        if content_features is None:
+            content_features = self.extract_content_features(meals, preprocessed)
         
         features = []
+        # content_features stops at the first meal that failed, like the meals processed
+        for meal, content in zip(meals, content_features):
+            prep_time = meal.prep_time if hasattr(meal, 'prep_time') and meal.prep_time is not None else None
+            rating = meal.rating if hasattr(meal, 'rating') and meal.rating is not None else None
+
+            feature = {
+                "ingredient_count": content["ingredient_count"],
+                "instruction_length": content["instruction_length"],
+                "type_of_meal": content["type_of_meal"],
+                "is_vegetarian": content["is_vegetarian"],
+                "has_dairy": content["has_dairy"],
+                "has_gluten": content["has_gluten"],
+                "prep_time": prep_time,
+                "flavor_profile": content["flavor_profile"],
+                "complexity_score": content["complexity_score"]
+            }
+
+            # Add target variable if this is training data
+            feature["is_recommended"] = self._create_target(
+                rating, 
+                review_count=meal.review_count if hasattr(meal, 'review_count') else 0
+            )
+            features.append(feature)
+        return features
+
+    def extract_content_features(self, meals: List[Meal],
+                                 preprocessed: Optional[List[PreprocessedMeal]] = None) -> List[Dict]:
+        """
+        Extract the features that only depend on a meal's text (all but prep_time and the target).
+        Stops at the first meal that cannot be processed.
+        """
+        rows = []
 
-        for meal in meals:
+        for index, meal in enumerate(meals):
             try:
-                instruction_text = meal.instructions.lower() if meal.instructions else ""
-                ingredient_names = [ingredient.name.lower() for ingredient in meal.ingredients]
-
-                type_of_meal = self._extract_cuisine_type(ingredient_names)
-                flavor_profile = self._extract_flavor_profile(ingredient_names)
-                prep_time = meal.prep_time if hasattr(meal, 'prep_time') and meal.prep_time is not None else None
-                complexity_score = self._calculate_complexity(instruction_text, meal.ingredients)
-
-                is_vegetarian = all(
-                    ingredient not in self.protein_sources for ingredient in ingredient_names
-                )
-
-                has_dairy = any(
-                    ingredient in self.diary_sources for ingredient in ingredient_names
-                )
-
-                has_gluten = any(
-                    ingredient in self.gluten_sources for ingredient in ingredient_names
-                )
-
-                ingredient_count = len(meal.ingredients)
-                instruction_length = len(instruction_text.split())
-                rating = meal.rating if hasattr(meal, 'rating') and meal.rating is not None else None
-
-                feature = {
-                    "ingredient_count": ingredient_count,
-                    "instruction_length": instruction_length,
-                    "type_of_meal": type_of_meal,
-                    "is_vegetarian": is_vegetarian,
-                    "has_dairy": has_dairy,
-                    "has_gluten": has_gluten,
-                    "prep_time": prep_time,
-                    "flavor_profile": flavor_profile,
-                    "complexity_score": complexity_score
-                }
-
-                # Add target variable if this is training data
-                feature["is_recommended"] = self._create_target(
-                    rating, 
-                    review_count=meal.review_count if hasattr(meal, 'review_count') else 0
-                )
-                features.append(feature)
+                text = preprocessed[index] if preprocessed is not None else preprocess_meal(meal)
+                complexity_score = self._calculate_complexity(text, meal.ingredients)
+                rows.append((meal, text, complexity_score))
             except Exception as e:
                 print(f"Error processing meal {meal.name if hasattr(meal, 'name') else 'Unknown'}: {e}")
                 print("Skipping this meal due to error.")
-                print("Meal data:", meal)
-                import traceback
-                traceback.print_exc()
                 break
-        return features
-    
-    def _extract_cuisine_type(self, ingredient_names: List[str]) -> str:
-        """Determine the type of meal based on ingredient names."""
-        cuisine_counts = {
-            'italian': self._get_ingredient_counts(ingredient_names, self.italian_ingredients),
-            'mexican': self._get_ingredient_counts(ingredient_names, self.mexican_ingredients),
-            'indian': self._get_ingredient_counts(ingredient_names, self.indian_ingredients),
-            'asian': self._get_ingredient_counts(ingredient_names, self.asian_ingredients),
-            'american': self._get_ingredient_counts(ingredient_names, self.american_ingredients)
-        }
-        return max(cuisine_counts, key=cuisine_counts.get)
-    
-    def _extract_flavor_profile(self, ingredient_names: List[str]) -> str:
-        """Determine the flavor profile based on ingredient names."""
-        flavor_counts = {
-            'sweet': self._get_ingredient_counts(ingredient_names, self.sweet_ingredients),
-            'savory': self._get_ingredient_counts(ingredient_names, self.savory_ingredients),
-            'sour': self._get_ingredient_counts(ingredient_names, self.sour_ingredients),
-            'spicy': self._get_ingredient_counts(ingredient_names, self.spicy_ingredients),
-            'comfort': self._get_ingredient_counts(ingredient_names, self.comfort_ingredients)
-        }
-        return max(flavor_counts, key=flavor_counts.get)
+
+        if not rows:
+            return []
+
+        # Cuisine, flavor and dietary features for the whole batch at once
+        lexicon_features = self._extract_lexicon_features([text for _, text, _ in rows])
+
+        content_features = []
+        for (meal, text, complexity_score), (
+                type_of_meal, flavor_profile, is_vegetarian, has_dairy, has_gluten) in zip(rows, lexicon_features):
+            content_features.append({
+                "ingredient_count": len(meal.ingredients),
+                "instruction_length": len(text.tokens),
+                "type_of_meal": type_of_meal,
+                "is_vegetarian": is_vegetarian,
+                "has_dairy": has_dairy,
+                "has_gluten": has_gluten,
+                "flavor_profile": flavor_profile,
+                "complexity_score": complexity_score
+            })
+        return content_features
+
+    def _extract_lexicon_features(self, texts: List[PreprocessedMeal]) -> List[Tuple[str, str, bool, bool, bool]]:
+        """
+        Determine the type of meal, flavor profile and dietary flags of a batch of meals.
+        The meals' ingredient sets become one sparse meal x term matrix, which is multiplied
+        with the term x lexicon incidence matrix to count every lexicon for every meal.
+        """
+        vocabulary, incidence = self._get_lexicon_incidence()
+
+        meal_indices = []
+        term_indices = []
+        for row, text in enumerate(texts):
+            for name in text.ingredient_set:
+                term = vocabulary.get(name)
+                if term is not None:
+                    meal_indices.append(row)
+                    term_indices.append(term)
+
+        ingredients = sparse.csr_matrix(
+            (np.ones(len(term_indices), dtype=np.int64), (meal_indices, term_indices)),
+            shape=(len(texts), len(vocabulary))
+        )
+        counts = np.asarray((ingredients @ incidence).todense())
+
+        cuisines = list(self.CUISINE_LEXICONS)
+        flavors = list(self.FLAVOR_LEXICONS)
+        cuisine_end = len(cuisines)
+        flavor_end = cuisine_end + len(flavors)
+
+        # argmax returns the first maximum, like max() over the lexicons in order
+        type_of_meal = [cuisines[i] for i in counts[:, :cuisine_end].argmax(axis=1)]
+        flavor_profile = [flavors[i] for i in counts[:, cuisine_end:flavor_end].argmax(axis=1)]
+        protein, dairy, gluten = (counts[:, flavor_end + i] for i in range(len(self.DIETARY_LEXICONS)))
+
+        return list(zip(type_of_meal, flavor_profile, (protein == 0).tolist(),
+                        (dairy > 0).tolist(), (gluten > 0).tolist()))
+
+    def _get_lexicon_incidence(self):
+        """
+        Compile the lexicons into a term vocabulary and a sparse term x lexicon matrix.
+        A term listed twice in a lexicon counts twice, as with a scan over the lexicon list.
+        Rebuilt only when a lexicon list changes.
+        """
+        attributes = list(self.CUISINE_LEXICONS.values()) + list(self.FLAVOR_LEXICONS.values()) + self.DIETARY_LEXICONS
+        lexicons = tuple(tuple(getattr(self, attribute)) for attribute in attributes)
+        if self._lexicon_incidence is not None and self._lexicon_incidence[0] == lexicons:
+            return self._lexicon_incidence[1:]
+
+        vocabulary = {}
+        term_indices = []
+        lexicon_indices = []
+        for column, lexicon in enumerate(lexicons):
+            for term in lexicon:
+                term_indices.append(vocabulary.setdefault(term, len(vocabulary)))
+                lexicon_indices.append(column)
+
+        # Duplicate (term, lexicon) entries are summed by csr_matrix
+        incidence = sparse.csr_matrix(
+            (np.ones(len(term_indices), dtype=np.int64), (term_indices, lexicon_indices)),
+            shape=(len(vocabulary), len(lexicons))
+        )
+        self._lexicon_incidence = (lexicons, vocabulary, incidence)
+        return vocabulary, incidence
     
-    def _calculate_complexity(self, instruction_text: str, ingredients) -> int:
+    def _calculate_complexity(self, text: PreprocessedMeal, ingredients) -> int:
         """Calculate complexity based on instruction text."""
         score = 0
+        instruction_text = text.instruction_text
 
-        score += sum(2 for word in instruction_text.split() if word in self.advanced_techniques)
-        score += len(instruction_text.split()) / 10  # Length of instructions
+        score += sum(2 * text.token_counts[word] for word in set(self.advanced_techniques))
+        score += len(text.tokens) / 10  # Length of instructions
         score += len(ingredients) / 5  # Number of ingredients
 
         if "overnight" in instruction_text or "slow cooker" in instruction_text:
@@ -168,12 +252,6 @@ class RecommendationFeatureExtraction:
 
         return min(int(score), 10)  # Cap complexity score at 10
 
-    def _get_ingredient_counts(self, ingredient_names: List, source_names: List) -> int:
-        """Count the number of ingredients in a meal."""
-        return sum(
-            ingredient in ingredient_names for ingredient in source_names
-        )
-    
     def _create_target(self, rating, review_count=None):
         if rating is None:
             return None
@@ -188,9 +266,11 @@ class RecommendationFeatureExtraction:
         else:
             return False
         
-    def prepare_features_dataframe(self, meals: List[Meal], include_target: bool = False) -> pd.DataFrame:
+    def prepare_features_dataframe(self, meals: List[Meal], include_target: bool = False,
+                                   preprocessed: Optional[List[PreprocessedMeal]] = None,
+                                   content_features: Optional[List[Dict]] = None) -> pd.DataFrame:
         """Convert meals to feature DataFrame."""
-        features = self.extract_features_from_meals(meals)
+        features = self.extract_features_from_meals(meals, preprocessed, content_features)
         if not features:
             return pd.DataFrame()
         
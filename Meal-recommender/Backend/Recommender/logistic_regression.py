@@ -7,6 +7,101 @@ from sklearn.utils.class_weight import compute_class_weight
 import pandas as pd
 from typing import List, Optional, Dict, Union
 import numpy as np
+import re
+from scipy import sparse
+from scipy.special import expit
+
+class CompiledLogisticScorer:
+    """
+    A fitted preprocessor and logistic regression frozen into flat NumPy arrays.
+
+    The StandardScaler is folded into the numeric weights and the intercept, and every
+    one-hot column becomes an entry in one coefficient table, so scoring a batch is a
+    dot product for the numeric columns plus a gather for the categorical ones.
+    Scores match the sklearn pipeline up to floating point rounding.
+    """
+
+    def __init__(self, numeric_columns: List[str], numeric_weights: np.ndarray,
+                 categorical_columns: List[str], category_indices: List[Dict], category_weights: np.ndarray,
+                 intercept: float, classes: np.ndarray):
+        self.numeric_columns = numeric_columns
+        self.numeric_weights = numeric_weights
+        self.categorical_columns = categorical_columns
+        self.category_indices = category_indices  # Per column: category -> index into category_weights
+        self.category_weights = category_weights
+        self.intercept = intercept
+        self.classes = classes
+
+    @classmethod
+    def from_pipeline(cls, preprocessor: ColumnTransformer, model) -> 'CompiledLogisticScorer':
+        """Freeze a fitted ColumnTransformer (StandardScaler + OneHotEncoder) and linear model."""
+        coefficients = model.coef_[0]
+        intercept = float(model.intercept_[0])
+
+        numeric_columns, numeric_weights = [], []
+        categorical_columns, category_indices, category_weights = [], [], [0.0]  # Index 0: dropped category
+        offset = 0
+        for name, transformer, columns in preprocessor.transformers_:
+            if not len(columns):
+                continue
+            if name == 'num':
+                # (x - mean) / scale * coef == x * (coef / scale) - mean * coef / scale
+                weights = coefficients[offset:offset + len(columns)] / transformer.scale_
+                intercept -= float(np.dot(transformer.mean_, weights))
+                numeric_columns += list(columns)
+                numeric_weights += list(weights)
+                offset += len(columns)
+            elif name == 'cat':
+                for i, column in enumerate(columns):
+                    categories = transformer.categories_[i]
+                    drop_index = transformer.drop_idx_[i] if transformer.drop_idx_ is not None else None
+                    indices = {}
+                    for j, category in enumerate(categories):
+                        if j == drop_index:
+                            indices[category] = 0
+                        else:
+                            indices[category] = len(category_weights)
+                            category_weights.append(float(coefficients[offset]))
+                            offset += 1
+                    categorical_columns.append(column)
+                    category_indices.append(indices)
+            elif not (isinstance(transformer, str) and transformer == 'drop'):
+                raise ValueError(f"Cannot compile transformer '{name}'")
+
+        return cls(numeric_columns, np.asarray(numeric_weights, dtype=np.float64),
+                   categorical_columns, category_indices, np.asarray(category_weights, dtype=np.float64),
+                   intercept, np.asarray(model.classes_))
+
+    def decision_function(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        """Get the linear scores of a batch, given each feature column as an array."""
+        n_samples = len(next(iter(columns.values())))
+        scores = np.full(n_samples, self.intercept)
+
+        if self.numeric_columns:
+            X = np.column_stack([np.asarray(columns[column], dtype=np.float64) for column in self.numeric_columns])
+            if np.isnan(X).any():
+                # Same as the pipeline: missing numbers become the batch median
+                medians = np.nanmedian(X, axis=0)
+                X = np.where(np.isnan(X), medians, X)
+            scores += X @ self.numeric_weights
+
+        if self.categorical_columns:
+            indices = np.empty((n_samples, len(self.categorical_columns)), dtype=np.intp)
+            for i, (column, vocabulary) in enumerate(zip(self.categorical_columns, self.category_indices)):
+                for row, value in enumerate(columns[column]):
+                    index = vocabulary.get('unknown' if value is None or value != value else value)
+                    if index is None:
+                        raise ValueError(f"Found unknown category {value!r} in column '{column}' during scoring")
+                    indices[row, i] = index
+            scores += self.category_weights[indices].sum(axis=1)
+
+        return scores
+
+    def predict(self, columns: Dict[str, np.ndarray]):
+        """Get the predicted classes and positive class probabilities of a batch."""
+        scores = self.decision_function(columns)
+        probabilities = expit(scores)
+        return self.classes[(scores > 0).astype(int)], probabilities
 
 class LogisticRegressionModel:
     def __init__(self):
@@ -15,6 +110,7 @@ class LogisticRegressionModel:
         self.is_trained = False
         self.feature_columns = None
         self.label_encoders = {}
+        self.scorer = None  # CompiledLogisticScorer used for prediction, built by compile()
     
     def _create_preprocessor(self, X):
         """Create preprocessor for both numeric and categorical features."""
@@ -93,6 +189,7 @@ class LogisticRegressionModel:
         )
         self.model.fit(X_processed, y)
         self.is_trained = True
+        self.compile()
 
         # Log training details
         print(f"Model trained successfully on {len(X)} samples.")
@@ -162,6 +259,7 @@ class LogisticRegressionModel:
         )
         self.model.fit(X_processed, y)
         self.is_trained = True
+        self.compile()
 
         loss = log_loss(y, self.model.predict_proba(X_processed))
         print(f"Model trained successfully on {len(X)} samples with log loss: {loss:.4f} for learning rate {alpha}.")
@@ -221,6 +319,7 @@ class LogisticRegressionModel:
         self.model.max_iter = max_iter
         self.model.fit(X_processed, y)
         self.is_trained = True
+        self.compile()
 
         print(f"Model trained successfully on {len(X)} samples.")
 
@@ -264,6 +363,20 @@ class LogisticRegressionModel:
             # Fallback if get_feature_names_out doesn't work
             return [f"feature_{i}" for i in range(len(self.model.coef_[0]))]
 
+    def compile(self) -> CompiledLogisticScorer:
+        """Freeze the fitted preprocessor and coefficients into the NumPy scorer used by predict."""
+        if not self.is_trained:
+            raise ValueError("Model has not been trained yet.")
+
+        self.scorer = CompiledLogisticScorer.from_pipeline(self.preprocessor, self.model)
+        return self.scorer
+
+    def _get_scorer(self) -> CompiledLogisticScorer:
+        # Models pickled before compile() existed are compiled on first use
+        if getattr(self, 'scorer', None) is None:
+            self.compile()
+        return self.scorer
+
     def predict(self, df):
         """Make predictions on new data."""
         if not self.is_trained:
@@ -277,21 +390,9 @@ class LogisticRegressionModel:
         if missing_features:
             raise ValueError(f"Missing feature columns for prediction: {missing_features}")
         
-        X = df[self.feature_columns].copy()
-        
-        # Handle missing values (same logic as training)
-        for col in X.columns:
-            if X[col].dtype in ['int64', 'float64']:
-                X[col].fillna(X[col].median(), inplace=True)
-            else:
-                X[col].fillna('unknown', inplace=True)
-        
-        # Transform and predict
-        X_processed = self.preprocessor.transform(X)
-        predictions = self.model.predict(X_processed)
-        probabilities = self.model.predict_proba(X_processed)
-        
-        return predictions, probabilities[:, 1]  # Return probabilities for positive class
+        # Score straight from the column arrays, without copying the frame or running sklearn
+        columns = {col: df[col].to_numpy() for col in self.feature_columns}
+        return self._get_scorer().predict(columns)  # Probabilities are for the positive class
     
     def predict_with_conditional_weights(self, df, feature_columns, 
                                     feature_preferences: Optional[Dict[str, Dict[str, float]]] = None):
@@ -451,86 +552,129 @@ class LogisticRegressionModel:
             Returns:
             tuple: (predictions, boosted probabilities)"""
         
-        # Get baseline predictions
-        X = df[feature_columns].copy()
-        
-        # Handle missing values
-        for col in X.columns:
-            missing_count = X[col].isnull().sum()
-            if missing_count > 0:
-                print(f"Column {col} has {missing_count} missing values")
-                
-            if X[col].dtype in ['int64', 'float64', 'int32', 'float32']:
-                X[col].fillna(X[col].median(), inplace=True)
-            else:
-                X[col].fillna('unknown', inplace=True)
-        
-        try:
-            X_processed = self.preprocessor.transform(X)
-        except Exception as e:
-            print(f"ERROR in preprocessing: {e}")
+        predictions, boosted_probs = self.predict_with_score_boost_many(
+            df, feature_columns, [feature_preferences], boost_amount=boost_amount)
+        if predictions is None:
             return None, None
         
+        return predictions[:, 0], boosted_probs[:, 0]
+
+    def predict_with_score_boost_many(self, df, feature_columns, users_preferences: List[Optional[Dict]],
+                                      boost_amount=0.4):
+        """Make predictions for many users at once, boosting scores by each user's feature preferences.
+
+        Each preference feature is one-hot encoded over the meals' values. Every user's
+        preferences become a sparse vector of boosts over those values, so one sparse
+        (meals x values) @ (values x users) product gives every boost for every user.
+
+        Args:
+            df: DataFrame with prediction data
+            feature_columns: List of feature column names used in training
+            users_preferences: One feature_preferences per user, in the formats of predict_with_score_boost
+            boost_amount: Amount to boost or penalize probabilities (default: 0.4)
+
+        Returns:
+            tuple: (predictions, boosted probabilities), both (meals x users) arrays"""
+
+        X = df[feature_columns]
+        columns = self._get_filled_columns(X)
+        
         try:
-            baseline_linear = X_processed @ self.model.coef_.T + self.model.intercept_
-            baseline_probs = 1 / (1 + np.exp(-baseline_linear.flatten()))
+            _, baseline_probs = self._get_scorer().predict(columns)
         except Exception as e:
             print(f"ERROR in baseline prediction: {e}")
             return None, None
-        
-        if feature_preferences is None or len(feature_preferences) == 0:
-            predictions = (baseline_probs > 0.5).astype(int)
-            return predictions, baseline_probs
-        
-        # Apply fixed boosts
-        boosted_probs = baseline_probs.copy()
-        total_boosts_applied = 0
-        
-        for feature_name, preference_values in feature_preferences.items():
+
+        return self._apply_score_boosts(X, columns, baseline_probs, users_preferences, boost_amount)
+
+    def apply_score_boosts(self, df, feature_columns, baseline_probs: np.ndarray,
+                           users_preferences: List[Optional[Dict]], boost_amount=0.4):
+        """Boost already computed baseline probabilities (e.g. from predict) for many users.
+
+        Returns:
+            tuple: (predictions, boosted probabilities), both (meals x users) arrays"""
+        X = df[feature_columns]
+        return self._apply_score_boosts(X, self._get_filled_columns(X), np.asarray(baseline_probs),
+                                        users_preferences, boost_amount)
+
+    def _get_filled_columns(self, X) -> Dict[str, np.ndarray]:
+        """Get the feature columns as arrays, with missing values filled like in training."""
+        columns = {}
+        for col in X.columns:
+            values = X[col].to_numpy()
+            missing = pd.isna(values)
+            missing_count = missing.sum()
+            if missing_count > 0:
+                print(f"Column {col} has {missing_count} missing values")
+                if X[col].dtype in ['int64', 'float64', 'int32', 'float32']:
+                    values = np.where(missing, np.nanmedian(values), values)
+                else:
+                    values = np.where(missing, 'unknown', values)
+            columns[col] = values
+        return columns
+
+    def _apply_score_boosts(self, X, columns: Dict[str, np.ndarray], baseline_probs: np.ndarray,
+                            users_preferences: List[Optional[Dict]], boost_amount: float):
+        boosts = np.zeros((len(X), len(users_preferences)))
+        preference_features = dict.fromkeys(
+            feature for preferences in users_preferences if preferences for feature in preferences)
+
+        for feature_name in preference_features:
             if feature_name not in X.columns:
                 print(f"ERROR: Feature '{feature_name}' not found in columns: {X.columns.tolist()}")
                 continue
-            
-            feature_values = X[feature_name]
-            
-            # Handle both list and dict formats
-            if isinstance(preference_values, list):
-                value_weights = {str(val): 2.0 for val in preference_values}
-            elif isinstance(preference_values, dict):
-                value_weights = preference_values
-            else:
-                value_weights = {str(preference_values): 3.0}
-            
-            for target_value, weight in value_weights.items():
-                # Find matching rows
-                if X[feature_name].dtype in ['object', 'category']:
-                    exact_matches = (feature_values == target_value)
-                    contains_matches = feature_values.astype(str).str.lower().str.contains(
-                        str(target_value).lower(), na=False)
-                    mask = exact_matches | contains_matches
-                else:
-                    mask = (feature_values == target_value)
-                
-                matching_rows = np.where(mask)[0]
-                
-                if len(matching_rows) > 0:
-                    
-                    # Apply fixed boost based on weight
-                    if weight > 1.0:
-                        boost = boost_amount * (weight - 1.0)  # Positive boost
-                        boosted_probs[matching_rows] += boost
-                        total_boosts_applied += len(matching_rows)
-                    elif weight < 1.0:
-                        penalty = boost_amount * (1.0 - weight)  # Negative boost (penalty)
-                        boosted_probs[matching_rows] -= penalty
-                        total_boosts_applied += len(matching_rows)
-        
+
+            # One-hot encode the meals over the distinct values of this feature
+            vocabulary = {}
+            value_indices = np.fromiter((vocabulary.setdefault(value, len(vocabulary)) for value in columns[feature_name]),
+                                        dtype=np.intp, count=len(X))
+            meal_values = sparse.csr_matrix((np.ones(len(X)), (np.arange(len(X)), value_indices)),
+                                            shape=(len(X), len(vocabulary)))
+
+            is_text = X[feature_name].dtype in ['object', 'category']
+            user_indices, boost_value_indices, amounts = [], [], []
+            for user, preferences in enumerate(users_preferences):
+                if not preferences or feature_name not in preferences:
+                    continue
+
+                for target_value, weight in self._get_preference_weights(preferences[feature_name]).items():
+                    if weight == 1.0:
+                        continue
+                    # Weights above 1 boost matching meals, weights below 1 penalize them
+                    amount = boost_amount * (weight - 1.0)
+                    for value, index in vocabulary.items():
+                        if self._preference_matches(value, target_value, is_text):
+                            user_indices.append(user)
+                            boost_value_indices.append(index)
+                            amounts.append(amount)
+
+            # Boosts of several matching preference values add up
+            user_boosts = sparse.csr_matrix((amounts, (user_indices, boost_value_indices)),
+                                            shape=(len(users_preferences), len(vocabulary)))
+            boosts += (meal_values @ user_boosts.T).toarray()
         
         # Clip to valid probability range
-        boosted_probs = np.clip(boosted_probs, 0, 1)
+        boosted_probs = np.clip(baseline_probs[:, np.newaxis] + boosts, 0, 1)
         predictions = (boosted_probs > 0.5).astype(int)
         
         return predictions, boosted_probs
+
+    def _get_preference_weights(self, preference_values) -> Dict:
+        """Get the value -> weight pairs of a preference (list, dict or single value)."""
+        if isinstance(preference_values, list):
+            return {str(val): 2.0 for val in preference_values}
+        elif isinstance(preference_values, dict):
+            return preference_values
+        else:
+            return {str(preference_values): 3.0}
+
+    def _preference_matches(self, value, target_value, is_text: bool) -> bool:
+        """Check if a feature value matches a preferred value."""
+        if not is_text:
+            # Numerical: exact match
+            return bool(value == target_value)
+        # Categorical: exact match, or the value contains the preference (regex, case-insensitive)
+        return value == target_value or re.search(str(target_value).lower(), str(value).lower()) is not None
     
     def predict_with_score_boost_simple(self, recommendation_features, 
                                    feature_columns, user_preference_features, boost_amount=0.4):
@@ -1,4 +1,4 @@
-from Backend.Recommender.multiple_linear_regression import MultipleLinearRegressionModel
+from Backend.Recommender.Multiple_linear_regression import MultipleLinearRegressionModel
 from Backend.Recommender.logistic_regression import LogisticRegressionModel
 from Backend.Data.meal_feature_manager import MealFeatureManager
 from Backend.Data.meal_data_manager import MealDataManager
@@ -6,10 +6,14 @@ import pandas as pd
 import pickle
 import os
 import traceback
+from itertools import islice
+from typing import Callable, Optional
 
 class MealModelManager:
     """Manages training and persistence of ML models."""
 
+    TRAINING_BATCH_SIZE = 10000  # Meals featurized at a time while streaming the training CSV
+
     def __init__(self):
         self.feature_manager = MealFeatureManager()
         self.data_manager = MealDataManager()
@@ -20,14 +24,14 @@ class MealModelManager:
         # Ensure models directory exists
         os.makedirs(self.models_dir, exist_ok=True)
 
-    def train_prep_time_model(self, limit: int = 10000) -> bool:
-        """Train the preparation time prediction model."""
+    def train_prep_time_model(self, limit: int = 10000, workers: Optional[int] = None) -> bool:
+        """Train the preparation time prediction model, parsing the training CSV with `workers` processes."""
         try:
             if not self.data_manager.can_train():
                 print("No training data available.")
                 return False
             
-            training_data = self.feature_manager.get_prep_time_features(self.data_manager.get_all_training_meals(), include_target=True)
+            training_data = self._get_training_features(self.feature_manager.get_prep_time_features, workers)
 
             if training_data.empty:
                 return False
@@ -42,14 +46,14 @@ class MealModelManager:
             print(f"Error training prep time model: {e}")
             return False
         
-    def train_recommendation_model(self, limit: int = 10000) -> bool:
-        """Train the recommendation model."""
+    def train_recommendation_model(self, limit: int = 10000, workers: Optional[int] = None) -> bool:
+        """Train the recommendation model, parsing the training CSV with `workers` processes."""
         try:
             if not self.data_manager.can_train():
                 print("No training data available.")
                 return False
             
-            training_data = self.feature_manager.get_recommendation_features(self.data_manager.get_all_training_meals(), include_target=True)
+            training_data = self._get_training_features(self.feature_manager.get_recommendation_features, workers)
 
             if training_data.empty:
                 return False
@@ -78,6 +82,26 @@ class MealModelManager:
             traceback.print_exc()
             return False
         
+    def _get_training_features(self, get_features: Callable, workers: Optional[int] = None) -> pd.DataFrame:
+        """
+        Stream the training meals in batches and keep only their feature rows,
+        so at most one batch of Meal objects is in memory at a time.
+        """
+        meals = self.data_manager.iter_training_meals(workers)
+        frames = []
+        while True:
+            batch = list(islice(meals, self.TRAINING_BATCH_SIZE))
+            if not batch:
+                break
+            preprocessed = self.feature_manager.preprocess_meals(batch)
+            features = get_features(batch, include_target=True, preprocessed=preprocessed)
+            if features is not None and not features.empty:
+                frames.append(features)
+
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+
     def save_model(self, model, filename: str):
         """Save a trained model to disk."""
         filepath = os.path.join(self.models_dir, filename)
@@ -92,6 +116,19 @@ class MealModelManager:
                 return pickle.load(f)
         return None
     
+    def get_model_version(self) -> tuple:
+        """
+        Get a version of the saved models that changes whenever one is retrained
+        (by any MealModelManager, as it is read from the model files).
+        """
+        version = []
+        for filename in ("prep_time_model.pkl", "recommendation_model.pkl"):
+            try:
+                version.append(os.stat(os.path.join(self.models_dir, filename)).st_mtime_ns)
+            except OSError:
+                version.append(None)
+        return tuple(version)
+
     def model_exists(self, filename: str) -> bool:
         """Check if a model file exists."""
         filepath = os.path.join(self.models_dir, filename)
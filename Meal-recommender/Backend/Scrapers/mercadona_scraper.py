@@ -328,8 +328,11 @@ class MercadonaScraper:
         self.logger.info(f"Saved {len(products)} products to {filepath}")
         
         # Create a copy with a fixed name for the application
+        # Written to a temp file first so running apps never read a half-written CSV
         latest_filepath = os.path.join(self.output_dir, "mercadona_products_latest.csv")
-        df.to_csv(latest_filepath, index=False)
+        temp_filepath = f"{latest_filepath}.tmp"
+        df.to_csv(temp_filepath, index=False)
+        os.replace(temp_filepath, latest_filepath)
         self.logger.info(f"Also saved to {latest_filepath} for application use")
         
         return filepath
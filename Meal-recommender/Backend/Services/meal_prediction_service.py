@@ -1,11 +1,15 @@
 from Backend.Data.meal_feature_manager import MealFeatureManager
 from Backend.Recommender.meal_model_manager import MealModelManager
 from Backend.Data.meal_data_manager import MealDataManager
+from Backend.Data.Utils.recommendation_cache import RecommendationCache
+from Backend.Services.meal_scoring_pipeline import MealScoringPipeline
 from Backend.models.user import User
-import pandas as pd
-import os
+from typing import Dict, List, Optional
+import numpy as np
 
 class MealPredictionService:
+    RANDOM_POOL_REQUESTS = 4  # Random meal requests served from one fetched and scored pool
+
     def __init__(self):
 
         self.meal_feature_manager = MealFeatureManager()
@@ -20,210 +24,151 @@ class MealPredictionService:
         if not self.recommendation_model:
             raise RuntimeError("Failed to load or train recommendation model")
 
-    def get_enriched_meals(self, search_term: str) -> list:
-        """Get enriched meals based on a search term."""
-        enriched_meals = self.data_merger.get_enriched_meals(search_term)
-        
-        if not enriched_meals or len(enriched_meals) == 0:
-            return None
-        
-        # Extract features for enriched meals
-        enriched_features = self.meal_feature_manager.get_prep_time_features(enriched_meals)
-        if enriched_features is None or enriched_features.empty:
-            return None
-        
-        # Calculate preparation times for enriched meals
-        enriched_prep_times = self.prep_time_model.predict(enriched_features)
-        if enriched_prep_times is None or len(enriched_prep_times) == 0:
-            return None
-        
-        # Combine enriched meals with their predicted preparation times
-        for meal, prep_time in zip(enriched_meals, enriched_prep_times):
-            meal.prep_time = round(prep_time, 0) if prep_time is not None else None
+        self.model_version = self.model_manager.get_model_version()  # Version of the loaded models
 
-        # Extract recommendation features for enriched meals
-        recommendation_features = self.meal_feature_manager.get_recommendation_features(enriched_meals)
-        if recommendation_features is None or recommendation_features.empty:
-            return None
-        
-        # Predict recommendations for enriched meals
-        binary_prediction, probabilities = self.model_manager.recommendation_model.predict(recommendation_features)
-        if binary_prediction is None or len(binary_prediction) == 0:
-            return None
-        
-        # Combine enriched meals with their recommendation predictions
-        for meal, is_recommended, prob in zip(enriched_meals, binary_prediction, probabilities):
-            meal.is_recommended = is_recommended
-            meal.recommendation_score = round(prob * 5, 1) if prob is not None else None
-        
-        return enriched_meals
+        self.scoring_pipeline = MealScoringPipeline(self.meal_feature_manager, self.prep_time_model,
+                                                    self.recommendation_model)
+        self.recommendation_cache = RecommendationCache()
+
+    def _reload_models_if_changed(self):
+        """Load the saved models again if they were retrained (e.g. by another process)."""
+        version = self.model_manager.get_model_version()
+        if version == self.model_version:
+            return
+
+        try:
+            prep_time_model = self.model_manager.load_model("prep_time_model.pkl")
+            recommendation_model = self.model_manager.load_model("recommendation_model.pkl")
+        except Exception as e:
+            print(f"Error reloading retrained models: {e}")
+            return
+        if not prep_time_model or not recommendation_model:
+            return
+
+        self.prep_time_model = self.scoring_pipeline.prep_time_model = prep_time_model
+        self.recommendation_model = self.scoring_pipeline.recommendation_model = recommendation_model
+        self.model_version = version
+        print("Reloaded retrained models")
+
+    def _get_cache_version(self) -> tuple:
+        return self.model_version, self.data_merger.get_data_version()
+
+    def get_enriched_meals(self, search_term: str, top_k: Optional[int] = None) -> list:
+        """Get enriched meals based on a search term (only the `top_k` best scored, if given)."""
+        self._reload_models_if_changed()
+        result = self.scoring_pipeline.run(lambda: self.data_merger.get_enriched_meals(search_term), top_k=top_k)
+        return result.meals if result else None
     
     def get_random_enriched_meals(self, count: int) -> list:
         """Get a random selection of enriched meals."""
-        enriched_meals = self.data_merger.get_random_enriched_meals(count)
-        
-        if not enriched_meals or len(enriched_meals) == 0:
-            return None
-        
-        # Extract features for enriched meals
-        enriched_features = self.meal_feature_manager.get_prep_time_features(enriched_meals)
-        if enriched_features is None or enriched_features.empty:
-            return None
-        
-        # Calculate preparation times for enriched meals
-        enriched_prep_times = self.prep_time_model.predict(enriched_features)
-        if enriched_prep_times is None or len(enriched_prep_times) == 0:
-            return None
-        
-        # Combine enriched meals with their predicted preparation times
-        for meal, prep_time in zip(enriched_meals, enriched_prep_times):
-            meal.prep_time = round(prep_time, 0) if prep_time is not None else None
-
-        return enriched_meals
+        self._reload_models_if_changed()
+        result = self.scoring_pipeline.run(lambda: self.data_merger.get_random_enriched_meals(count),
+                                           recommend=False)
+        return result.meals if result else None
     
-    def get_random_enriched_meals_user_preferences(self, count: int, user: User) -> list:
-        """Get a random selection of enriched meals based on user preferences."""
-        enriched_meals = []
-        for i in range(count):
-            meal = self.data_merger.get_random_enriched_meal()
-            if meal:
-                print(f"Meal {i+1}: {meal.name} - {meal.id}")
-                enriched_meals.append(meal)
+    def get_random_enriched_meals_user_preferences(self, count: int, user: User, top_k: Optional[int] = None) -> list:
+        """
+        Get a random selection of enriched meals based on user preferences (the `top_k` best, if given).
+        Random meals are fetched and scored for several requests at once, and each request takes
+        the next `count` of them from the user's cached pool, so no meal is served twice.
+        """
+        self._reload_models_if_changed()
+        request = ("random",)
+        cache_key = self.recommendation_cache.build_key(user, request, self._get_cache_version())
+        pool = self.recommendation_cache.get(cache_key)
+        if not pool or len(pool) < count:
+            pool = self._get_scored_random_meals(count * self.RANDOM_POOL_REQUESTS, user)
+            if not pool:
+                return None
 
-        if not enriched_meals or len(enriched_meals) == 0:
-            return None
-        
-        # Extract features for enriched meals
-        enriched_features = self.meal_feature_manager.get_prep_time_features(enriched_meals)
-        if enriched_features is None or enriched_features.empty:
-            return None
-        
-        # Calculate preparation times for enriched meals
-        enriched_prep_times = self.prep_time_model.predict(enriched_features)
-        if enriched_prep_times is None or len(enriched_prep_times) == 0:
-            return None
-        
-        # Combine enriched meals with their predicted preparation times
-        for meal, prep_time in zip(enriched_meals, enriched_prep_times):
-            meal.prep_time = round(prep_time, 0) if prep_time is not None else None
+        meals, remaining = pool[:count], pool[count:]
+        if self.recommendation_cache.build_key(user, request, self._get_cache_version()) == cache_key:
+            self.recommendation_cache.set(cache_key, remaining)
 
-        # Extract recommendation features for enriched meals
-        recommendation_features = self.meal_feature_manager.get_recommendation_features(enriched_meals)
-        if recommendation_features is None or recommendation_features.empty:
-            return None
-        
-        # Create user preference features
-        feature_columns = [
-                "ingredient_count", "instruction_length", "type_of_meal",
-                "is_vegetarian", "has_dairy", "has_gluten", "prep_time",
-                "flavor_profile", "complexity_score"
-            ]
-        
-        user_preference_features = {"type_of_meal": user.prefered_types,
-                                    "flavor_profile": user.prefered_flavors}
-        
-        # Predict recommendations for enriched meals
-        binary_prediction, probabilities = self.model_manager.recommendation_model.predict_with_score_boost_simple(
-            recommendation_features, feature_columns, user_preference_features)
-        if binary_prediction is None or len(binary_prediction) == 0:
-            return None
-        
-        # Combine enriched meals with their recommendation predictions
-        for meal, is_recommended, prob in zip(enriched_meals, binary_prediction, probabilities):
-            meal.is_recommended = is_recommended
-            meal.recommendation_score = round(prob * 5, 1) if prob is not None else None
+        # Stable, so equal scores keep the order the meals were fetched in, as in the pipeline
+        meals.sort(key=lambda meal: meal.recommendation_score if meal.recommendation_score is not None else 0,
+                   reverse=True)
+        return meals[:top_k] if top_k is not None else meals
 
-        enriched_meals.sort(key=lambda meal: meal.recommendation_score if meal.recommendation_score is not None else 0, 
-                    reverse=True)
-        
-        return enriched_meals
+    def _get_scored_random_meals(self, count: int, user: User) -> list:
+        """Fetch `count` random enriched meals and score them for a user, keeping the fetch order."""
+        enriched_meals = []
+
+        def get_candidates():
+            for i in range(count):
+                meal = self.data_merger.get_random_enriched_meal()
+                if meal:
+                    print(f"Meal {i+1}: {meal.name} - {meal.id}")
+                    enriched_meals.append(meal)
+            return enriched_meals
+
+        result = self.scoring_pipeline.run(get_candidates, user=user)
+        return enriched_meals if result else None
     
-    def get_enriched_meal_user_preferences(self, search_term: str, user: User) -> list:
-        """Get enriched meals based on a search term and user preferences."""
-        enriched_meals = self.data_merger.get_enriched_meals(search_term)
-        
-        if not enriched_meals or len(enriched_meals) == 0:
-            return None
-        
-        # Extract features for enriched meals
-        enriched_features = self.meal_feature_manager.get_prep_time_features(enriched_meals)
-        if enriched_features is None or enriched_features.empty:
-            return None
-        
-        # Calculate preparation times for enriched meals
-        enriched_prep_times = self.prep_time_model.predict(enriched_features)
-        if enriched_prep_times is None or len(enriched_prep_times) == 0:
-            return None
-        
-        # Combine enriched meals with their predicted preparation times
-        for meal, prep_time in zip(enriched_meals, enriched_prep_times):
-            meal.prep_time = round(prep_time, 0) if prep_time is not None else None
+    def get_enriched_meal_user_preferences(self, search_term: str, user: User, top_k: Optional[int] = None) -> list:
+        """Get enriched meals based on a search term and user preferences (the `top_k` best, if given)."""
+        self._reload_models_if_changed()
+        request = ("search", search_term.strip())
+        cache_key = self.recommendation_cache.build_key(user, request, self._get_cache_version())
+        meals = self.recommendation_cache.get(cache_key, top_k)
+        if meals is not None:
+            return meals
 
-        # Extract recommendation features for enriched meals
-        recommendation_features = self.meal_feature_manager.get_recommendation_features(enriched_meals)
-        if recommendation_features is None or recommendation_features.empty:
-            return None
-        
-        # Create user preference features
-        feature_columns = [
-                "ingredient_count", "instruction_length", "type_of_meal",
-                "is_vegetarian", "has_dairy", "has_gluten", "prep_time",
-                "flavor_profile", "complexity_score"
-            ]
-        
-        user_preference_features = {"type_of_meal": user.prefered_types,
-                                    "flavor_profile": user.prefered_flavors}
-        
-        # Predict recommendations for enriched meals
-        binary_prediction, probabilities = self.model_manager.recommendation_model.predict_with_score_boost_simple(
-            recommendation_features, feature_columns, user_preference_features)
-        if binary_prediction is None or len(binary_prediction) == 0:
+        result = self.scoring_pipeline.run(lambda: self.data_merger.get_enriched_meals(search_term),
+                                           user=user, top_k=top_k)
+        if not result:
             return None
-        
-        # Combine enriched meals with their recommendation predictions
-        for meal, is_recommended, prob in zip(enriched_meals, binary_prediction, probabilities):
-            meal.is_recommended = is_recommended
-            meal.recommendation_score = round(prob * 5, 1) if prob is not None else None
 
-        enriched_meals.sort(key=lambda meal: meal.recommendation_score if meal.recommendation_score is not None else 0, 
-                    reverse=True)
-        
-        return enriched_meals
+        # Prices reloaded during the search (or loaded by it) may have priced meals with
+        # either index, so only cache results whose versions did not change meanwhile
+        if self.recommendation_cache.build_key(user, request, self._get_cache_version()) == cache_key:
+            self.recommendation_cache.set(cache_key, result.meals, top_k)
+        return result.meals
     
-    def get_all_enriched_meals(self) -> list:
-        """Get all enriched meals from the API."""
-        enriched_meals = self.data_merger.get_all_enriched_meals()
-        
-        if not enriched_meals or len(enriched_meals) == 0:
-            return None
-        
-        # Extract features for all enriched meals
-        enriched_features = self.meal_feature_manager.get_prep_time_features(enriched_meals)
-        if enriched_features is None or enriched_features.empty:
-            return None
-        
-        # Calculate preparation times for all enriched meals
-        enriched_prep_times = self.prep_time_model.predict(enriched_features)
-        if enriched_prep_times is None or len(enriched_prep_times) == 0:
-            return None
-        
-        # Combine all enriched meals with their predicted preparation times
-        for meal, prep_time in zip(enriched_meals, enriched_prep_times):
-            meal.prep_time = round(prep_time, 0) if prep_time is not None else None
+    def precompute_user_recommendations(self, users: List[User], search_terms: List[str],
+                                        top_k: Optional[int] = None) -> int:
+        """
+        Cache the personalized results of each search term for every user (the `top_k` best, if given).
+        Each term's meals are fetched and scored once for all users. Returns the number of cached results.
+        """
+        self._reload_models_if_changed()
+        cached = 0
+        for search_term in search_terms:
+            request = ("search", search_term.strip())
+            version = self._get_cache_version()
+            result = self.scoring_pipeline.run_for_users(lambda: self.data_merger.get_enriched_meals(search_term),
+                                                         users, top_k=top_k)
+            # As in get_enriched_meal_user_preferences, skip results priced while the versions changed
+            if not result or self._get_cache_version() != version:
+                continue
 
-        # Extract recommendation features for all enriched meals
-        recommendation_features = self.meal_feature_manager.get_recommendation_features(enriched_meals)
-        if recommendation_features is None or recommendation_features.empty:
-            return None
-        
-        # Predict recommendations for all enriched meals
-        binary_prediction, probabilities = self.model_manager.recommendation_model.predict(recommendation_features)
-        if binary_prediction is None or len(binary_prediction) == 0:
-            return None
-        
-        # Combine all enriched meals with their recommendation predictions
-        for meal, is_recommended, prob in zip(enriched_meals, binary_prediction, probabilities):
-            meal.is_recommended = is_recommended
-            meal.recommendation_score = round(prob * 5, 1) if prob is not None else None
-        
-        return enriched_meals
\ No newline at end of file
+            for column, user in enumerate(users):
+                meals = []
+                for index in result.rankings[column]:
+                    meal = result.meals[index]
+                    probability = result.probabilities[index, column]
+                    meal.is_recommended = result.predictions[index, column]
+                    meal.recommendation_score = round(probability * 5, 1) if not np.isnan(probability) else None
+                    meals.append(meal)
+                # The cache copies the meals, so the next user's scores do not overwrite these
+                self.recommendation_cache.set(self.recommendation_cache.build_key(user, request, version), meals, top_k)
+                cached += 1
+        return cached
+
+    def get_all_enriched_meals(self, top_k: Optional[int] = None) -> list:
+        """Get all enriched meals from the API (only the `top_k` best scored, if given)."""
+        self._reload_models_if_changed()
+        result = self.scoring_pipeline.run(self.data_merger.get_all_enriched_meals, top_k=top_k)
+        return result.meals if result else None
+
+    def invalidate_user_recommendations(self, user_id: int):
+        """Drop the cached recommendations of a user (e.g. after their preferences changed)."""
+        self.recommendation_cache.invalidate_user(user_id)
+
+    def get_recommendation_cache_stats(self) -> Dict[str, float]:
+        """Get hit-rate statistics of the personalized recommendation cache."""
+        return self.recommendation_cache.get_stats()
+
+    def get_last_timings(self) -> Dict[str, float]:
+        """Get the seconds spent in each scoring stage of the last request."""
+        return dict(self.scoring_pipeline.last_timings)
@@ -0,0 +1,218 @@
+from Backend.Data.meal_feature_manager import MealFeatureManager
+from Backend.models.meal import Meal
+from Backend.models.user import User
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Union
+import heapq
+import numpy as np
+import time
+
+@dataclass
+class ScoringResult:
+    meals: List[Meal]  # In ranked order when the pipeline ranked them
+    prep_times: np.ndarray  # Aligned with meals
+    probabilities: Optional[np.ndarray] = None  # Aligned with meals (NaN if unscored), None without recommendation
+    timings: Dict[str, float] = field(default_factory=dict)  # Seconds per stage
+
+@dataclass
+class UsersScoringResult:
+    meals: List[Meal]  # In candidate order
+    prep_times: np.ndarray  # Aligned with meals
+    predictions: np.ndarray  # (meals x users), None where a meal is unscored
+    probabilities: np.ndarray  # (meals x users) boosted probabilities, NaN where a meal is unscored
+    rankings: List[List[int]]  # Per user, indices into meals, best first (only the top k, if given)
+    timings: Dict[str, float] = field(default_factory=dict)  # Seconds per stage
+
+class MealScoringPipeline:
+    """
+    Scores a batch of meals in fixed stages:
+    candidates -> prep-time features -> prep-time model -> recommendation features ->
+    recommendation model -> personalization -> top-k.
+
+    The text of the meals is preprocessed once for both feature stages, each model runs
+    once per batch, and every stage is timed (see ScoringResult.timings and last_timings).
+
+    Every candidate is scored with its predicted prep time, so a `top_k` ranking is exactly
+    the first `top_k` meals of the full ranking; only the selection uses a heap.
+    """
+
+    RECOMMENDATION_FEATURE_COLUMNS = [
+        "ingredient_count", "instruction_length", "type_of_meal",
+        "is_vegetarian", "has_dairy", "has_gluten", "prep_time",
+        "flavor_profile", "complexity_score"
+    ]
+
+    def __init__(self, feature_manager: MealFeatureManager, prep_time_model, recommendation_model,
+                 boost_amount: float = 0.4):
+        self.feature_manager = feature_manager
+        self.prep_time_model = prep_time_model
+        self.recommendation_model = recommendation_model
+        self.boost_amount = boost_amount
+        self.last_timings = {}
+
+    @contextmanager
+    def _stage(self, name: str, timings: Dict[str, float]):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            timings[name] = time.perf_counter() - start
+
+    def run(self, candidates: Union[List[Meal], Callable[[], List[Meal]]], user: Optional[User] = None,
+            recommend: bool = True, top_k: Optional[int] = None) -> Optional[ScoringResult]:
+        """
+        Score the candidate meals (a list, or a function fetching them).
+        Predicted prep times and scores are also set on the meals. With a user, scores are
+        boosted by their preferences. With a user or `top_k`, the meals are ranked by score
+        and only the best `top_k` are returned.
+        Returns None when there are no candidates or a stage produced nothing.
+        """
+        timings = {}
+        self.last_timings = timings
+
+        with self._stage('candidates', timings):
+            meals = candidates() if callable(candidates) else candidates
+        if not meals:
+            return None
+
+        with self._stage('preprocess', timings):
+            preprocessed = self.feature_manager.preprocess_meals(meals)
+
+        with self._stage('prep_time_features', timings):
+            prep_time_features = self.feature_manager.get_prep_time_features(meals, preprocessed=preprocessed)
+        if prep_time_features is None or prep_time_features.empty:
+            return None
+
+        with self._stage('prep_time', timings):
+            prep_times = self.prep_time_model.predict(prep_time_features)
+            if prep_times is None:
+                return None
+            prep_times = np.atleast_1d(np.asarray(prep_times, dtype=np.float64))
+            for meal, prep_time in zip(meals, prep_times):
+                meal.prep_time = round(prep_time, 0)
+        if len(prep_times) == 0:
+            return None
+
+        result = ScoringResult(meals=meals, prep_times=prep_times, timings=timings)
+        if not recommend:
+            return result
+
+        with self._stage('recommendation_features', timings):
+            recommendation_features = self.feature_manager.get_recommendation_features(meals, preprocessed=preprocessed)
+        if recommendation_features is None or recommendation_features.empty:
+            return None
+
+        with self._stage('recommendation', timings):
+            predictions, probabilities = self.recommendation_model.predict(recommendation_features)
+        if predictions is None or len(predictions) == 0:
+            return None
+
+        if user is not None:
+            with self._stage('personalization', timings):
+                predictions, probabilities = self.recommendation_model.apply_score_boosts(
+                    recommendation_features, self.RECOMMENDATION_FEATURE_COLUMNS, probabilities,
+                    [self._get_preference_features(user)], boost_amount=self.boost_amount)
+            if predictions is None:
+                return None
+            predictions, probabilities = predictions[:, 0], probabilities[:, 0]
+
+        # Meals the extractor skipped (after a failing meal) are left unscored
+        for meal, is_recommended, prob in zip(meals, predictions, probabilities):
+            meal.is_recommended = is_recommended
+            meal.recommendation_score = round(prob * 5, 1) if prob is not None else None
+
+        result.probabilities = np.full(len(meals), np.nan)
+        result.probabilities[:len(probabilities)] = probabilities
+        if user is None and top_k is None:
+            return result
+
+        with self._stage('top_k', timings):
+            order = self._rank([meal.recommendation_score for meal in meals], top_k)
+            result.meals = [meals[i] for i in order]
+            result.prep_times = prep_times[order]
+            result.probabilities = result.probabilities[order]
+        return result
+
+    def run_for_users(self, candidates: Union[List[Meal], Callable[[], List[Meal]]], users: List[User],
+                      top_k: Optional[int] = None) -> Optional[UsersScoringResult]:
+        """
+        Score the candidate meals (a list, or a function fetching them) for many users at once.
+        Features, prep times and the recommendation model are computed once for all users,
+        and one sparse product boosts every user's scores (see predict_with_score_boost_many).
+        Each user's ranking is the one run() gives with that user.
+        Predicted prep times are set on the meals, scores are not (they differ per user).
+        Returns None when there are no candidates or a stage produced nothing.
+        """
+        timings = {}
+        self.last_timings = timings
+
+        with self._stage('candidates', timings):
+            meals = candidates() if callable(candidates) else candidates
+        if not meals or not users:
+            return None
+
+        with self._stage('preprocess', timings):
+            preprocessed = self.feature_manager.preprocess_meals(meals)
+
+        with self._stage('prep_time_features', timings):
+            prep_time_features = self.feature_manager.get_prep_time_features(meals, preprocessed=preprocessed)
+        if prep_time_features is None or prep_time_features.empty:
+            return None
+
+        with self._stage('prep_time', timings):
+            prep_times = self.prep_time_model.predict(prep_time_features)
+            if prep_times is None:
+                return None
+            prep_times = np.atleast_1d(np.asarray(prep_times, dtype=np.float64))
+            for meal, prep_time in zip(meals, prep_times):
+                meal.prep_time = round(prep_time, 0)
+        if len(prep_times) == 0:
+            return None
+
+        with self._stage('recommendation_features', timings):
+            recommendation_features = self.feature_manager.get_recommendation_features(meals, preprocessed=preprocessed)
+        if recommendation_features is None or recommendation_features.empty:
+            return None
+
+        with self._stage('recommendation', timings):
+            _, probabilities = self.recommendation_model.predict(recommendation_features)
+        if probabilities is None or len(probabilities) == 0:
+            return None
+
+        with self._stage('personalization', timings):
+            predictions, probabilities = self.recommendation_model.apply_score_boosts(
+                recommendation_features, self.RECOMMENDATION_FEATURE_COLUMNS, probabilities,
+                [self._get_preference_features(user) for user in users], boost_amount=self.boost_amount)
+        if predictions is None:
+            return None
+
+        # Meals the extractor skipped (after a failing meal) are left unscored
+        all_probabilities = np.full((len(meals), len(users)), np.nan)
+        all_probabilities[:len(probabilities)] = probabilities
+        all_predictions = np.full((len(meals), len(users)), None, dtype=object)
+        all_predictions[:len(predictions)] = predictions
+
+        with self._stage('top_k', timings):
+            # Rank by the rounded score shown to users, as run() does
+            scores = np.round(all_probabilities * 5, 1)
+            rankings = [self._rank([None if np.isnan(score) else score for score in scores[:, column].tolist()], top_k)
+                        for column in range(len(users))]
+
+        return UsersScoringResult(meals=meals, prep_times=prep_times, predictions=all_predictions,
+                                  probabilities=all_probabilities, rankings=rankings, timings=timings)
+
+    @staticmethod
+    def _get_preference_features(user: User) -> Dict[str, List[str]]:
+        return {"type_of_meal": user.prefered_types, "flavor_profile": user.prefered_flavors}
+
+    @staticmethod
+    def _rank(scores: List[Optional[float]], top_k: Optional[int]) -> List[int]:
+        """Get the indices of the best scores (unscored meals count as 0), best first."""
+        def score(i):
+            return scores[i] if scores[i] is not None else 0
+
+        # nlargest keeps the order of equal scores, like a stable descending sort
+        if top_k is None:
+            return sorted(range(len(scores)), key=score, reverse=True)
+        return heapq.nlargest(top_k, range(len(scores)), key=score)
@@ -1,4 +1,5 @@
 from Backend.Recommender.meal_model_manager import MealModelManager
+from typing import Optional
 
 class MealTrainingService:
     """Service for training meal-related models."""
@@ -6,22 +7,22 @@ class MealTrainingService:
     def __init__(self):
         self.model_manager = MealModelManager()
 
-    def train_prep_time_model(self, limit: int = 1000) -> bool:
-        """Train the preparation time model with a specified limit."""
-        return self.model_manager.train_prep_time_model(limit=limit)
+    def train_prep_time_model(self, limit: int = 1000, workers: Optional[int] = None) -> bool:
+        """Train the preparation time model with a specified limit and number of parser processes."""
+        return self.model_manager.train_prep_time_model(limit=limit, workers=workers)
     
-    def train_recommendation_model(self, limit: int = 1000) -> bool:
-        """Train the recommendation model with a specified limit."""
-        return self.model_manager.train_recommendation_model(limit=limit)
+    def train_recommendation_model(self, limit: int = 1000, workers: Optional[int] = None) -> bool:
+        """Train the recommendation model with a specified limit and number of parser processes."""
+        return self.model_manager.train_recommendation_model(limit=limit, workers=workers)
     
-    def train_all_models(self, limit: int = 1000) -> bool:
-        """Train all models with a specified limit."""
+    def train_all_models(self, limit: int = 1000, workers: Optional[int] = None) -> bool:
+        """Train all models with a specified limit and number of parser processes."""
         try:
-            if not self.train_prep_time_model(limit=limit):
+            if not self.train_prep_time_model(limit=limit, workers=workers):
                 print("Failed to train preparation time model.")
                 return False
             
-            if not self.train_recommendation_model(limit=limit):
+            if not self.train_recommendation_model(limit=limit, workers=workers):
                 print("Failed to train recommendation model.")
                 return False
             
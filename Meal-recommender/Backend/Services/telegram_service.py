@@ -4,6 +4,8 @@ from ..Services.user_service import UserService
 from ..Api.telegram_bot import TelegramBot
 from typing import Dict, Any
 from ..models.user import User
+import threading
+import time
 
 class SurveyState(Enum):
     """Survey states for new users."""
@@ -15,12 +17,17 @@ class SurveyState(Enum):
 class TelegramBotService:
     """Telegram bot for meal recommendations based on user preferences."""
 
+    SEARCH_RESULT_COUNT = 3
+    # Searches whose results are precomputed for every user when the bot starts
+    PRECOMPUTED_SEARCH_TERMS = ["chicken", "beef", "pasta", "seafood", "vegetarian", "dessert"]
+
     def __init__(self, token: str):
         """Initialize the bot with the provided token."""
         self.token = token
         self.bot = TelegramBot(token)
         self.user_service = UserService()
         self.meal_prediction_service = MealPredictionService()
+        self.user_service.add_preferences_listener(self.meal_prediction_service.invalidate_user_recommendations)
 
         self.user_states = {}
         self.user_survey_data = {}
@@ -393,7 +400,8 @@ class TelegramBotService:
                 return
             
             # Get a random meal based on user preferences
-            meal = self.meal_prediction_service.get_random_enriched_meals_user_preferences(5, user)[0] # Get highest recommended random meal
+            meals = self.meal_prediction_service.get_random_enriched_meals_user_preferences(5, user, top_k=1)
+            meal = meals[0] if meals else None # Highest recommended random meal
             
             if not meal:
                 self.bot.api.send_message(
@@ -471,7 +479,8 @@ class TelegramBotService:
             )
             
             # Use your meal service to get recommendations
-            meals = self.meal_prediction_service.get_enriched_meal_user_preferences(search_term, user)
+            meals = self.meal_prediction_service.get_enriched_meal_user_preferences(search_term, user,
+                                                                                 top_k=self.SEARCH_RESULT_COUNT)
             
             if not meals:
                 self.bot.api.send_message(
@@ -551,11 +560,27 @@ class TelegramBotService:
                 text="❌ Sorry, there was an error loading your preferences."
             )
 
+    def _precompute_recommendations(self):
+        """Cache the results of the common searches for every registered user, in one batch per search."""
+        try:
+            start = time.perf_counter()
+            users = self.user_service.get_all_users()
+            cached = self.meal_prediction_service.precompute_user_recommendations(
+                users, self.PRECOMPUTED_SEARCH_TERMS, top_k=self.SEARCH_RESULT_COUNT)
+            print(f"Precomputed {cached} recommendations for {len(users)} users "
+                  f"in {time.perf_counter() - start:.1f} s")
+        except Exception as e:
+            print(f"Error precomputing recommendations: {e}")
+
     def start(self):
         """Start the bot."""
         print("🚀 Starting Meal Recommendation Bot...")
+        # Pick up re-scraped Mercadona prices without restarting the bot
+        self.meal_prediction_service.data_merger.watch_price_updates()
+        threading.Thread(target=self._precompute_recommendations, daemon=True).start()
         self.bot.start_polling()
 
     def stop(self):
         """Stop the bot."""
+        self.meal_prediction_service.data_merger.stop_watching_price_updates()
         self.bot.stop()
\ No newline at end of file
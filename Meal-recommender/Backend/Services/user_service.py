@@ -2,6 +2,7 @@ from Backend.Data.base_repository import BaseRepository
 from Backend.Data.user_repository import UserRepository
 from Backend.Data.database import DatabaseManager
 from Backend.models.user import User
+from typing import Callable, List
 import uuid
 import os
 
@@ -11,6 +12,13 @@ class UserService:
             db_manager = DatabaseManager()
             user_repository = UserRepository(db_manager)
         self.user_repository = user_repository
+        self._preferences_listeners = []
+
+    def add_preferences_listener(self, listener: Callable[[int], None]):
+        """
+        Call `listener` with the user's ID whenever a user's preferences are updated.
+        """
+        self._preferences_listeners.append(listener)
 
     def get_or_create_cli_user(self) -> User:
         """
@@ -33,6 +41,12 @@ class UserService:
             self.user_repository.add(user)
         return user
     
+    def get_all_users(self) -> List[User]:
+        """
+        Retrieve every registered user.
+        """
+        return self.user_repository.get_all()
+    
     def update_user_preferences(self, user_id: int, prefered_flavors: list = None, 
                              prefered_types: list = None, dietary_restrictions: list = None) -> User:
         """
@@ -50,6 +64,8 @@ class UserService:
             user.dietary_restrictions = dietary_restrictions
         
         self.user_repository.update(user)
+        for listener in self._preferences_listeners:
+            listener(user_id)
         return user
     
     def _get_or_create_cli_device_id(self) -> int:
@@ -13,6 +13,8 @@ class Meal:
     review_count: Optional[int] = None
     estimated_cost: Optional[float] = None
     prep_time: Optional[int] = None  # in minutes
+    cook_time: Optional[int] = None  # in minutes
+    total_time: Optional[int] = None  # in minutes
     servings: Optional[int] = None
     keywords: Optional[List[str]] = None
     image_url: Optional[str] = None
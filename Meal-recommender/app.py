@@ -8,6 +8,7 @@ def main():
     mercadona_scraper = MercadonaScraper()
     training_service = MealTrainingService()
     user_service = UserService()
+    user_service.add_preferences_listener(prediction_service.invalidate_user_recommendations)
     print("Loading...")
     print("Loaded successfully!")
 
@@ -55,6 +56,16 @@ def main():
                 print("Scraping completed successfully!")
                 continue
             
+            if user_input.startswith('-sync'):
+                full = 'full' in user_input.split()[1:]
+                print(f"Starting {'full' if full else 'incremental'} catalog sync...")
+                stats = prediction_service.data_merger.sync_catalog_mirror(full=full)
+                if stats['completed']:
+                    print("Catalog sync completed successfully!")
+                else:
+                    print("Catalog sync did not complete (see the errors above). Run -sync again to retry.")
+                continue
+            
             if user_input.startswith('-retrain'):
                 train_models(user_input, training_service)
                 continue
@@ -69,17 +80,14 @@ def main():
             
 
 def print_meal_from_search_term(search_term: str, service: MealPredictionService, user_service: UserService) -> list:
-    meals = service.get_enriched_meal_user_preferences(search_term, user_service.get_or_create_cli_user())
+    meals = service.get_enriched_meal_user_preferences(search_term, user_service.get_or_create_cli_user(),
+                                                       top_k=5)
     
     if not meals:
         print(f"No meals found for search term: {search_term}")
         return []
     
-    count = 0
     for meal in meals:
-        count += 1
-        if count > 5:
-            break
         print(f"Meal: {meal.name}")
         print(f"Personalized Score: {meal.recommendation_score}")
         print(f"Preparation Time: {meal.prep_time} minutes")
@@ -95,27 +103,37 @@ def print_help():
     print("2. -quit / -q or -exit / -e - Exit the application.")
     print("3. -help / -h - Show this help message.")
     print("4. -scrape - Scrape the latest mercadona price data.")
-    print("5. -retrain <model> <limit> - Retrain the model with a specified limit. (model names: prep_time, recommendation)")
+    print("5. -retrain <model> <limit> [--workers <n>] - Retrain the model with a specified limit, parsing the training data with n processes. (model names: prep_time, recommendation)")
+    print("6. -sync [full] - Sync the local TheMealDB catalog mirror (incremental unless 'full' is given).")
 
 def train_models(user_input: str, training_service: MealTrainingService) -> bool:
     parts = user_input.split()
-    if len(parts) < 3:
-        print("Usage: -retrain <model> <limit>")
+    if len(parts) not in (3, 5) or (len(parts) == 5 and parts[3] != "--workers"):
+        print("Usage: -retrain <model> <limit> [--workers <n>]")
         return
     
     model_name = parts[1]
     try:
         limit = int(parts[2])
-        if model_name == "prep_time":
-            training_service.train_prep_time_model(limit)
-            print(f"Retrained {model_name} model with limit {limit}.")
-        elif model_name == "recommendation":
-            training_service.train_recommendation_model(limit)
-            print(f"Retrained {model_name} model with limit {limit}.")
-        else:
-            print(f"Model '{model_name}' not recognized.")
     except ValueError:
         print("Limit must be a valid integer.")
+        return
+
+    workers = None
+    if len(parts) == 5:
+        if not parts[4].isdigit() or int(parts[4]) < 1:
+            print("Workers must be a positive integer.")
+            return
+        workers = int(parts[4])
+
+    if model_name == "prep_time":
+        training_service.train_prep_time_model(limit, workers=workers)
+        print(f"Retrained {model_name} model with limit {limit}.")
+    elif model_name == "recommendation":
+        training_service.train_recommendation_model(limit, workers=workers)
+        print(f"Retrained {model_name} model with limit {limit}.")
+    else:
+        print(f"Model '{model_name}' not recognized.")
 
 def get_user_preferences():
     """Get user preferences for meal recommendations."""
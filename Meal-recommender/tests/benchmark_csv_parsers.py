@@ -0,0 +1,61 @@
+"""
+Throughput of the vectorized CSV parsers against the original row-wise ones.
+
+Run from the Meal-recommender directory: python tests/benchmark_csv_parsers.py [rows]
+"""
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from Backend.Data.Utils.csv_utils import parse_ISO_8601_duration_column, parse_r_vector_column
+import reference_parsers
+
+WORDS = ["flour", "sugar", "butter", "eggs", "milk", "vanilla extract", "baking soda", "salt",
+         "brown sugar", "lemon juice", "chicken breast", "olive oil", "garlic", "onion", "\"lite\" cream"]
+
+def make_r_vectors(rows: int, rng: random.Random) -> pd.Series:
+    def vector():
+        items = rng.sample(WORDS, rng.randint(1, 12))
+        return "c(" + ", ".join('"' + item.replace('"', '""') + '"' for item in items) + ")"
+    return pd.Series([vector() for _ in range(rows)], dtype=object)
+
+def make_durations(rows: int, rng: random.Random) -> pd.Series:
+    def duration():
+        hours, minutes = rng.randint(0, 5), rng.randint(0, 59)
+        return "PT" + (f"{hours}H" if hours else "") + (f"{minutes}M" if minutes or not hours else "")
+    return pd.Series([duration() if rng.random() > 0.05 else None for _ in range(rows)], dtype=object)
+
+def time_it(function, *args, repeat: int = 3) -> float:
+    """Best of `repeat` runs, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def report(name: str, rows: int, reference_seconds: float, vectorized_seconds: float):
+    print(f"{name:<16} row-wise {rows / reference_seconds:>12,.0f} rows/s   "
+          f"vectorized {rows / vectorized_seconds:>12,.0f} rows/s   "
+          f"speedup {reference_seconds / vectorized_seconds:.1f}x")
+
+def main(rows: int = 200000):
+    rng = random.Random(0)
+    r_vectors = make_r_vectors(rows, rng)
+    durations = make_durations(rows, rng)
+
+    report("R vectors", rows,
+           time_it(lambda: [reference_parsers.parse_r_vector(value) for value in r_vectors]),
+           time_it(parse_r_vector_column, r_vectors))
+    report("ISO durations", rows,
+           time_it(lambda: [reference_parsers.parse_ISO_8601_duration(value) for value in durations]),
+           time_it(parse_ISO_8601_duration_column, durations))
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,101 @@
+"""
+Latency of DataMerger.get_enriched_meals with serial and concurrent API calls,
+against a local stub of TheMealDB that answers every request after a fixed delay.
+
+Run from the Meal-recommender directory: python tests/benchmark_enrichment.py [latency_ms] [hits]
+"""
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Backend.Api.http_session import HttpTransport
+from Backend.Api.themealdb import MealDBAPI
+from Backend.Data.data_merger import DataMerger
+
+def make_handler(latency: float, hits: int):
+    class StubMealDBHandler(BaseHTTPRequestHandler):
+        """Answers searches with `hits` meals (overlapping between searches) and lookups with one meal."""
+
+        def do_GET(self):
+            time.sleep(latency)
+            url = urlparse(self.path)
+            params = parse_qs(url.query)
+
+            if url.path.endswith("lookup.php"):
+                meal_id = params["i"][0]
+                meals = [{
+                    "idMeal": meal_id, "strMeal": f"Meal {meal_id}", "strCategory": "Chicken",
+                    "strInstructions": "Cook it.", "strMealThumb": None,
+                    "strIngredient1": "Chicken", "strMeasure1": "1",
+                    "strIngredient2": "Garlic", "strMeasure2": "2 cloves"
+                }]
+            else:
+                # Each search returns a shifted window of ids, so results overlap and get deduplicated
+                offset = {"i": 0, "c": hits // 2, "a": hits}[next(iter(params))]
+                meals = [{"idMeal": str(offset + i), "strMeal": f"Meal {offset + i}", "strMealThumb": None}
+                         for i in range(hits)]
+
+            body = json.dumps({"meals": meals}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubMealDBHandler
+
+def make_price_csv(directory: str) -> str:
+    raw_dir = os.path.join(directory, "raw")
+    os.makedirs(raw_dir)
+    csv_path = os.path.join(raw_dir, "mercadona_products_latest.csv")
+    with open(csv_path, "w", encoding="utf-8") as f:
+        f.write("name,price,price_per_unit,category\n")
+        f.write('"Pollo entero",5.20,N/A,"Carne > Pollo"\n')
+        f.write('"Ajo morado",1.10,N/A,"Fruta y verdura > Verdura"\n')
+    return csv_path
+
+def time_search(merger: DataMerger, search_term: str, repeat: int = 3):
+    """Best of `repeat` searches, in seconds, and the meal ids found."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        meals = merger.get_enriched_meals(search_term)
+        timings.append(time.perf_counter() - start)
+    return min(timings), [meal.id for meal in meals]
+
+def main(latency_ms: float = 20, hits: int = 30):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(latency_ms / 1000, hits))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            csv_path = make_price_csv(directory)
+            results = {}
+            for workers in (1, 8):
+                # No response cache, so every search goes over the wire
+                meal_api = MealDBAPI(base_url=base_url, transport=HttpTransport(pool_size=workers))
+                merger = DataMerger(mercadona_csv_file_path=csv_path, max_workers=workers, meal_api=meal_api)
+                merger.price_processor.get_ingredient_price("chicken")  # Build the price index up front
+                results[workers] = time_search(merger, "chicken")
+    finally:
+        server.shutdown()
+
+    (serial_seconds, serial_ids), (concurrent_seconds, concurrent_ids) = results[1], results[8]
+    assert serial_ids == concurrent_ids, "Concurrent enrichment changed the results"
+    print(f"{len(serial_ids)} meals, {latency_ms:g} ms per request")
+    print(f"1 worker   {serial_seconds:.3f} s")
+    print(f"8 workers  {concurrent_seconds:.3f} s   speedup {serial_seconds / concurrent_seconds:.1f}x")
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 20, int(sys.argv[2]) if len(sys.argv) > 2 else 30)
@@ -0,0 +1,65 @@
+"""
+Feature extraction of a batch of meals, as the scoring pipeline and training run it
+(preprocessing plus both feature extractors), without a feature store, with an empty
+store, with every meal stored, and with a store bounded below the batch (every lookup
+misses and evicts).
+
+Run from the Meal-recommender directory: python tests/benchmark_feature_store.py [meals]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from Backend.Data.meal_feature_manager import MealFeatureManager
+from Backend.Data.Utils.feature_store import FeatureStore
+from benchmark_prep_time_features import make_meals
+
+def extract_features(manager: MealFeatureManager, meals):
+    preprocessed = manager.preprocess_meals(meals)
+    return (manager.get_prep_time_features(meals, preprocessed=preprocessed),
+            manager.get_recommendation_features(meals, preprocessed=preprocessed))
+
+def time_once(function) -> float:
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+def main(count: int = 20000):
+    meals = make_meals(count, random.Random(0))
+    for index, meal in enumerate(meals):
+        meal.id = str(index)
+    print(f"{count} meals")
+
+    without_store = MealFeatureManager(use_feature_store=False)
+    expected = extract_features(without_store, meals)
+    baseline = min(time_once(lambda: extract_features(without_store, meals)) for _ in range(3))
+    print(f"{'no store':<34} {baseline:.3f} s")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store = FeatureStore(os.path.join(temp_dir, "meal_features.db"))
+        manager = MealFeatureManager(feature_store=store)
+        cold = time_once(lambda: extract_features(manager, meals))
+        warm = min(time_once(lambda: extract_features(manager, meals)) for _ in range(3))
+        for stored, computed in zip(extract_features(manager, meals), expected):
+            pd.testing.assert_frame_equal(stored, computed)
+        size = os.path.getsize(store.db_path)
+        print(f"{'empty store':<34} {cold:.3f} s   ({cold / baseline:.1f}x the time without a store)")
+        print(f"{'every meal stored':<34} {warm:.3f} s   (speedup {baseline / warm:.1f}x)")
+        print(f"{'':<34} {store.count()} rows, {size / store.count():.0f} bytes a row")
+
+        bounded_store = FeatureStore(os.path.join(temp_dir, "bounded.db"), max_entries=count // 2)
+        bounded = MealFeatureManager(feature_store=bounded_store)
+        extract_features(bounded, meals)
+        churn = min(time_once(lambda: extract_features(bounded, meals)) for _ in range(3))
+        print(f"{'store bounded to half the batch':<34} {churn:.3f} s   "
+              f"({churn / baseline:.1f}x, {bounded_store.evictions} evictions)")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
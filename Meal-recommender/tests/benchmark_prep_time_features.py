@@ -0,0 +1,87 @@
+"""
+Prep-time feature extraction over a batch of training-like meals: the single automaton pass
+that counts prep keywords against one str.count scan per keyword, and the whole batch
+extractor against the original per-meal one, with the batch's text preprocessing shared
+with the recommendation features as in training, and on its own.
+
+Run from the Meal-recommender directory: python tests/benchmark_prep_time_features.py [meals]
+"""
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from Backend.Data.meal_preprocessing import preprocess_meals
+from Backend.Data.prep_time_extraction import PrepTimeFeatureExtractor
+from Backend.models.ingredient import Ingredient
+from Backend.models.meal import Meal
+import reference_features
+
+# Words of typical Food.com instructions, many containing prep keywords ("stirring", "baked", ...)
+INSTRUCTION_WORDS = (
+    "preheat the oven to 350 degrees in a large bowl combine flour sugar and salt add butter until crumbly "
+    "stir in eggs pour into pan bake for minutes or until golden let cool before serving chopped onions garlic "
+    "minced heat oil in skillet over medium cook stirring occasionally season with pepper whisk together sauce "
+    "simmer covered drain pasta toss with cheese sprinkle parsley on top serve warm slow cooker on low hours "
+    "slice thinly grated lemon zest boiling water sautéed mushrooms roasted vegetables mixture"
+).split()
+INGREDIENTS = ["onion", "garlic", "butter", "flour", "sugar", "eggs", "milk", "tomato", "carrot", "salt",
+               "chicken breast", "olive oil", "potato", "lemon", "pepper", "rice", "cheese", "celery"]
+KEYWORDS = ["Easy", "< 60 Mins", "Oven", "Beginner Cook", "Healthy", "mix", "bake", "Weeknight"]
+
+def make_meals(count: int, rng: random.Random):
+    return [
+        Meal(
+            id=None, name=f"Recipe {i}", category="Dessert",
+            instructions=" ".join(rng.choice(INSTRUCTION_WORDS) for _ in range(rng.randint(40, 250))).capitalize(),
+            ingredients=[Ingredient(name=name, amount=1) for name in rng.sample(INGREDIENTS, rng.randint(3, 12))],
+            keywords=rng.sample(KEYWORDS, rng.randint(0, 4)),
+            prep_time=rng.randint(5, 120)
+        )
+        for i in range(count)
+    ]
+
+def time_it(function, repeat: int = 3) -> float:
+    """Best of `repeat` runs, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def report(name: str, reference_seconds: float, batch_seconds: float):
+    print(f"{name:<32} original {reference_seconds:.3f} s   batch {batch_seconds:.3f} s   "
+          f"speedup {reference_seconds / batch_seconds:.1f}x")
+
+def main(count: int = 20000):
+    extractor = PrepTimeFeatureExtractor()
+    meals = make_meals(count, random.Random(0))
+    texts = [meal.instructions.lower() for meal in meals]
+    print(f"{count} meals, {sum(map(len, texts)) / count:.0f} instruction characters on average")
+
+    expected = [reference_features.count_prep_keywords(extractor.prep_keywords, text) for text in texts]
+    assert extractor.count_prep_keywords(texts).tolist() == expected
+    pd.testing.assert_frame_equal(reference_features.prep_time_features_dataframe(extractor, meals, include_target=True),
+                                  extractor.prepare_features_dataframe(meals, include_target=True),
+                                  check_dtype=False)  # The batch target column is float
+
+    report("keyword counts",
+           time_it(lambda: [reference_features.count_prep_keywords(extractor.prep_keywords, text) for text in texts]),
+           time_it(lambda: extractor.count_prep_keywords(texts)))
+
+    # Training preprocesses each batch once for both feature extractors (see MealModelManager)
+    reference_seconds = time_it(lambda: reference_features.prep_time_features_dataframe(extractor, meals, include_target=True))
+    preprocessed = preprocess_meals(meals)
+    report("features (shared preprocessing)", reference_seconds,
+           time_it(lambda: extractor.prepare_features_dataframe(meals, include_target=True, preprocessed=preprocessed)))
+    report("features (standalone)", reference_seconds,
+           time_it(lambda: extractor.prepare_features_dataframe(meals, include_target=True)))
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,84 @@
+"""
+Ingredient price lookups through PriceIndex against the original linear scan over the price cache.
+
+Runs 500k lookups against the price cache built from the scraped Mercadona CSV, and
+against synthetic caches the size of a catalogue with more translated products.
+Lookups go straight to the index, without the LRU memo MercadonaCSVProcessor puts in front.
+
+Run from the Meal-recommender directory: python tests/benchmark_price_index.py [lookups]
+"""
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from Backend.Data.csv_processor import MercadonaCSVProcessor
+from Backend.Data.Utils.price_index import PriceIndex
+from reference_lookups import linear_price_lookup
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MERCADONA_CSV = os.path.join(PROJECT_ROOT, "data", "raw", "mercadona_products_latest.csv")
+
+# Ingredient names as they appear in TheMealDB and Food.com recipes
+INGREDIENTS = ["chicken", "chicken breast", "olive oil", "garlic", "onion", "salt", "black pepper", "butter",
+               "sugar", "brown sugar", "flour", "eggs", "milk", "heavy cream", "parmesan cheese", "tomato",
+               "tomato paste", "rice", "pasta", "lemon juice", "soy sauce", "honey", "cinnamon", "paprika",
+               "ground beef", "pork", "salmon", "shrimp", "potato", "carrot", "celery", "spinach", "basil",
+               "parsley", "vanilla extract", "baking soda", "baking powder", "water", "red wine", "yogurt"]
+
+def load_catalogue_prices() -> dict:
+    # Build into a scratch cache directory so the benchmark never touches data/cache
+    with tempfile.TemporaryDirectory() as cache_dir:
+        processor = MercadonaCSVProcessor(MERCADONA_CSV, cache_dir=cache_dir)
+        processor.get_ingredient_price("salt")
+        return dict(processor._price_cache)
+
+def make_synthetic_prices(size: int, rng: random.Random) -> dict:
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(size)]
+    names = {" ".join(rng.sample(words, rng.randint(1, 3))) for _ in range(size)}
+    return {name: round(rng.uniform(0.5, 20), 2) for name in names}
+
+def make_queries(prices: dict, lookups: int, rng: random.Random) -> list:
+    # Recipe ingredients, plus cached names and fragments of them so lookups also hit
+    names = list(prices)
+    fragments = [name[:max(3, len(name) // 2)] for name in names]
+    pool = INGREDIENTS + names[:len(INGREDIENTS)] + fragments[:len(INGREDIENTS)]
+    return [rng.choice(pool) for _ in range(lookups)]
+
+def time_it(function, repeat: int = 3) -> float:
+    """Best of `repeat` runs, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def report(name: str, prices: dict, queries: list):
+    index = PriceIndex(prices)
+    assert [index.lookup(query) for query in queries[:20000]] == [linear_price_lookup(prices, query) for query in queries[:20000]]
+
+    build_seconds = time_it(lambda: PriceIndex(prices))
+    linear_seconds = time_it(lambda: [linear_price_lookup(prices, query) for query in queries], repeat=1)  # Slow
+    index_seconds = time_it(lambda: [index.lookup(query) for query in queries])
+    print(f"{name:<22} {len(prices):>6} names   linear {linear_seconds:>7.2f} s   index {index_seconds:>6.2f} s "
+          f"(+{build_seconds * 1000:.0f} ms build)   speedup {linear_seconds / index_seconds:.1f}x")
+
+def main(lookups: int = 500000):
+    rng = random.Random(0)
+    print(f"{lookups:,} lookups")
+
+    catalogue_prices = load_catalogue_prices()
+    report("Mercadona catalogue", catalogue_prices, make_queries(catalogue_prices, lookups, rng))
+
+    for size in (500, 2000):
+        prices = make_synthetic_prices(size, rng)
+        report("Synthetic", prices, make_queries(prices, lookups, rng))
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500000)
@@ -0,0 +1,43 @@
+"""
+The original per-meal feature extraction the batch extractors replaced, kept as the
+reference they are checked and benchmarked against.
+"""
+import pandas as pd
+
+def count_prep_keywords(prep_keywords, instruction_text: str) -> int:
+    """The original keyword count: one str.count scan of the instructions per keyword."""
+    return sum(instruction_text.count(keyword) for keyword in prep_keywords)
+
+def prep_time_features_dataframe(extractor, meals, include_target: bool = False) -> pd.DataFrame:
+    """The original PrepTimeFeatureExtractor.prepare_features_dataframe, one dict per meal."""
+    features = []
+    for meal in meals:
+        instruction_text = meal.instructions.lower() if meal.instructions else ""
+        fresh_count = sum(
+            ingredient.name.lower() in extractor.fresh_ingredients
+            for ingredient in meal.ingredients
+        )
+        fresh_ratio = fresh_count / len(meal.ingredients) if meal.ingredients else 0
+
+        keyword_count = count_prep_keywords(extractor.prep_keywords, instruction_text)
+        if hasattr(meal, 'keywords') and meal.keywords:
+            keyword_count += sum(meal.keywords.count(keyword) for keyword in extractor.prep_keywords)
+
+        feature = {
+            "ingredient_count": len(meal.ingredients),
+            "instruction_length": len(instruction_text.split()),
+            "prep_keyworks_count": keyword_count,
+            "fresh_ratio": fresh_ratio
+        }
+        if hasattr(meal, 'prep_time') and meal.prep_time is not None:
+            feature["prep_time_target"] = meal.prep_time
+        features.append(feature)
+
+    if not features:
+        return pd.DataFrame()
+
+    df = pd.DataFrame(features)
+    feature_columns = ["ingredient_count", "instruction_length", "prep_keyworks_count", "fresh_ratio"]
+    if include_target and "prep_time_target" in df.columns:
+        return df[feature_columns + ["prep_time_target"]].fillna(0)
+    return df[feature_columns].fillna(0)
@@ -0,0 +1,38 @@
+"""
+The original linear-scan lookups the indexed and compiled matchers replaced, kept as
+the reference they are checked and benchmarked against.
+"""
+
+def linear_price_lookup(prices: dict, query: str):
+    """The original MercadonaCSVProcessor.get_ingredient_price scan over the price cache."""
+    if query in prices:
+        return prices[query]
+    for cached_name, price in prices.items():
+        if query in cached_name or cached_name in query:
+            return price
+    return None
+
+def dict_scan_translate(translator, ingredient: str):
+    """
+    The original IngredientTranslator._translate_from_spanish, which returned the first
+    mapped term (in dict order) contained in the ingredient.
+    """
+    spanish_to_english = translator.spanish_to_english
+    clean_ingredient = ingredient.lower().strip()
+
+    if clean_ingredient in spanish_to_english:
+        return spanish_to_english[clean_ingredient]
+
+    for spanish_term, english_term in spanish_to_english.items():
+        if spanish_term in clean_ingredient:
+            return english_term
+
+    clean_ingredient = translator._remove_descriptors(clean_ingredient)
+    if clean_ingredient in spanish_to_english:
+        return spanish_to_english[clean_ingredient]
+
+    for spanish_term, english_term in spanish_to_english.items():
+        if spanish_term in clean_ingredient:
+            return english_term
+
+    return None
@@ -0,0 +1,86 @@
+"""
+The original row-wise parsers of Backend/Data/Utils/csv_utils.py, kept as the
+reference the vectorized parsers are checked and benchmarked against.
+"""
+import re
+import pandas as pd
+
+def parse_r_vector(r_string):
+    """Character-by-character R c() vector parser."""
+    if not r_string or pd.isna(r_string):
+        return []
+
+    r_string = str(r_string).strip()
+
+    if not (r_string.startswith('c(') and r_string.endswith(')')):
+        return []
+
+    content = r_string[2:-1]
+
+    if not content.strip():
+        return []
+
+    ingredients = []
+    current_item = ""
+    in_quotes = False
+    quote_char = None
+
+    i = 0
+    while i < len(content):
+        char = content[i]
+
+        if not in_quotes:
+            if char in ['"', "'"]:
+                in_quotes = True
+                quote_char = char
+            elif char == ',' and not in_quotes:
+                item = current_item.strip()
+                if item:
+                    ingredients.append(item)
+                current_item = ""
+            else:
+                current_item += char
+        else:
+            if char == quote_char:
+                if i + 1 < len(content) and content[i + 1] == quote_char:
+                    current_item += char
+                    i += 1
+                else:
+                    in_quotes = False
+                    quote_char = None
+            else:
+                current_item += char
+
+        i += 1
+
+    item = current_item.strip()
+    if item:
+        ingredients.append(item)
+
+    cleaned_ingredients = []
+    for ing in ingredients:
+        ing = ing.strip()
+        if (ing.startswith('"') and ing.endswith('"')) or (ing.startswith("'") and ing.endswith("'")):
+            ing = ing[1:-1]
+        cleaned_ingredients.append(ing.strip())
+
+    return cleaned_ingredients
+
+def parse_ISO_8601_duration(duration: str) -> int:
+    """Hours and minutes of a 'PT..H..M' duration; days are not supported."""
+    if not duration or pd.isna(duration):
+        return 0
+
+    content = duration[2:]
+
+    total_minutes = 0
+
+    hour_match = re.search(r'(\d+)H', content)
+    if hour_match:
+        total_minutes += int(hour_match.group(1)) * 60
+
+    minute_match = re.search(r'(\d+)M', content)
+    if minute_match:
+        total_minutes += int(minute_match.group(1))
+
+    return total_minutes
@@ -0,0 +1,52 @@
+"""
+The original per-user score boosting the sparse multi-user boosts replaced, kept as the
+reference they are checked against.
+"""
+import numpy as np
+
+def mask_score_boost(model, df, feature_columns, feature_preferences, boost_amount=0.4):
+    """
+    The original LogisticRegressionModel.predict_with_score_boost, which built a mask over
+    every row for each preferred value of one user.
+    """
+    X = df[feature_columns].copy()
+    for col in X.columns:
+        if X[col].dtype in ['int64', 'float64', 'int32', 'float32']:
+            X[col] = X[col].fillna(X[col].median())
+        else:
+            X[col] = X[col].fillna('unknown')
+
+    _, baseline_probs = model._get_scorer().predict({col: X[col].to_numpy() for col in X.columns})
+    if feature_preferences is None or len(feature_preferences) == 0:
+        return (baseline_probs > 0.5).astype(int), baseline_probs
+
+    boosted_probs = baseline_probs.copy()
+    for feature_name, preference_values in feature_preferences.items():
+        if feature_name not in X.columns:
+            continue
+        feature_values = X[feature_name]
+
+        if isinstance(preference_values, list):
+            value_weights = {str(val): 2.0 for val in preference_values}
+        elif isinstance(preference_values, dict):
+            value_weights = preference_values
+        else:
+            value_weights = {str(preference_values): 3.0}
+
+        for target_value, weight in value_weights.items():
+            if X[feature_name].dtype in ['object', 'category']:
+                exact_matches = (feature_values == target_value)
+                contains_matches = feature_values.astype(str).str.lower().str.contains(
+                    str(target_value).lower(), na=False)
+                mask = exact_matches | contains_matches
+            else:
+                mask = (feature_values == target_value)
+
+            matching_rows = np.where(mask)[0]
+            if weight > 1.0:
+                boosted_probs[matching_rows] += boost_amount * (weight - 1.0)
+            elif weight < 1.0:
+                boosted_probs[matching_rows] -= boost_amount * (1.0 - weight)
+
+    boosted_probs = np.clip(boosted_probs, 0, 1)
+    return (boosted_probs > 0.5).astype(int), boosted_probs
@@ -0,0 +1,22 @@
+from Backend.Data.Utils.cache_utils import build_cache_key
+from Backend.Data.Utils.feature_store import FeatureStore
+from Backend.models.ingredient import Ingredient
+from Backend.models.meal import Meal
+
+def make_meal(instructions, ingredient_names, keywords=None):
+    ingredients = [Ingredient(name=name, amount=1, price_per_unit=None) for name in ingredient_names]
+    return Meal(id=1, name="Meal", category="Beef", instructions=instructions, ingredients=ingredients,
+                keywords=keywords)
+
+def test_build_cache_key_separators_do_not_collide():
+    assert build_cache_key("a|b", "c") != build_cache_key("a", "b|c")
+    assert build_cache_key(["a", "b"], "c") != build_cache_key(["a"], "b", "c")
+
+def test_feature_store_keys_do_not_collide():
+    assert FeatureStore.build_key(make_meal("x", ["a\x1fb"]), 1) != FeatureStore.build_key(make_meal("x", ["a", "b"]), 1)
+    assert FeatureStore.build_key(make_meal("x|", ["a"]), 1) != FeatureStore.build_key(make_meal("x", ["|a"]), 1)
+    assert FeatureStore.build_key(make_meal("x", ["a"], ["k"]), 1) != FeatureStore.build_key(make_meal("x", ["a", "k"]), 1)
+
+def test_feature_store_key_is_stable():
+    assert FeatureStore.build_key(make_meal("x", ["a"]), 1) == FeatureStore.build_key(make_meal("x", ["a"]), 1)
+    assert FeatureStore.build_key(make_meal("x", ["a"]), 1) != FeatureStore.build_key(make_meal("x", ["a"]), 2)
@@ -0,0 +1,60 @@
+import os
+
+import pytest
+
+from Backend.Data.csv_processor import MercadonaCSVProcessor
+
+PRODUCTS = [
+    ("Aceite de oliva virgen extra Hacendado", "4.20"),
+    ("Zanahorias Hacendado", "0.99"),
+    ("Aceite de girasol Hacendado", "2.10"),
+    ("Ajo morado", "1.10"),
+]
+
+def write_csv(path, products):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("name,price,price_per_unit,category\n")
+        for name, price in products:
+            f.write(f'"{name}",{price},N/A,"Category"\n')
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "mercadona_products_latest.csv"
+    write_csv(path, PRODUCTS)
+    return str(path)
+
+def test_price_artifact_round_trip_keeps_cache_order(csv_path, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    built = MercadonaCSVProcessor(csv_path, cache_dir=cache_dir)
+    built.get_ingredient_price("oil")
+    assert any(name.endswith(".npy") for name in os.listdir(cache_dir))
+
+    # A warm start maps the artifact instead of parsing and translating the CSV
+    monkeypatch.setattr(MercadonaCSVProcessor, "_build_price_cache",
+                        lambda self: pytest.fail("the price cache was rebuilt"))
+    loaded = MercadonaCSVProcessor(csv_path, cache_dir=cache_dir)
+
+    assert loaded.get_ingredient_price("oil") == built.get_ingredient_price("oil")
+    assert list(loaded._price_cache.items()) == list(built._price_cache.items())
+    assert list(loaded._price_cache) != sorted(loaded._price_cache)  # Not stored sorted
+
+def test_changed_csv_rebuilds_the_price_artifact(csv_path, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    MercadonaCSVProcessor(csv_path, cache_dir=cache_dir).get_ingredient_price("garlic")
+
+    write_csv(csv_path, PRODUCTS + [("Pechuga de pollo", "5.20")])
+    processor = MercadonaCSVProcessor(csv_path, cache_dir=cache_dir)
+
+    assert processor.get_ingredient_price("chicken breast") == pytest.approx(5.20)
+    assert len([name for name in os.listdir(cache_dir) if name.endswith(".npy")]) == 1
+
+def test_only_reloads_change_the_index_version(csv_path, tmp_path):
+    processor = MercadonaCSVProcessor(csv_path, cache_dir=str(tmp_path / "cache"))
+    assert processor.get_index_version() == 0
+
+    processor.get_ingredient_price("garlic")  # The initial load
+    assert processor.get_index_version() == 0
+
+    write_csv(csv_path, PRODUCTS + [("Pechuga de pollo", "5.20")])
+    assert processor.reload_prices()
+    assert processor.get_index_version() == 1
@@ -0,0 +1,67 @@
+import pandas as pd
+import pytest
+
+hypothesis = pytest.importorskip("hypothesis")
+from hypothesis import given, settings, strategies as st
+
+from Backend.Data.Utils.csv_utils import (
+    parse_ISO_8601_duration, parse_ISO_8601_duration_column, parse_r_vector,
+    parse_r_vector_column, parse_r_vector_to_string, parse_r_vector_to_string_column
+)
+import reference_parsers
+
+# Vector contents built from the characters the tokenizer treats specially
+r_vector_contents = st.text(alphabet=st.sampled_from(list('ab ,"\'c()')), max_size=40)
+r_vectors = st.one_of(
+    r_vector_contents.map(lambda content: f"c({content})"),
+    r_vector_contents,  # Not a vector at all
+    st.lists(st.text(max_size=12), max_size=6).map(
+        lambda items: "c(" + ", ".join('"' + item.replace('"', '""') + '"' for item in items) + ")"
+    ),
+    st.none()
+)
+
+def iso_durations(with_days: bool):
+    number = st.integers(min_value=0, max_value=999).map(str)
+    optional = lambda unit: st.one_of(st.just(""), number.map(lambda value: value + unit))
+    days = optional("D") if with_days else st.just("")
+    return st.tuples(days, optional("H"), optional("M"), optional("S")).map(
+        lambda parts: f"P{parts[0]}T{''.join(parts[1:])}"
+    )
+
+@settings(max_examples=2000)
+@given(r_vectors)
+def test_parse_r_vector_matches_reference(r_string):
+    assert parse_r_vector(r_string) == reference_parsers.parse_r_vector(r_string)
+
+@given(st.lists(r_vectors, max_size=30))
+def test_parse_r_vector_columns_match_reference(r_strings):
+    column = pd.Series(r_strings, dtype=object)
+    expected = [reference_parsers.parse_r_vector(r_string) for r_string in r_strings]
+
+    assert parse_r_vector_column(column).tolist() == expected
+    assert parse_r_vector_to_string_column(column).tolist() == [' '.join(items) for items in expected]
+    assert parse_r_vector_to_string_column(column).tolist() == [parse_r_vector_to_string(value) for value in r_strings]
+
+def test_parse_r_vector_column_does_not_share_lists():
+    parsed = parse_r_vector_column(pd.Series(['c("a")', 'c("a")'], dtype=object))
+    parsed[0].append("b")
+    assert parsed[1] == ["a"]
+
+@given(st.lists(iso_durations(with_days=False), max_size=30))
+def test_parse_ISO_8601_duration_column_matches_reference(durations):
+    expected = [reference_parsers.parse_ISO_8601_duration(duration) for duration in durations]
+
+    assert [parse_ISO_8601_duration(duration) for duration in durations] == expected
+    assert parse_ISO_8601_duration_column(pd.Series(durations, dtype=object)).tolist() == expected
+
+@given(st.lists(st.one_of(iso_durations(with_days=True), st.text(alphabet='PTDHMS0129', max_size=10), st.none()),
+                max_size=30))
+def test_parse_ISO_8601_duration_column_matches_row_wise(durations):
+    # Days (added with CookTime/TotalTime) are not in the reference, so compare to the row-wise parser
+    expected = [parse_ISO_8601_duration(duration) for duration in durations]
+    assert parse_ISO_8601_duration_column(pd.Series(durations, dtype=object)).tolist() == expected
+
+def test_parse_ISO_8601_duration_counts_days():
+    assert parse_ISO_8601_duration("P1DT2H30M") == 1440 + 150
+    assert parse_ISO_8601_duration_column(pd.Series(["P1DT2H30M", None, "PT45M"])).tolist() == [1590, 0, 45]
@@ -0,0 +1,78 @@
+import sqlite3
+
+import pandas as pd
+
+from Backend.Data.Utils import feature_store
+from Backend.Data.meal_feature_manager import MealFeatureManager
+from Backend.Data.Utils.feature_store import FeatureStore
+from Backend.models.ingredient import Ingredient
+from Backend.models.meal import Meal
+
+def make_meals():
+    return [
+        Meal(id="1", name="Stew", category="Beef", ingredients=[Ingredient("Onion", 1), Ingredient("Beef", 1)],
+             instructions="Chop the onion. Simmer overnight in a slow cooker; stir.", keywords=["Stir"]),
+        Meal(id="2", name="Pasta", category="Pasta", ingredients=[Ingredient("pasta", 1), Ingredient("basil", 1)],
+             instructions="Boil the pasta, toss with basil and cheese."),
+        Meal(id="3", name="Salad", category="Vegetarian", ingredients=[Ingredient("tomato", 1)],
+             instructions="Slice and mix."),
+    ]
+
+def test_default_store_lives_in_the_project_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(feature_store, "get_project_cache_dir", lambda: str(tmp_path))
+    assert FeatureStore().db_path == str(tmp_path / "meal_features.db")
+    assert MealFeatureManager().feature_store.db_path == str(tmp_path / "meal_features.db")
+
+def test_store_evicts_the_least_recently_used_entries(tmp_path):
+    store = FeatureStore(str(tmp_path / "features.db"), max_entries=3)
+    store.set_many({"a": {"x": 1}, "b": {"x": 2}, "c": {"x": 3}}, "ns")
+    store._conn.execute("UPDATE features SET last_access = 0 WHERE key = 'a'")  # Older than the others
+    store._conn.execute("UPDATE features SET last_access = 1 WHERE key IN ('b', 'c')")
+    store.get_many(["a"], "ns")  # Reading 'a' makes 'b' the least recently used
+
+    store.set_many({"d": {"x": 4}}, "ns")
+
+    assert store.count() == 3
+    assert set(store.get_many(["a", "b", "c", "d"], "ns")) == {"a", "c", "d"}
+    assert store.get_stats()['evictions'] == 1
+
+def test_stores_without_access_times_are_migrated(tmp_path):
+    db_path = str(tmp_path / "features.db")
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE features (namespace TEXT, key TEXT, features TEXT, created_at REAL, "
+                     "PRIMARY KEY (namespace, key))")
+        conn.execute("""INSERT INTO features VALUES ('ns', 'a', '{"x": 1}', 5)""")
+
+    store = FeatureStore(db_path, max_entries=1)
+    assert store.get_many(["a"], "ns") == {"a": {"x": 1}}
+    store.set_many({"b": {"x": 2}}, "ns")
+    assert store.get_many(["a", "b"], "ns") == {"b": {"x": 2}}
+
+def test_stored_features_skip_preprocessing(tmp_path):
+    manager = MealFeatureManager(feature_store=FeatureStore(str(tmp_path / "features.db")))
+    expected = MealFeatureManager(use_feature_store=False)
+    meals = make_meals()
+
+    first = manager.preprocess_meals(meals)
+    manager.get_prep_time_features(meals, preprocessed=first)
+    manager.get_recommendation_features(meals[:2], preprocessed=first[:2])
+    assert first.count_preprocessed() == 3
+
+    # Every feature is stored now, except the recommendation features of the last meal
+    preprocessed = manager.preprocess_meals(meals)
+    prep_time_features = manager.get_prep_time_features(meals, preprocessed=preprocessed)
+    assert preprocessed.count_preprocessed() == 0
+    recommendation_features = manager.get_recommendation_features(meals, preprocessed=preprocessed)
+    assert preprocessed.count_preprocessed() == 1
+
+    pd.testing.assert_frame_equal(prep_time_features, expected.get_prep_time_features(meals))
+    pd.testing.assert_frame_equal(recommendation_features, expected.get_recommendation_features(meals))
+
+def test_selected_meals_keep_their_preprocessing():
+    preprocessed = MealFeatureManager(use_feature_store=False).preprocess_meals(make_meals())
+    stew = preprocessed[0]
+
+    selected = preprocessed.select([2, 0])
+    assert selected.meals[1].name == "Stew"
+    assert selected[1] is stew
+    assert selected.count_preprocessed() == 1
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.pipeline import Pipeline
+
+from Backend.Recommender.logistic_regression import LogisticRegressionModel
+import reference_scoring
+
+FEATURE_COLUMNS = ["ingredient_count", "complexity_score", "prep_time", "type_of_meal", "is_vegetarian", "has_dairy"]
+
+def make_training_frame(rows: int = 200) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "ingredient_count": rng.integers(1, 20, rows),
+        "complexity_score": rng.integers(0, 11, rows),
+        "prep_time": rng.uniform(5, 120, rows),
+        "type_of_meal": rng.choice(["italian", "mexican", "indian", "asian"], rows),
+        "is_vegetarian": rng.random(rows) < 0.4,
+        "has_dairy": rng.random(rows) < 0.5,
+    })
+    signal = (0.1 * df["ingredient_count"] - 0.02 * df["prep_time"] + df["is_vegetarian"]
+              + (df["type_of_meal"] == "italian") + rng.normal(0, 1, rows))
+    df["is_recommended"] = (signal > signal.median()).astype(int)
+    return df
+
+@pytest.fixture(scope="module", params=["train_model", "train_model_with_sgd"])
+def trained(request):
+    df = make_training_frame()
+    model = LogisticRegressionModel()
+    getattr(model, request.param)(df, FEATURE_COLUMNS, "is_recommended")
+    return model, df
+
+def test_compiled_scorer_matches_the_sklearn_pipeline(trained):
+    model, df = trained
+    pipeline = Pipeline([("preprocessor", model.preprocessor), ("model", model.model)])
+
+    predictions, probabilities = model.predict(df)
+
+    X = df[FEATURE_COLUMNS]
+    assert np.allclose(probabilities, pipeline.predict_proba(X)[:, 1])
+    assert np.array_equal(predictions, pipeline.predict(X))
+
+def test_bool_columns_are_scored_as_categories(trained):
+    model, df = trained
+    scorer = model.compile()
+
+    assert {"is_vegetarian", "has_dairy"} <= set(scorer.categorical_columns)
+    assert "is_vegetarian" not in scorer.numeric_columns
+
+    flipped = df.assign(is_vegetarian=~df["is_vegetarian"])
+    pipeline = Pipeline([("preprocessor", model.preprocessor), ("model", model.model)])
+    assert np.allclose(model.predict(flipped)[1], pipeline.predict_proba(flipped[FEATURE_COLUMNS])[:, 1])
+
+def test_unknown_category_is_an_error(trained):
+    model, df = trained
+    with pytest.raises(ValueError, match="unknown category 'french' in column 'type_of_meal'"):
+        model.predict(df.head(3).assign(type_of_meal=["italian", "french", "asian"]))
+
+USERS_PREFERENCES = [
+    {"type_of_meal": ["ital", "mexican"]},  # 'ital' matches 'italian' as a regex
+    {"type_of_meal": {"asian": 0.5, "indian": 1.5}, "is_vegetarian": {True: 1.5}},
+    {"type_of_meal": "indian", "has_dairy": {False: 0.2}},
+    {"type_of_meal": ["italian", "ITALIAN"], "missing_feature": ["x"]},  # Boosts of both values add up
+    {},
+    None,
+]
+
+def test_many_user_boosts_match_each_user_boosted_alone(trained):
+    model, df = trained
+    predictions, probabilities = model.predict_with_score_boost_many(df, FEATURE_COLUMNS, USERS_PREFERENCES)
+    assert probabilities.shape == (len(df), len(USERS_PREFERENCES))
+    assert not np.allclose(probabilities[:, 0], probabilities[:, 4])  # Boosts were applied
+
+    for column, preferences in enumerate(USERS_PREFERENCES):
+        user_predictions, user_probabilities = model.predict_with_score_boost(df, FEATURE_COLUMNS, preferences)
+        assert np.array_equal(predictions[:, column], user_predictions)
+        assert np.allclose(probabilities[:, column], user_probabilities)
+
+        # The original per-user masks over every row
+        reference_predictions, reference_probabilities = reference_scoring.mask_score_boost(
+            model, df, FEATURE_COLUMNS, preferences)
+        assert np.allclose(probabilities[:, column], reference_probabilities)
+        assert np.array_equal(predictions[:, column], reference_predictions)
@@ -0,0 +1,89 @@
+import json
+import os
+
+from Backend.Data.meal_catalog_mirror import MealCatalogMirror
+
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "themealdb_meals.json")
+
+class FixtureMealDBAPI:
+    """Answers the MealDBAPI calls a sync makes from the fixture's lookup payloads."""
+
+    def __init__(self, failing_ids=()):
+        with open(FIXTURE_PATH, 'r', encoding='utf-8') as f:
+            self.meals = json.load(f)['meals']
+        self.failing_ids = set(failing_ids)
+
+    def without_cache(self):
+        return self
+
+    def list_categories(self):
+        return sorted({meal['strCategory'] for meal in self.meals})
+
+    def list_areas(self):
+        return sorted({meal['strArea'] for meal in self.meals})
+
+    def list_ingredients(self):
+        return []  # Like an ingredient list that failed to load
+
+    def search_by_category(self, category):
+        return [self._summary(meal) for meal in self.meals if meal['strCategory'] == category]
+
+    def search_by_area(self, area):
+        return [self._summary(meal) for meal in self.meals if meal['strArea'] == area]
+
+    def search_by_ingredient(self, ingredient):
+        return []
+
+    def get_meal_details(self, meal_id):
+        if meal_id in self.failing_ids:
+            raise ConnectionError("lookup failed")
+        return next(meal for meal in self.meals if meal['idMeal'] == meal_id)
+
+    def _summary(self, meal):
+        return {'idMeal': meal['idMeal'], 'strMeal': meal['strMeal'], 'strMealThumb': meal['strMealThumb']}
+
+def test_from_fixture_answers_searches():
+    mirror = MealCatalogMirror.from_fixture(FIXTURE_PATH)
+
+    assert mirror.is_synced()
+    assert mirror.meal_count() == 3
+    assert [meal['strMeal'] for meal in mirror.search_by_category('chicken')] == ['Teriyaki Chicken Casserole']
+    assert [meal['idMeal'] for meal in mirror.search_by_area('British')] == ['52874', '52959']
+    assert [meal['idMeal'] for meal in mirror.search_by_ingredient('brown_sugar')] == ['52772']
+    assert mirror.get_meal_details('52959')['strIngredient3'] == 'Salmon'
+    assert mirror.get_meal_details('1') is None
+
+def test_sync_reads_meals_back():
+    mirror = MealCatalogMirror(db_path=':memory:', meal_api=FixtureMealDBAPI())
+
+    stats = mirror.sync(walk_ingredients=False)
+
+    assert stats['completed']
+    assert stats['fetched'] == 3
+    assert mirror.is_synced()
+    assert mirror.get_meal_details('52874')['strMeal'] == 'Beef and Mustard Pie'
+    assert [meal['idMeal'] for meal in mirror.search_by_ingredient('Mustard')] == ['52874']
+
+def test_incomplete_sync_is_not_marked_synced():
+    mirror = MealCatalogMirror(db_path=':memory:', meal_api=FixtureMealDBAPI(failing_ids={'52959'}))
+
+    stats = mirror.sync(walk_ingredients=False)
+
+    assert not stats['completed']
+    assert stats['failed'] == 1
+    assert not mirror.is_synced()
+
+    # An incremental retry only fetches the missing meal and completes the sync
+    mirror.meal_api.failing_ids.clear()
+    stats = mirror.sync(walk_ingredients=False)
+    assert stats['completed'] and stats['fetched'] == 1
+    assert mirror.is_synced()
+
+def test_sync_with_a_failed_listing_is_not_marked_synced():
+    mirror = MealCatalogMirror(db_path=':memory:', meal_api=FixtureMealDBAPI())
+
+    stats = mirror.sync(walk_ingredients=True)  # The ingredient list comes back empty
+
+    assert stats['listing_errors'] == 1
+    assert not stats['completed']
+    assert not mirror.is_synced()
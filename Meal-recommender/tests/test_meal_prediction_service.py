@@ -0,0 +1,76 @@
+import pytest
+
+pytest.importorskip("matplotlib")  # Imported by the prep-time model the service loads
+
+from Backend.Data.csv_processor import MercadonaCSVProcessor
+from Backend.Data.Utils.recommendation_cache import RecommendationCache
+from Backend.Services.meal_prediction_service import MealPredictionService
+from Backend.models.user import User
+from test_csv_processor import PRODUCTS, write_csv
+from test_meal_scoring_pipeline import USERS, make_meals, pipeline  # noqa: F401 (fixture)
+
+class StubDataManager:
+    """Serves the test meals, priced with a real Mercadona price index like MealDataManager."""
+
+    def __init__(self, price_processor: MercadonaCSVProcessor):
+        self.price_processor = price_processor
+        self.random_meals = iter(make_meals(200))
+        self.random_fetches = 0
+
+    def get_enriched_meals(self, search_term: str) -> list:
+        meals = make_meals()
+        for meal in meals:
+            prices = self.price_processor.get_ingredient_prices([ingredient.name for ingredient in meal.ingredients])
+            meal.estimated_cost = sum(price for price in prices if price is not None)
+        return meals
+
+    def get_random_enriched_meal(self):
+        self.random_fetches += 1
+        return next(self.random_meals)
+
+    def get_data_version(self) -> tuple:
+        return self.price_processor.get_index_version(), None
+
+@pytest.fixture
+def service(pipeline, tmp_path):
+    csv_path = tmp_path / "mercadona_products_latest.csv"
+    write_csv(csv_path, PRODUCTS)
+
+    # Built without __init__, which loads (or trains) the saved models
+    service = MealPredictionService.__new__(MealPredictionService)
+    service.data_merger = StubDataManager(MercadonaCSVProcessor(str(csv_path), cache_dir=str(tmp_path / "cache")))
+    service.scoring_pipeline = pipeline
+    service.recommendation_cache = RecommendationCache()
+    service.model_version = 1
+    service._reload_models_if_changed = lambda: None
+    return service
+
+def test_the_first_search_after_startup_is_cached(service):
+    user = USERS[0]
+    first = service.get_enriched_meal_user_preferences("pasta", user, top_k=3)  # Loads the price index
+    second = service.get_enriched_meal_user_preferences("pasta", user, top_k=3)
+
+    assert [meal.id for meal in second] == [meal.id for meal in first]
+    assert service.get_recommendation_cache_stats()['hits'] == 1
+
+def test_random_meals_are_served_from_a_scored_pool(service):
+    user = USERS[1]
+    served = [service.get_random_enriched_meals_user_preferences(5, user) for _ in range(MealPredictionService.RANDOM_POOL_REQUESTS)]
+
+    assert service.data_merger.random_fetches == 5 * MealPredictionService.RANDOM_POOL_REQUESTS  # One pool
+    ids = [meal.id for meals in served for meal in meals]
+    assert len(ids) == len(set(ids)) == 20  # No meal is served twice
+    for meals in served:
+        scores = [meal.recommendation_score for meal in meals]
+        assert scores == sorted(scores, reverse=True)
+
+    best = service.get_random_enriched_meals_user_preferences(5, user, top_k=1)  # The pool is used up
+    assert service.data_merger.random_fetches == 40
+    assert len(best) == 1 and best[0].id not in ids
+
+def test_random_pool_is_dropped_when_preferences_change(service):
+    user = User(id=7, prefered_types=["italian"], prefered_flavors=[])
+    service.get_random_enriched_meals_user_preferences(5, user)
+    service.invalidate_user_recommendations(user.id)
+    service.get_random_enriched_meals_user_preferences(5, user)
+    assert service.data_merger.random_fetches == 40
@@ -0,0 +1,96 @@
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from Backend.Data.meal_feature_manager import MealFeatureManager
+from Backend.Recommender.logistic_regression import LogisticRegressionModel
+from Backend.Services.meal_scoring_pipeline import MealScoringPipeline
+from Backend.models.ingredient import Ingredient
+from Backend.models.meal import Meal
+from Backend.models.user import User
+
+TYPES = ["italian", "mexican", "indian", "asian", "american"]
+FLAVORS = ["sweet", "savory", "sour", "spicy", "comfort"]
+INGREDIENTS = ["pasta", "tomato", "basil", "tortilla", "beans", "avocado", "curry", "lentils", "rice", "soy sauce",
+               "tofu", "noodles", "burger", "bacon", "potato", "sugar", "chocolate", "lemon", "chili", "cheese",
+               "butter", "bread", "flour", "chicken", "beef", "ginger", "yogurt", "cinnamon"]
+WORDS = "chop stir bake simmer mix whisk slice boil fry roast season serve overnight slow cooker".split()
+
+class StubPrepTimeModel:
+    """Prep time grows with the ingredients and instructions, so it changes the ranking."""
+
+    def predict(self, df):
+        return 5.0 + 4.0 * df["ingredient_count"].to_numpy() + 0.5 * df["instruction_length"].to_numpy()
+
+def make_training_frame(rows: int = 400) -> pd.DataFrame:
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({
+        "ingredient_count": rng.integers(1, 15, rows),
+        "instruction_length": rng.integers(5, 200, rows),
+        "type_of_meal": [TYPES[i % len(TYPES)] for i in range(rows)],
+        "is_vegetarian": rng.random(rows) < 0.4,
+        "has_dairy": rng.random(rows) < 0.5,
+        "has_gluten": rng.random(rows) < 0.5,
+        "prep_time": rng.uniform(5, 150, rows),
+        "flavor_profile": [FLAVORS[(i // 3) % len(FLAVORS)] for i in range(rows)],
+        "complexity_score": rng.integers(0, 11, rows),
+    })
+    signal = (-0.03 * df["prep_time"] + 0.1 * df["ingredient_count"] + (df["type_of_meal"] == "italian")
+              - (df["flavor_profile"] == "sour") + rng.normal(0, 0.5, rows))
+    df["is_recommended"] = (signal > signal.median()).astype(int)
+    return df
+
+def make_meals(count: int = 60):
+    rng = random.Random(2)
+    return [
+        Meal(id=str(i), name=f"Meal {i}", category="Test",
+             ingredients=[Ingredient(name, 1) for name in rng.sample(INGREDIENTS, rng.randint(2, 8))],
+             instructions=" ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 120))))
+        for i in range(count)
+    ]
+
+USERS = [
+    User(id=1, prefered_types=["italian"], prefered_flavors=["sweet"]),
+    User(id=2, prefered_types=["mexican", "asian"], prefered_flavors=[]),
+    User(id=3, prefered_types=[], prefered_flavors=["spicy", "sour"]),
+    User(id=4),
+]
+
+@pytest.fixture(scope="module")
+def pipeline():
+    model = LogisticRegressionModel()
+    model.train_model(make_training_frame(), MealScoringPipeline.RECOMMENDATION_FEATURE_COLUMNS, "is_recommended")
+    return MealScoringPipeline(MealFeatureManager(use_feature_store=False), StubPrepTimeModel(), model)
+
+def ranked(meals):
+    return [(meal.id, meal.recommendation_score, meal.prep_time) for meal in meals]
+
+@pytest.mark.parametrize("top_k", [None, 5])
+def test_users_are_ranked_like_one_run_each(pipeline, top_k):
+    batch = pipeline.run_for_users(make_meals(), USERS, top_k=top_k)
+    assert batch.probabilities.shape == (60, len(USERS))
+
+    for column, user in enumerate(USERS):
+        alone = pipeline.run(make_meals(), user=user, top_k=top_k)
+        expected = ranked(alone.meals)
+
+        meals = [batch.meals[i] for i in batch.rankings[column]]
+        scores = [round(batch.probabilities[i, column] * 5, 1) for i in batch.rankings[column]]
+        assert [(meal.id, score, meal.prep_time) for meal, score in zip(meals, scores)] == expected
+        assert np.allclose(batch.probabilities[batch.rankings[column], column], alone.probabilities)
+
+def test_users_get_different_rankings(pipeline):
+    batch = pipeline.run_for_users(make_meals(), USERS, top_k=5)
+    assert len({tuple(ranking) for ranking in batch.rankings}) > 1
+
+@pytest.mark.parametrize("top_k", [1, 3, 10, 59, 60, 100])
+def test_top_k_is_the_head_of_the_full_ranking(pipeline, top_k):
+    for user in USERS + [None]:
+        # Without a user or top k, run() keeps the candidates' order
+        full = pipeline.run(make_meals(), user=user, top_k=None if user else 60)
+        best = pipeline.run(make_meals(), user=user, top_k=top_k)
+
+        assert ranked(best.meals) == ranked(full.meals)[:top_k]
+        assert np.array_equal(best.prep_times, full.prep_times[:top_k])
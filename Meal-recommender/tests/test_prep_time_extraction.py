@@ -0,0 +1,48 @@
+import pandas as pd
+import pytest
+
+hypothesis = pytest.importorskip("hypothesis")
+from hypothesis import given, settings, strategies as st
+
+from Backend.Data.prep_time_extraction import PrepTimeFeatureExtractor
+from Backend.models.ingredient import Ingredient
+from Backend.models.meal import Meal
+import reference_features
+
+EXTRACTOR = PrepTimeFeatureExtractor()
+
+# Text built from pieces of the keywords, so matches are dense and overlap
+fragments = st.sampled_from(EXTRACTOR.prep_keywords + ["cooker", "stove", "top", "er", " ", "\n", "é", "\0"])
+texts = st.lists(fragments, max_size=30).map("".join)
+
+@settings(max_examples=300, deadline=None)
+@given(st.lists(texts, max_size=8))
+def test_keyword_counts_match_str_count(batch):
+    expected = [reference_features.count_prep_keywords(EXTRACTOR.prep_keywords, text) for text in batch]
+    assert EXTRACTOR.count_prep_keywords(batch).tolist() == expected
+
+def test_keyword_counts_keep_str_count_semantics_for_unusual_keywords():
+    extractor = PrepTimeFeatureExtractor()
+    extractor.prep_keywords = ["aa", "abab", "mix", "mix", "b", "ab"]  # Self-overlapping, listed twice, nested
+    extractor._compile_keyword_matcher()
+
+    batch = ["aaaa", "ababab", "mix it, remix", "", "bab"]
+    expected = [reference_features.count_prep_keywords(extractor.prep_keywords, text) for text in batch]
+    assert extractor.count_prep_keywords(batch).tolist() == expected
+
+def test_batch_features_match_the_per_meal_extraction():
+    meals = [
+        Meal(id=None, name="Stew", category="Beef", ingredients=[Ingredient("Onion", 1), Ingredient("Beef", 1)],
+             instructions="Chop the onion. Sauté, then slow cooker for 8 hours; stir.", keywords=["Stir", "mix", "mix"],
+             prep_time=20),
+        Meal(id=None, name="Salad", category="Vegetarian", ingredients=[Ingredient("tomato", 1)],
+             instructions="Slice and MIX.", prep_time=None),
+        Meal(id=None, name="Nothing", category="Other", ingredients=[], instructions=None, prep_time=5),
+    ]
+
+    for include_target in (True, False):
+        pd.testing.assert_frame_equal(
+            EXTRACTOR.prepare_features_dataframe(meals, include_target=include_target),
+            reference_features.prep_time_features_dataframe(EXTRACTOR, meals, include_target=include_target),
+            check_dtype=False
+        )
@@ -0,0 +1,25 @@
+import pytest
+
+hypothesis = pytest.importorskip("hypothesis")
+from hypothesis import given, settings, strategies as st
+
+from Backend.Data.Utils.price_index import PriceIndex
+from reference_lookups import linear_price_lookup
+
+names = st.text(alphabet="abcde ", max_size=8)
+
+@settings(max_examples=300, deadline=None)
+@given(st.dictionaries(names, st.floats(0, 100, allow_nan=False), max_size=30), st.lists(names, max_size=30))
+def test_lookup_matches_linear_scan(prices, queries):
+    index = PriceIndex(prices)
+    for query in queries:
+        assert index.lookup(query) == linear_price_lookup(prices, query)
+
+def test_lookup_prefers_exact_then_earliest_name():
+    index = PriceIndex({'olive oil': 5.0, 'oil': 2.0, 'chicken breast': 7.0, 'chicken': 4.0})
+
+    assert index.lookup('chicken') == 4.0  # Exact match beats the earlier containing name
+    assert index.lookup('extra virgin olive oil') == 5.0  # Both contained; 'olive oil' was cached first
+    assert index.lookup('breast') == 7.0
+    assert index.lookup('beef') is None
+    assert PriceIndex({}).lookup('salt') is None
@@ -0,0 +1,90 @@
+import pytest
+
+from Backend.Data.Utils import recommendation_cache
+from Backend.Data.Utils.recommendation_cache import RecommendationCache
+from Backend.models.ingredient import Ingredient
+from Backend.models.meal import Meal
+from Backend.models.user import User
+
+USER = User(id=1, prefered_flavors=["sweet"], prefered_types=["italian"], dietary_restrictions=[])
+
+def make_meals(count: int = 3):
+    return [Meal(id=str(i), name=f"Meal {i}", category="Test", instructions="Mix.",
+                 ingredients=[Ingredient("pasta", 1)], recommendation_score=5.0 - i) for i in range(count)]
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(recommendation_cache.time, "monotonic", lambda: now[0])
+    return now
+
+def test_least_recently_used_entries_are_evicted():
+    cache = RecommendationCache(max_entries=2)
+    keys = [cache.build_key(USER, ("search", term), 0) for term in ("a", "b", "c")]
+    cache.set(keys[0], make_meals())
+    cache.set(keys[1], make_meals())
+    assert cache.get(keys[0]) is not None  # 'b' is now the least recently used
+
+    cache.set(keys[2], make_meals())
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None and cache.get(keys[2]) is not None
+    assert cache.get_stats()['entries'] == 2
+
+def test_entries_expire_after_the_ttl(clock):
+    cache = RecommendationCache(ttl=60)
+    key = cache.build_key(USER, ("search", "pasta"), 0)
+    cache.set(key, make_meals())
+
+    clock[0] += 59
+    assert cache.get(key) is not None
+    clock[0] += 2
+    assert cache.get(key) is None
+    assert cache.get_stats()['entries'] == 0
+
+def test_meals_are_copied_in_and_out():
+    cache = RecommendationCache()
+    key = cache.build_key(USER, ("search", "pasta"), 0)
+    meals = make_meals()
+    cache.set(key, meals)
+    meals[0].name = "Changed after caching"
+
+    first = cache.get(key)
+    first[0].recommendation_score = 0.0
+    first[0].ingredients[0].name = "changed"
+    first[0].ingredients.append(Ingredient("salt", 1))
+
+    second = cache.get(key)
+    assert second[0].name == "Meal 0"
+    assert second[0].recommendation_score == 5.0
+    assert [ingredient.name for ingredient in second[0].ingredients] == ["pasta"]
+
+def test_top_k_results_answer_smaller_requests_only():
+    cache = RecommendationCache()
+    key = cache.build_key(USER, ("search", "pasta"), 0)
+    cache.set(key, make_meals(), top_k=3)
+
+    assert [meal.id for meal in cache.get(key, top_k=2)] == ["0", "1"]
+    assert cache.get(key, top_k=5) is None
+    assert cache.get(key) is None  # All meals were asked for, only 3 were computed
+
+def test_version_and_preference_changes_miss():
+    cache = RecommendationCache()
+    cache.set(cache.build_key(USER, ("search", "pasta"), (1, (0, None))), make_meals())
+
+    assert cache.get(cache.build_key(USER, ("search", "pasta"), (1, (0, None)))) is not None
+    assert cache.get(cache.build_key(USER, ("search", "pasta"), (2, (0, None)))) is None  # Retrained model
+    assert cache.get(cache.build_key(USER, ("search", "pasta"), (1, (1, None)))) is None  # Reloaded prices
+    changed = User(id=1, prefered_flavors=["spicy"], prefered_types=["italian"], dietary_restrictions=[])
+    assert cache.get(cache.build_key(changed, ("search", "pasta"), (1, (0, None)))) is None
+
+def test_invalidate_user_drops_only_their_entries():
+    cache = RecommendationCache()
+    other = User(id=2, prefered_flavors=[], prefered_types=[], dietary_restrictions=[])
+    for user in (USER, other):
+        cache.set(cache.build_key(user, ("search", "pasta"), 0), make_meals())
+        cache.set(cache.build_key(user, ("random",), 0), make_meals())
+
+    assert cache.invalidate_user(USER.id) == 2
+    assert cache.get(cache.build_key(USER, ("search", "pasta"), 0)) is None
+    assert cache.get(cache.build_key(other, ("search", "pasta"), 0)) is not None
@@ -0,0 +1,99 @@
+import pytest
+
+from Backend.Data.csv_processor import MercadonaCSVProcessor
+from Backend.Data.Utils.translation_store import TranslationStore
+from Backend.Data.Utils.translator import IngredientTranslator, StubTranslationBackend, TranslationBackend
+from reference_lookups import dict_scan_translate
+
+@pytest.fixture(scope="module")
+def translator():
+    return IngredientTranslator()
+
+@pytest.mark.parametrize("ingredient, english, dict_scan_english", [
+    ("aceite de oliva virgen extra", "olive oil", "oil"),
+    ("filetes de pechuga de pavo en lonchas", "turkey breast fillets", "chicken breast"),
+    ("tortilla de patatas con cebolla", "Spanish omelette", "potato"),
+])
+def test_longest_contained_term_wins(translator, ingredient, english, dict_scan_english):
+    assert translator.translate_ingredient(ingredient) == english
+    assert dict_scan_translate(translator, ingredient) == dict_scan_english  # What the dict scan used to pick
+
+def test_exact_match_and_ties(translator):
+    assert translator.translate_ingredient("Pasta") == "pasta"
+    assert translator.translate_ingredient("sal y pimienta") == "pepper"  # 'pimienta' is longer than 'sal'
+    assert translator.translate_ingredient("miel y sal") == "honey"  # Equally long: the earliest one wins
+    assert translator.translate_ingredient("xyz") is None
+
+def test_matches_the_dict_scan_when_only_one_term_is_contained(translator):
+    for ingredient in ["zanahorias baby", "queso rallado", "salmón ahumado", "garbanzos cocidos"]:
+        assert translator.translate_ingredient(ingredient) == dict_scan_translate(translator, ingredient)
+
+def test_custom_mapping_recompiles_the_matcher():
+    translator = IngredientTranslator()
+    translator.add_custom_mapping("Aceite de girasol", "Sunflower oil")
+    assert translator.translate_ingredient("aceite de girasol refinado") == "sunflower oil"
+
+def test_translate_many_matches_translate_ingredient(translator):
+    ingredients = ["aceite de oliva", "Pollo", "aceite de oliva", "desconocido"]
+    assert translator.translate_many(ingredients) == [translator.translate_ingredient(name) for name in ingredients]
+
+def test_longest_match_prices_compound_products(tmp_path):
+    csv_path = tmp_path / "mercadona_products_latest.csv"
+    csv_path.write_text(
+        "name,price,price_per_unit,category\n"
+        '"Aceite de girasol Hacendado",2.10,N/A,"Aceite"\n'
+        '"Aceite de oliva virgen extra Hacendado",4.20,N/A,"Aceite"\n',
+        encoding="utf-8"
+    )
+    processor = MercadonaCSVProcessor(str(csv_path), cache_dir=str(tmp_path / "cache"))
+    processor.get_ingredient_price("oil")
+
+    # The dict scan priced both products as 'oil', so the olive oil price overwrote the sunflower one
+    assert processor._price_cache == {"oil": 2.10, "olive oil": 4.20}
+    assert processor.get_ingredient_price("olive oil") == 4.20
+    assert processor.get_ingredient_price("oil") == 2.10
+
+class FailingTranslationBackend(TranslationBackend):
+    name = "failing"
+
+    def translate_batch(self, terms, src_lang):
+        raise ConnectionError("backend unreachable")
+
+def test_translation_backend_is_abstract():
+    with pytest.raises(TypeError):
+        TranslationBackend()
+
+def test_backend_fills_manual_misses_and_the_store_keeps_them(tmp_path):
+    store = TranslationStore(str(tmp_path / "translations.db"))
+    backend = StubTranslationBackend({"boniato": "sweet potato"})
+    translator = IngredientTranslator(store=store, backend=backend)
+
+    assert translator.translate_many(["Boniato", "pollo", "boniato", "cosa rara"]) == \
+        ["sweet potato", "chicken", "sweet potato", None]
+    assert backend.calls == [["boniato", "cosa rara"]]  # Only manual misses, each once
+
+    # A later translator finds both terms in the store and never asks its backend
+    restarted = IngredientTranslator(store=TranslationStore(store.db_path), backend=FailingTranslationBackend())
+    assert restarted.translate_ingredient("boniato") == "sweet potato"
+    assert restarted.translate_ingredient("cosa rara") is None
+    assert not restarted.failed_terms
+
+def test_backend_prices_products_the_mapping_misses(tmp_path):
+    csv_path = tmp_path / "mercadona_products_latest.csv"
+    csv_path.write_text(
+        "name,price,price_per_unit,category\n"
+        '"Boniato Hacendado",1.80,N/A,"Verdura"\n'
+        '"Pollo entero",5.20,N/A,"Carne"\n',
+        encoding="utf-8"
+    )
+    cache_dir = str(tmp_path / "cache")
+
+    # While the backend fails, the miss is left out and the price index is not saved
+    failing = MercadonaCSVProcessor(str(csv_path), cache_dir=cache_dir, translation_backend=FailingTranslationBackend())
+    assert failing.get_ingredient_price("sweet potato") is None
+    assert failing.translator.failed_terms == {"boniato"}
+
+    processor = MercadonaCSVProcessor(str(csv_path), cache_dir=cache_dir,
+                                      translation_backend=StubTranslationBackend({"boniato": "sweet potato"}))
+    assert processor.get_ingredient_price("sweet potato") == pytest.approx(1.80)
+    assert processor.translator.store.get_many(["boniato"], "es") == {"boniato": "sweet potato"}
@@ -12,8 +12,14 @@ setup(
         "requests",
         "beautifulsoup4",
         "scikit-learn",
+        "scipy",
         "numpy",
+        "pyahocorasick",
     ],
+    extras_require={
+        "parquet": ["pyarrow"],  # Parquet cache of parsed training records
+        "test": ["pytest", "hypothesis"],
+    },
     author="Anton Persson",
     author_email="Antonnilspersson@gmail.com",
     description="A web scraper and meal recommender (machine learning) for Mercadona.",